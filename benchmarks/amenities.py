@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""Measures the time taken to find the places holding all, or any, of
+some amenities by reading the amenity_ids of every Place and through
+the bitmap index of the FileStorage, and the time taken to store a place
+whose amenities changed.
+
+usage: ./benchmarks/amenities.py [number of objects]
+"""
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from reload import place_dict
+
+
+def timed(function, repeat=20):
+    """Returns the mean number of seconds function() takes"""
+    start = time.perf_counter()
+    for n in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    generator = random.Random(0)
+    amenities = ["amenity{}".format(n) for n in range(40)]
+    storage = FileStorage()
+    for n in range(count):
+        value = place_dict(n)
+        value["amenity_ids"] = generator.sample(amenities,
+                                                generator.randrange(12))
+        storage.new(Place.from_dict(value))
+    places = storage.all(Place).values()
+    wanted = amenities[:3]
+    either = amenities[3:5]
+    changed = next(iter(places))
+
+    def update():
+        changed.amenity_ids = generator.sample(amenities, 5)
+        storage.new(changed)
+
+    results = {
+        "scan, all of 3": timed(lambda: [
+            place for place in places
+            if all(item in place.amenity_ids for item in wanted)], 3),
+        "index, all of 3": timed(lambda: storage.having(
+            Place, "amenity_ids", wanted)),
+        "scan, any of 2": timed(lambda: [
+            place for place in places
+            if any(item in place.amenity_ids for item in either)], 3),
+        "index, any of 2": timed(lambda: storage.having(
+            Place, "amenity_ids", any_of=either), 3),
+        "index, update": timed(update, 1000),
+    }
+    print("{} places, {} with all of 3".format(
+        count, len(storage.having(Place, "amenity_ids", wanted))))
+    for name, elapsed in results.items():
+        print("{:20} {:9.3f}ms".format(name, elapsed * 1e3))
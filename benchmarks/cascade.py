@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""Measures the time taken to delete a State with its cities, their
+places and the reviews of these places: one object at a time, found by
+scanning the objects of each class and saved after each deletion (the
+way the console's destroy would have to), and with storage.destroy().
+
+usage: ./benchmarks/cascade.py [number of states]
+"""
+import os
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.state import State
+from models.city import City
+from models.place import Place
+from models.review import Review
+
+
+def fill(storage, count):
+    """Stores count states of 10 cities of 10 places of 3 reviews each
+    and returns the states
+    """
+    states = []
+    for n in range(count):
+        state = State()
+        states.append(state)
+        storage.new(state)
+        for m in range(10):
+            city = City(state_id=state.id)
+            storage.new(city)
+            for k in range(10):
+                place = Place(city_id=city.id)
+                storage.new(place)
+                for j in range(3):
+                    storage.new(Review(place_id=place.id))
+    storage.save()
+    return states
+
+
+def destroy_by_scan(storage, state):
+    """Deletes state and its dependents one by one, saving each time"""
+    level = [state]
+    children = {"State": (City, "state_id"), "City": (Place, "city_id"),
+                "Place": (Review, "place_id")}
+    while level:
+        following = []
+        for parent in level:
+            storage.delete(parent)
+            storage.save()
+            cls, attribute = children.get(type(parent).__name__,
+                                          (None, None))
+            if cls is not None:
+                following.extend(
+                    obj for obj in storage.all(cls).values()
+                    if getattr(obj, attribute) == parent.id)
+        level = following
+
+
+def timed(function, *args):
+    """Returns the seconds function(*args) took"""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with tempfile.TemporaryDirectory() as directory:
+        storage = FileStorage()
+        storage._FileStorage__file_path = os.path.join(directory,
+                                                       "file.json")
+        states = fill(storage, count)
+        total = storage.count()
+        results = {
+            "one by one": timed(destroy_by_scan, storage, states[0]),
+            "destroy()": timed(storage.destroy, states[1]),
+        }
+        print("{} objects, {} deleted each time".format(
+            total, (total - storage.count()) // 2))
+        for name, elapsed in results.items():
+            print("{:20} {:9.3f}ms".format(name, elapsed * 1e3))
@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+"""Measures the time taken to encode and decode a store of Place objects
+and the size of its file with each available codec
+(models/engine/formats.py). The garbage collector is disabled while
+measuring, it would otherwise dominate the decoding time.
+
+usage: ./benchmarks/formats.py [number of objects]
+"""
+import gc
+import io
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine import formats
+from models.place import Place
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data = {}
+    for n in range(count):
+        place = Place(name="Place {}".format(n), price_by_night=n % 300,
+                      latitude=37.77, longitude=-122.41,
+                      amenity_ids=["a", "b"])
+        data["Place." + place.id] = place.to_dict()
+    for name in formats.available():
+        codec = formats.get(name)
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter()
+        document = codec.document((key, codec.fragment(value))
+                                  for key, value in data.items())
+        encoded = time.perf_counter()
+        decoded = dict(formats.read(io.BytesIO(document), codec))
+        end = time.perf_counter()
+        gc.enable()
+        assert decoded == data
+        print("{:8} encode {:6.3f}s  decode {:6.3f}s  {:9d} bytes".format(
+            name + ":", encoded - start, end - encoded, len(document)))
@@ -0,0 +1,42 @@
+#!/usr/bin/python3
+"""Measures the time taken to open a store of User objects and show one
+of them with the FileStorage (JSON file, lazy mode) and the MmapStorage.
+
+usage: ./benchmarks/mmap_get.py [number of objects]
+"""
+import os
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.engine.mmap_storage import MmapStorage
+from models.user import User
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    users = [User(first_name="Betty", email="{}@hbnb.io".format(n))
+             for n in range(count)]
+    with tempfile.TemporaryDirectory() as directory:
+        file_storage = FileStorage(lazy=True)
+        file_storage._FileStorage__file_path = os.path.join(directory,
+                                                            "file.json")
+        mmap_storage = MmapStorage(os.path.join(directory, "file.hbnb"))
+        for storage in (file_storage, mmap_storage):
+            storage.reload()
+            for user in users:
+                storage.new(user)
+            storage.save()
+        for name in ("objects", "by_class", "ids", "fragments"):
+            getattr(file_storage, "_FileStorage__" + name).clear()
+        mmap_storage.close()
+        for label, storage in (("FileStorage:", file_storage),
+                               ("MmapStorage:", mmap_storage)):
+            start = time.perf_counter()
+            storage.reload()
+            user = storage.get(User, users[count // 2].id)
+            elapsed = time.perf_counter() - start
+            assert user.email == users[count // 2].email
+            print("{:13} reload + get {:8.4f}s".format(label, elapsed))
+        mmap_storage.close()
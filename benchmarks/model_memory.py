@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+"""Measures the memory used per Place instance by the model class and by
+its compact variant (models/compact.py).
+
+usage: ./benchmarks/model_memory.py [number of instances]
+"""
+import os
+import sys
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.compact import compact
+from models.place import Place
+
+
+def place_kwargs(n):
+    """Returns the dictionary representation of the nth Place"""
+    return {"__class__": "Place", "id": "{:036d}".format(n),
+            "created_at": "2023-08-14T04:33:39.418067",
+            "updated_at": "2023-08-14T06:03:31.868832",
+            "city_id": "c", "user_id": "u", "name": "Place",
+            "price_by_night": n % 300, "max_guest": 4,
+            "latitude": 37.77, "longitude": -122.41}
+
+
+def measure(cls, count):
+    """Returns the number of bytes allocated per instance of cls"""
+    data = [place_kwargs(n) for n in range(count)]
+    tracemalloc.start()
+    instances = [cls(**kwargs) for kwargs in data]
+    for instance in instances:
+        instance.to_dict()
+        instance.mark_clean()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / count
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    regular = measure(Place, count)
+    slotted = measure(compact(Place), count)
+    print("Place:          {:7.1f} bytes per instance".format(regular))
+    print("compact(Place): {:7.1f} bytes per instance".format(slotted))
+    print("saved:          {:7.1%}".format(1 - slotted / regular))
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""Measures the time taken to find the places within a radius of a point,
+and the 10 places closest to it, by computing the distance of every
+Place and through the grid index of the FileStorage.
+
+usage: ./benchmarks/near.py [number of objects]
+"""
+import heapq
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.engine.indexes import haversine
+from models.place import Place
+from reload import place_dict
+
+
+def timed(function, repeat=20):
+    """Returns the mean number of seconds function() takes"""
+    start = time.perf_counter()
+    for n in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    generator = random.Random(0)
+    storage = FileStorage()
+    for n in range(count):
+        value = place_dict(n)
+        value["latitude"] = generator.uniform(35, 60)
+        value["longitude"] = generator.uniform(-10, 30)
+        storage.new(Place.from_dict(value))
+    places = storage.all(Place).values()
+    point = (48.85, 2.35)
+
+    def scan_near():
+        return sorted((distance, place) for distance, place in
+                      ((haversine(*point, place.latitude, place.longitude),
+                        place) for place in places) if distance <= 10)
+
+    results = {
+        "scan, 10 km": timed(scan_near, 3),
+        "index, 10 km": timed(lambda: storage.near(*point, 10)),
+        "scan, 10 nearest": timed(lambda: heapq.nsmallest(
+            10, places, key=lambda place: haversine(
+                *point, place.latitude, place.longitude)), 3),
+        "index, 10 nearest": timed(lambda: storage.k_nearest(*point, 10)),
+    }
+    for name, elapsed in results.items():
+        print("{:20} {:9.3f}ms".format(name, elapsed * 1e3))
@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""Measures the time taken by FileStorage.reload() to read a JSON file of
+Place objects decoded by one process, then by several processes.
+
+usage: ./benchmarks/parallel_reload.py [number of objects] [processes]
+"""
+import os
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from reload import place_dict
+
+
+def measure(path, processes):
+    """Returns the number of seconds taken to reload the file at path"""
+    storage = FileStorage(processes=processes)
+    storage._FileStorage__file_path = path
+    start = time.perf_counter()
+    storage.reload()
+    elapsed = time.perf_counter() - start
+    storage._FileStorage__objects.clear()
+    storage._FileStorage__by_class.clear()
+    storage._FileStorage__ids.clear()
+    storage._FileStorage__fragments.clear()
+    return elapsed
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "file.json")
+        storage = FileStorage()
+        storage._FileStorage__file_path = path
+        for n in range(count):
+            storage.new(Place.from_dict(place_dict(n)))
+        storage.save()
+        storage._FileStorage__changed.clear()
+        measure(path, 0)
+        single = measure(path, 0)
+        several = measure(path, processes)
+    print("1 process:   {:6.3f}s ({:5.2f}us per object)".format(
+        single, single / count * 1e6))
+    print("{} processes: {:6.3f}s ({:5.2f}us per object)".format(
+        processes, several, several / count * 1e6))
@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+"""Measures the time taken to find the places under a price, and the 20
+cheapest places, by scanning every Place and through the sorted index on
+Place.price_by_night.
+
+usage: ./benchmarks/range_query.py [number of objects]
+"""
+import heapq
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from reload import place_dict
+
+
+def timed(function, repeat=20):
+    """Returns the mean number of seconds function() takes"""
+    start = time.perf_counter()
+    for n in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    storage = FileStorage()
+    for n in range(count):
+        storage.new(Place.from_dict(place_dict(n)))
+    places = storage.all(Place).values()
+    price = 3
+    results = {
+        "scan, price < 3": timed(lambda: [
+            place for place in places if place.price_by_night < price]),
+        "index, price < 3": timed(lambda: list(storage.range(
+            Place, "price_by_night", high=price, include_high=False))),
+        "scan, 20 cheapest": timed(lambda: heapq.nsmallest(
+            20, places, key=lambda place: place.price_by_night)),
+        "index, 20 cheapest": timed(lambda: list(
+            storage.query(Place).order_by("price_by_night").limit(20))),
+    }
+    for name, elapsed in results.items():
+        print("{:20} {:9.3f}ms".format(name, elapsed * 1e3))
@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""Measures the time taken to walk the states -> cities -> places ->
+reviews tree by scanning the objects of the child class for each parent,
+and through the relationship properties (State.cities, City.places,
+Place.reviews) the first time and once their results are remembered.
+
+usage: ./benchmarks/relations.py [number of states]
+"""
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import models
+from models.engine.file_storage import FileStorage
+from models.state import State
+from models.city import City
+from models.place import Place
+from models.review import Review
+
+
+def scan(storage, cls, attribute, value):
+    """Returns the objects of class cls whose attribute is value, looked
+    for among every object of the class
+    """
+    return [obj for obj in storage.all(cls).values()
+            if getattr(obj, attribute) == value]
+
+
+def walk_by_scan(storage, states):
+    """Returns the number of nodes of the tree, found by scanning"""
+    count = 0
+    for state in states:
+        for city in scan(storage, City, "state_id", state.id):
+            for place in scan(storage, Place, "city_id", city.id):
+                count += 1 + len(scan(storage, Review, "place_id", place.id))
+    return count
+
+
+def walk(states):
+    """Returns the number of nodes of the tree, found by the properties"""
+    count = 0
+    for state in states:
+        for city in state.cities:
+            for place in city.places:
+                count += 1 + len(place.reviews)
+    return count
+
+
+def timed(function, *args):
+    """Returns the result of function(*args) and the seconds it took"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    storage = models.storage = FileStorage()
+    states = []
+    for n in range(count):
+        state = State()
+        states.append(state)
+        storage.new(state)
+        for m in range(10):
+            city = City(state_id=state.id)
+            storage.new(city)
+            for k in range(10):
+                place = Place(city_id=city.id)
+                storage.new(place)
+                for j in range(3):
+                    storage.new(Review(place_id=place.id))
+    results = {}
+    nodes, results["properties, first"] = timed(walk, states)
+    nodes, results["properties, again"] = timed(walk, states)
+    scanned, results["scan"] = timed(walk_by_scan, storage, states)
+    assert scanned == nodes
+    print("{} nodes".format(nodes))
+    for name, elapsed in results.items():
+        print("{:20} {:9.3f}ms".format(name, elapsed * 1e3))
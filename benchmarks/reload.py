@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+"""Measures the time taken by FileStorage.reload() to read a JSON file of
+Place objects, with the instances created by the constructor (the way
+reload used to) and by from_dict().
+
+usage: ./benchmarks/reload.py [number of objects]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+
+def place_dict(n):
+    """Returns the dictionary representation of the nth Place"""
+    return {"__class__": "Place", "id": "{:036d}".format(n),
+            "created_at": "2023-08-14T04:33:39.{:06d}".format(n % 10 ** 6),
+            "updated_at": "2023-08-14T06:03:31.{:06d}".format(n % 10 ** 6),
+            "city_id": "c", "user_id": "u", "name": "Place",
+            "price_by_night": n % 300}
+
+
+def measure(path):
+    """Returns the number of seconds taken to reload the file at path"""
+    storage = FileStorage()
+    storage._FileStorage__file_path = path
+    start = time.perf_counter()
+    storage.reload()
+    elapsed = time.perf_counter() - start
+    storage._FileStorage__objects.clear()
+    storage._FileStorage__by_class.clear()
+    storage._FileStorage__ids.clear()
+    storage._FileStorage__fragments.clear()
+    return elapsed
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "file.json")
+        with open(path, "w") as file:
+            json.dump({"Place." + value["id"]: value for value in
+                       map(place_dict, range(count))}, file)
+        Place.from_dict = classmethod(lambda cls, value: cls(**value))
+        constructor = measure(path)
+        del Place.from_dict
+        bulk = measure(path)
+    print("constructor: {:6.3f}s ({:5.2f}us per object)".format(
+        constructor, constructor / count * 1e6))
+    print("from_dict:   {:6.3f}s ({:5.2f}us per object)".format(
+        bulk, bulk / count * 1e6))
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""Measures the time taken to find the places whose description holds
+two words by scanning every Place and through the text index, and the
+time the first search takes to build the index from the places or to
+read it from the file written by close().
+
+usage: ./benchmarks/search.py [number of objects]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from reload import place_dict
+
+WORDS = ["sea", "pool"] + ["word{}".format(n) for n in range(5000)]
+
+
+def timed(function, repeat=1):
+    """Returns the mean number of seconds function() takes"""
+    start = time.perf_counter()
+    for n in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    generator = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        storage = FileStorage()
+        storage._FileStorage__file_path = os.path.join(directory,
+                                                       "file.json")
+        for n in range(count):
+            value = place_dict(n)
+            value["description"] = " ".join(generator.choices(WORDS, k=30))
+            storage.new(Place.from_dict(value))
+        places = storage.all(Place).values()
+        indexes = storage._FileStorage__attr_indexes["Place"]
+
+        def scan():
+            return [place for place in places
+                    if {"sea", "pool"} <= set(place.description.split())]
+
+        build = timed(lambda: storage.search(Place, "sea pool"))
+        storage.close()
+        del indexes[Place.text_attributes]
+        load = timed(lambda: storage.search(Place, "sea pool"))
+        results = {
+            "scan": timed(scan, 3),
+            "index": timed(lambda: storage.search(Place, "sea pool"), 3),
+            "first search, build": build,
+            "first search, load": load,
+        }
+    for name, elapsed in results.items():
+        print("{:20} {:9.3f}ms".format(name, elapsed * 1e3))
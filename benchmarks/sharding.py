@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+"""Measures the bytes written and the time taken by FileStorage.save()
+after one User of a mixed store changed, with the single JSON file and
+in sharded mode.
+
+usage: ./benchmarks/sharding.py [number of reviews]
+"""
+import os
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.user import User
+from models.place import Place
+from models.review import Review
+
+
+def measure(path, count, **kwargs):
+    """Returns the bytes written and seconds taken by a save after one
+    User changed in a store of count reviews, count / 5 places and
+    count / 10 users
+    """
+    storage = FileStorage(**kwargs)
+    storage._FileStorage__file_path = path
+    users = [User(first_name="Betty") for n in range(count // 10)]
+    for instance in users + [Place() for n in range(count // 5)]:
+        storage.new(instance)
+    for n in range(count):
+        storage.new(Review(text="Great stay"))
+    storage.save()
+    written = []
+    write_file = storage._FileStorage__write_file
+    storage._FileStorage__write_file = \
+        lambda path, text: written.append(len(text)) or write_file(path, text)
+    users[0].first_name = "Holberton"
+    start = time.perf_counter()
+    storage.save()
+    elapsed = time.perf_counter() - start
+    for name in ("objects", "by_class", "ids", "fragments"):
+        getattr(storage, "_FileStorage__" + name).clear()
+    return sum(written), elapsed
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "file.json")
+        for label, kwargs in (("single file:", {}),
+                              ("sharded:", {"sharded": True}),
+                              ("8 buckets:", {"sharded": True,
+                                              "buckets": 8})):
+            written, elapsed = measure(path, count, **kwargs)
+            print("{:13} {:10d} bytes {:6.3f}s".format(label, written,
+                                                       elapsed))
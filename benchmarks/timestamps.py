@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""Measures the time taken to create Place instances from their
+dictionary representation, as a reload does, with the timestamps parsed
+by strptime(), by parse_datetime() and left to be parsed lazily.
+
+usage: ./benchmarks/timestamps.py [number of instances]
+"""
+import os
+import sys
+import time
+from datetime import datetime
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models import base_model
+from models.place import Place
+
+
+def strptime(value):
+    """Parses value the way BaseModel used to"""
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
+
+
+class LazyPlace(Place):
+    """Place parsing its timestamps when they're read"""
+    lazy_timestamps = True
+
+
+def place_kwargs(n):
+    """Returns the dictionary representation of the nth Place"""
+    return {"__class__": "Place", "id": "{:036d}".format(n),
+            "created_at": "2023-08-14T04:33:39.{:06d}".format(n % 10 ** 6),
+            "updated_at": "2023-08-14T06:03:31.{:06d}".format(n % 10 ** 6),
+            "name": "Place", "price_by_night": n % 300}
+
+
+def measure(cls, data):
+    """Returns the number of seconds taken to create the instances of cls
+    and serialize them back
+    """
+    start = time.perf_counter()
+    for kwargs in data:
+        cls(**kwargs).to_dict()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data = [place_kwargs(n) for n in range(count)]
+    parse_datetime = base_model.parse_datetime
+    base_model.parse_datetime = strptime
+    print("strptime:       {:6.3f}s".format(measure(Place, data)))
+    base_model.parse_datetime = parse_datetime
+    print("parse_datetime: {:6.3f}s".format(measure(Place, data)))
+    print("lazy:           {:6.3f}s".format(measure(LazyPlace, data)))
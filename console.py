@@ -11,6 +11,7 @@ interpreter are as follows:
 - Destroy an object
 """
 import cmd
+import math
 from models.base_model import BaseModel
 from models import storage
 from models.user import User
@@ -65,13 +66,7 @@ class HBNBCommand(cmd.Cmd):
                 if len(args) != 2:
                     print("** instance id missing **")
                     return False
-                data = storage.all()
-                obj = ""
-                for obj_id in data.keys():
-                    instance_id = obj_id.split(".")[1]
-                    if args[1] == instance_id:
-                        obj = data[obj_id]
-                        break
+                obj = storage.get(args[0], args[1])
                 if obj:
                     print(obj)
                 else:
@@ -82,8 +77,8 @@ class HBNBCommand(cmd.Cmd):
                 return False
 
     def do_destroy(self, line):
-        """ Deletes an instance based on the class name and id
-        (save the change into the JSON file).
+        """ Deletes an instance based on the class name and id, with the
+        instances depending on it (save the change into the JSON file).
         """
         if not line:
             print("** class name missing **")
@@ -94,16 +89,14 @@ class HBNBCommand(cmd.Cmd):
                 if len(args) != 2:
                     print("** instance id missing **")
                     return False
-                data = storage.all()
-                is_deleted = False
-                for obj_id in data.keys():
-                    instance_id = obj_id.split(".")[1]
-                    if args[1] == instance_id:
-                        del data[obj_id]
-                        storage.save()
-                        is_deleted = True
-                        break
-                if not is_deleted:
+                obj = storage.get(args[0], args[1])
+                if obj:
+                    try:
+                        storage.destroy(obj)
+                    except ValueError as error:
+                        print("** {} **".format(error))
+                        return False
+                else:
                     print("** no instance found **")
                     return False
             else:
@@ -115,21 +108,15 @@ class HBNBCommand(cmd.Cmd):
         or not on the class name. Ex: $ all BaseModel or $ all.
         """
         args = line.split(" ")
-        data = storage.all()
-        result = []
         if line:
             if args[0] in class_list:
-                pass
+                data = storage.all(args[0])
             else:
                 print("** class doesn't exist **")
                 return False
-        for obj in data.keys():
-            instance_type = obj.split(".")[0]
-            if args[0] and args[0] == instance_type:
-                result.append(str(data[obj]))
-            if not line:
-                result.append(str(data[obj]))
-        print(result)
+        else:
+            data = storage.all()
+        print([str(obj) for obj in data.values()])
 
     def do_update(self, line):
         """ Updates an instance based on the class name and id by adding
@@ -152,28 +139,27 @@ class HBNBCommand(cmd.Cmd):
                 elif len(args) < 4:
                     print("** value missing **")
                     return False
-                data = storage.all()
-                is_found = False
-                for obj_id in data.keys():
-                    instance_id = obj_id.split(".")
-                    if args[1] == instance_id[1] and args[0] == instance_id[0]:
-                        if "\"" in args[3] or "'" in args[3]:
-                            args[3] = args[3].strip("\"")
-                            args[3] = args[3].strip("'")
+                obj = storage.get(args[0], args[1])
+                if obj:
+                    if "\"" in args[3] or "'" in args[3]:
+                        args[3] = args[3].strip("\"")
+                        args[3] = args[3].strip("'")
+                    try:
+                        if int(args[3]):
+                            args[3] = int(args[3])
+                    except ValueError:
                         try:
-                            if int(args[3]):
-                                args[3] = int(args[3])
+                            if float(args[3]):
+                                args[3] = float(args[3])
                         except ValueError:
-                            try:
-                                if float(args[3]):
-                                    args[3] = float(args[3])
-                            except ValueError:
-                                pass
-                        setattr(data[obj_id], args[2], args[3])
-                        data[obj_id].save()
-                        is_found = True
-                        break
-                if not is_found:
+                            pass
+                    try:
+                        setattr(obj, args[2], args[3])
+                    except AttributeError:
+                        print("** attribute can't be set **")
+                        return False
+                    obj.save()
+                else:
                     print("** no instance found **")
                     return False
             else:
@@ -183,29 +169,124 @@ class HBNBCommand(cmd.Cmd):
     def do_count(self, line):
         """Counts number of instances of a given class"""
         args = line.split(" ")
-        data = storage.all()
-        count = 0
         if line:
             if args[0] in class_list:
-                pass
+                print(storage.count(args[0]))
             else:
                 print("** class doesn't exist **")
                 return False
-        for obj in data.keys():
-            instance_type = obj.split(".")[0]
-            if args[0] and args[0] == instance_type:
-                count += 1
-        print(count)
+        else:
+            print(storage.count())
+
+    def do_near(self, line):
+        """Prints the places within a radius (in km) of a point, closest
+        first, with their distance. Ex: $ near 48.85 2.35 10
+        """
+        values = self.__numbers(line, ("latitude", "longitude", "radius"))
+        if values is None:
+            return False
+        found = storage.near(*values)
+        print(["{:.3f} km {}".format(distance, obj)
+               for distance, obj in found])
+
+    def do_nearest(self, line):
+        """Prints the k places closest to a point, closest first, with
+        their distance. Ex: $ nearest 48.85 2.35 5
+        """
+        values = self.__numbers(line, ("latitude", "longitude", "count"))
+        if values is None:
+            return False
+        if values[2] < 1:
+            print("** count must be at least 1 **")
+            return False
+        found = storage.k_nearest(values[0], values[1], int(values[2]))
+        print(["{:.3f} km {}".format(distance, obj)
+               for distance, obj in found])
+
+    def do_search(self, line):
+        """Prints the instances of a class whose texts hold every given
+        word, best match first; a word ending with * matches the words it
+        starts. Ex: $ search Place sea view
+        """
+        args = line.split()
+        if not args:
+            print("** class name missing **")
+            return False
+        if args[0] not in class_list:
+            print("** class doesn't exist **")
+            return False
+        if len(args) < 2:
+            print("** words missing **")
+            return False
+        if not hasattr(storage, "search"):
+            print("** storage can't search words **")
+            return False
+        prefix = args[-1].endswith("*")
+        try:
+            found = storage.search(args[0], " ".join(args[1:]), prefix)
+        except ValueError:
+            print("** class can't be searched **")
+            return False
+        print([str(obj) for obj in found])
+
+    def __numbers(self, line, names):
+        """Returns the list of the finite numbers named names given on
+        line, or None after printing the error if one is missing or
+        invalid
+        """
+        if not hasattr(storage, "near"):
+            print("** storage can't search by location **")
+            return None
+        args = line.split()
+        values = []
+        for position, name in enumerate(names):
+            if position >= len(args):
+                print("** {} missing **".format(name))
+                return None
+            try:
+                values.append(float(args[position]))
+            except ValueError:
+                print("** {} must be a number **".format(name))
+                return None
+            if not math.isfinite(values[-1]):
+                print("** {} must be finite **".format(name))
+                return None
+        return values
 
     def do_quit(self, line):
         """quit the console"""
+        storage.close()
         return True
 
     def do_EOF(self, line):
         """ quit the console"""
         print("")
+        storage.close()
         return True
 
+    def precmd(self, line):
+        """Reads the changes other processes made to the storage before
+        the command is run
+        """
+        storage.refresh()
+        return line
+
+    async def aonecmd(self, line):
+        """Runs the command line like onecmd(), in the executor of the
+        storage, so an asyncio script isn't blocked while the command
+        reads or writes the storage:
+
+            console = HBNBCommand()
+            for line in ("create User", "count User"):
+                await console.aonecmd(line)
+
+        Returns: True if the command stops the console
+        """
+        def run():
+            command = self.precmd(line)
+            return self.postcmd(self.onecmd(command), command)
+        return await storage.arun(run)
+
     def emptyline(self):
         """ does not excute anything """
         pass
@@ -258,9 +339,10 @@ class HBNBCommand(cmd.Cmd):
                             else:
                                 attr_value.append(parsed[pos].strip(" \""))
                     if attr_value and type(attr_value[0]) == list:
-                        for item in attr_value:
-                            n = statement + " " + item[0] + " " + item[1]
-                            self.do_update(n)
+                        with storage.transaction():
+                            for item in attr_value:
+                                n = statement + " " + item[0] + " " + item[1]
+                                self.do_update(n)
                     else:
                         n = statement
                         if attr_value:
@@ -8,7 +8,53 @@ serializing and deserializing instances. By calling the reload method during
 initialization, this module ensures that any previously stored instances are
 loaded into memory, providing continuity and
 access to previously created objects.
+
+Setting HBNB_FILE_JOURNAL=1 makes the storage append changes to a journal
+instead of rewriting the JSON file on every save, HBNB_FILE_JOURNAL_LIMIT
+sets the number of journal entries after which it is compacted.
+Setting HBNB_FILE_LAZY=1 makes the storage create the instances read from
+the JSON file only when they're first accessed, HBNB_FILE_COMPACT=1 makes
+it create them with the compact (__slots__ based) variant of their class.
+HBNB_FILE_FLUSH_INTERVAL sets the number of seconds a save can be held by
+the background writer (0, the default, writes the file on every save).
+Setting HBNB_FILE_SHARDED=1 makes the storage keep one JSON file per class,
+each split in HBNB_FILE_BUCKETS files (1 by default). HBNB_FILE_CODEC
+names the codec the file is written with: json (the default), orjson,
+msgpack or marshal (see models/engine/formats.py). Setting
+HBNB_FILE_SHARED=1 lets several processes use the same file at once, and
+HBNB_FILE_THREAD_SAFE=1 lets several threads look objects up while
+another one changes or saves them. HBNB_FILE_PROCESSES sets the number
+of processes a big file is decoded with on reload (0: one, the default).
+Setting HBNB_LAZY_TIMESTAMPS=1 makes the instances keep the created_at and
+updated_at strings they're created with until they're first read.
+
+Setting HBNB_TYPE_STORAGE=db selects the DBStorage instead, which keeps
+the instances in the SQLite database HBNB_DB_PATH (hbnb.db by default).
+Setting HBNB_TYPE_STORAGE=mmap selects the MmapStorage, which keeps them
+in the memory-mapped binary file HBNB_MMAP_PATH (file.hbnb by default).
 """
-from models.engine.file_storage import FileStorage
-storage = FileStorage()
+from os import getenv
+from models.base_model import BaseModel
+BaseModel.lazy_timestamps = getenv("HBNB_LAZY_TIMESTAMPS") == "1"
+if getenv("HBNB_TYPE_STORAGE") == "db":
+    from models.engine.db_storage import DBStorage
+    storage = DBStorage(getenv("HBNB_DB_PATH", "hbnb.db"))
+elif getenv("HBNB_TYPE_STORAGE") == "mmap":
+    from models.engine.mmap_storage import MmapStorage
+    storage = MmapStorage(getenv("HBNB_MMAP_PATH", "file.hbnb"))
+else:
+    from models.engine.file_storage import FileStorage
+    storage = FileStorage(journal=getenv("HBNB_FILE_JOURNAL") == "1",
+                          journal_limit=int(getenv("HBNB_FILE_JOURNAL_LIMIT",
+                                                   1000)),
+                          lazy=getenv("HBNB_FILE_LAZY") == "1",
+                          compact=getenv("HBNB_FILE_COMPACT") == "1",
+                          flush_interval=float(getenv(
+                              "HBNB_FILE_FLUSH_INTERVAL", 0)),
+                          sharded=getenv("HBNB_FILE_SHARDED") == "1",
+                          buckets=int(getenv("HBNB_FILE_BUCKETS", 1)),
+                          codec=getenv("HBNB_FILE_CODEC", "json"),
+                          shared=getenv("HBNB_FILE_SHARED") == "1",
+                          thread_safe=getenv("HBNB_FILE_THREAD_SAFE") == "1",
+                          processes=int(getenv("HBNB_FILE_PROCESSES", 0)))
 storage.reload()
@@ -10,14 +10,138 @@ across instances. The class is responsible for generating unique IDs,
 managing creation and modification timestamps, providing a dictionary
 representation of instances, and facilitating serialization and
 deserialization through JSON.
+
+An instance is dirty from its creation and every time one of its
+attributes is set or deleted, until the storage has serialized it and
+called mark_clean(). The storage uses it to serialize again only the
+instances that changed since the last save.
+
+The created_at and updated_at strings given to the constructor are
+parsed by parse_datetime(), which uses datetime.fromisoformat() and
+falls back to strptime() for the formats it doesn't read. When the
+lazy_timestamps class attribute is True the constructor keeps the
+strings as they are, they're parsed the first time the attribute is
+read; to_dict() returns them unchanged if they were never read.
+
+from_dict() creates an instance from its dictionary representation
+without the work of the constructor, the storages use it to create the
+instances they read.
+
+A list attribute declared with _ListDefault (e.g. Place.amenity_ids)
+gives each instance its own copy of its default the first time it's
+read, so appending to the list of an instance doesn't change the list
+of the others.
 """
 from datetime import datetime
 from uuid import uuid4
+from weakref import WeakSet
 import models
 
+_dirty = WeakSet()
+_known_keys = {}
+_TIME_FORMATS = ("%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S",
+                 "%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S")
+
+
+def parse_datetime(value):
+    """Returns the datetime represented by the string value, in the ISO
+    format written by datetime.isoformat() or one of _TIME_FORMATS
+
+    Raises: ValueError if value isn't in one of these formats
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    for time_format in _TIME_FORMATS:
+        try:
+            return datetime.strptime(value, time_format)
+        except ValueError:
+            pass
+    raise ValueError("Invalid isoformat string: {!r}".format(value))
+
+
+def _timestamp(value, lazy, parsed):
+    """Returns the created_at or updated_at value an instance keeps for
+    value: the string itself if lazy is True, the parsed datetime
+    otherwise. parsed maps the strings already parsed to their datetime.
+    """
+    if lazy and type(value) is str:
+        return value
+    if value not in parsed:
+        parsed[value] = parse_datetime(value)
+    return parsed[value]
+
+
+class _Timestamp:
+    """Data descriptor of the created_at and updated_at attributes,
+    parsing the string kept by a lazy_timestamps instance when it's read
+    """
+    def __set_name__(self, owner, name):
+        """Remembers the name of the attribute"""
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        """Returns the datetime of obj, parsing it if it's a string"""
+        if obj is None:
+            return self
+        try:
+            value = obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+        if type(value) is str:
+            value = obj.__dict__[self.name] = parse_datetime(value)
+        return value
+
+    def __set__(self, obj, value):
+        """Sets the datetime (or unparsed string) of obj"""
+        obj.__dict__[self.name] = value
+
+    def __delete__(self, obj):
+        """Deletes the datetime of obj"""
+        try:
+            del obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+
+class _ListDefault:
+    """Non-data descriptor of a list attribute, copying its default in
+    the instance the first time it's read (the instance attribute then
+    hides the descriptor)
+    """
+    def __init__(self, default=()):
+        """Keeps a copy of the default items"""
+        self.default = list(default)
+
+    def __set_name__(self, owner, name):
+        """Remembers the name of the attribute"""
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        """Returns the list of obj, a copy of the default set in obj if
+        it has none, or a copy of the default when read on the class
+        """
+        if obj is None:
+            return list(self.default)
+        value = obj.__dict__[self.name] = list(self.default)
+        return value
+
 
 class BaseModel:
-    """BaseModel class  definition"""
+    """BaseModel class  definition
+
+    Public class attributes:
+        lazy_timestamps: if True the created_at and updated_at strings
+                         are only parsed when they're first read.
+    Public class methods:
+        from_dict(cls, dictionary): returns the instance represented by
+                                    dictionary
+    """
+    lazy_timestamps = False
+    created_at = _Timestamp()
+    updated_at = _Timestamp()
+
     def __init__(self, *args, **kwargs):
         """Instatiate the BaseModel instance with unique id,
         the date the instance or object is created and the date
@@ -31,15 +155,84 @@ class BaseModel:
         self.id = str(uuid4())
         self.created_at = self.updated_at = datetime.today()
         if kwargs:
+            parsed = {}
             for key, value in kwargs.items():
                 if key != "__class__":
                     if key == "created_at" or key == "updated_at":
-                        value = datetime.strptime(value,
-                                                  "%Y-%m-%dT%H:%M:%S.%f")
+                        value = _timestamp(value, self.lazy_timestamps,
+                                           parsed)
                     setattr(self, key, value)
 
+    @classmethod
+    def from_dict(cls, dictionary):
+        """Returns the instance represented by dictionary, the output of
+        to_dict(), like cls(**dictionary) does but without generating an
+        id and timestamps that are overwritten right away. The attributes
+        are set at once and the instance isn't marked dirty.
+
+        The keys of dictionary are checked the first time a dictionary
+        with these keys is given for the class, those that can't be set
+        at once are given to cls(**dictionary).
+
+        args:
+            dictionary: dictionary representation of the instance.
+        """
+        keys = tuple(dictionary)
+        known = _known_keys.setdefault(cls, set())
+        if keys not in known:
+            if not cls._valid_keys(keys):
+                return cls(**dictionary)
+            known.add(keys)
+        obj = cls.__new__(cls)
+        attributes = dict(dictionary)
+        attributes.pop("__class__", None)
+        parsed = {}
+        for key in ("created_at", "updated_at"):
+            attributes[key] = _timestamp(attributes[key], cls.lazy_timestamps,
+                                         parsed)
+        obj.__dict__.update(attributes)
+        return obj
+
+    @classmethod
+    def _valid_keys(cls, keys):
+        """Returns True if the attributes named keys can be set at once
+        by from_dict(): id and the timestamps come first (as they do in
+        the __dict__ of an instance) and none of the other keys is set
+        through a descriptor of the class
+        """
+        names = [key for key in keys if key != "__class__"]
+        if names[:3] != ["id", "created_at", "updated_at"]:
+            return False
+        for key in names[3:]:
+            if (not isinstance(key, str) or
+                    hasattr(getattr(cls, key, None), "__set__")):
+                return False
+        return True
+
+    def __setattr__(self, name, value):
+        """Sets the attribute name to value and marks the instance dirty"""
+        super().__setattr__(name, value)
+        _dirty.add(self)
+
+    def __delattr__(self, name):
+        """Deletes the attribute name and marks the instance dirty"""
+        super().__delattr__(name)
+        _dirty.add(self)
+
+    def is_dirty(self):
+        """Returns True if the instance changed since mark_clean() was
+        last called on it
+        """
+        return self in _dirty
+
+    def mark_clean(self):
+        """Marks the instance as serialized by the storage"""
+        _dirty.discard(self)
+
     def __str__(self):
         """Returns the string representation of the BaseModel"""
+        for name in ("created_at", "updated_at"):
+            getattr(self, name, None)
         return ("[{}] ({}) {}".format(self.__class__.__name__,
                                       self.id, self.__dict__))
 
@@ -57,6 +250,7 @@ class BaseModel:
         model_dict["__class__"] = self.__class__.__name__
         for key, value in self.__dict__.items():
             if key == "created_at" or key == "updated_at":
-                value = value.isoformat()
+                if type(value) is not str:
+                    value = value.isoformat()
             model_dict[key] = value
         return (model_dict)
@@ -8,13 +8,29 @@ and name. The state_id associates a city with a particular state (using
 the State.id attribute). The name attribute stores the name of the city.
 Instances of this class allow for location-specific information management.
 """
+import models
 from models.base_model import BaseModel
+from models.place import Place
 
 
 class City(BaseModel):
     """A class city that inherits from BaseModel and has
     attributes state_id and name for access and specifically stores
     city name.
+
+    indexed_attributes lists the attributes the storage keeps an index on,
+    foreign_keys the ids of other objects the city refers to: it's
+    deleted with its state (see models.engine.cascade).
+    places: the list of the Place instances of the city.
     """
     state_id = ""
     name = ""
+    indexed_attributes = ("state_id",)
+    foreign_keys = (("state_id", "State", "cascade"),)
+
+    @property
+    def places(self):
+        """Returns the list of the Place instances of the city, found
+        through the index of the storage on Place.city_id
+        """
+        return models.storage.find(Place, city_id=self.id)
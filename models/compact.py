@@ -0,0 +1,180 @@
+#!/usr/bin/python3
+"""This module defines the compact representation of the model classes
+
+Module Description:
+Every BaseModel instance carries its own __dict__, which dominates the
+memory of a store holding millions of Place and Review objects. The
+compact(cls) function returns a variant of the model class cls whose
+instances keep their attributes in __slots__: one slot for id,
+created_at and updated_at and one for each attribute declared by the
+class (its public class attributes of type str, int, float or list,
+which are also the default values). Attributes that aren't declared by
+the class are kept in a dictionary created only when one is set.
+
+A compact class has the same name as the class it is made from, so its
+instances have the same <class name>.id key, the same to_dict() and
+__str__() output and the same kwargs constructor. The storage creates
+compact instances when it is asked to (FileStorage(compact=True)).
+Compact instances always parse their timestamps in the constructor,
+whatever the lazy_timestamps attribute of the model class is.
+
+A list default (e.g. Place.amenity_ids) is copied in the slot of the
+instance the first time it's read, so appending to it doesn't change the
+default of every other instance. A list equal to its default is left out
+of to_dict(), as if it had never been set.
+
+A compact class isn't a subclass of its model class (nor of BaseModel):
+isinstance(obj, Place) is False for a compact Place, whose model class
+is type(obj).model. isinstance(obj, (Place, compact(Place))) accepts
+both kinds of instances.
+"""
+from models.base_model import BaseModel, _ListDefault, _dirty, _known_keys
+from models.base_model import _timestamp
+
+_compact_classes = {}
+_FIELD_TYPES = (str, int, float, list)
+_BASE_KEYS = ("__class__", "id", "created_at", "updated_at")
+
+
+def schema(cls):
+    """Returns the field -> default value dictionary declared by the
+    model class cls: its public class attributes of type str, int, float
+    or list (or declared with _ListDefault)
+    """
+    fields = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if type(value) is _ListDefault:
+                value = value.default
+            if not name.startswith("_") and type(value) in _FIELD_TYPES:
+                fields[name] = value
+    return fields
+
+
+def compact(cls):
+    """Returns the compact variant of the model class cls"""
+    compact_cls = _compact_classes.get(cls)
+    if compact_cls is None:
+        defaults = schema(cls)
+        namespace = {"__slots__": tuple(defaults), "__module__": __name__,
+                     "model": cls, "defaults": defaults}
+        for klass in reversed(cls.__mro__[:-1]):
+            if klass is BaseModel:
+                continue
+            for name, value in vars(klass).items():
+                if (not name.startswith("__") and name not in defaults and
+                        name != "lazy_timestamps"):
+                    namespace[name] = value
+        compact_cls = type(cls.__name__, (CompactModel,), namespace)
+        _compact_classes[cls] = compact_cls
+    return compact_cls
+
+
+class CompactModel:
+    """Base class of the compact model classes, its instances behave
+    like the instances of the model class they are made from.
+
+    Public class attributes:
+        model: the model class the compact class is made from.
+        defaults: dictionary - field -> default value of the model class.
+    """
+    __slots__ = ("id", "created_at", "updated_at", "_extra", "__weakref__")
+    model = BaseModel
+    defaults = {}
+    lazy_timestamps = False
+
+    __init__ = BaseModel.__init__
+    __str__ = BaseModel.__str__
+    save = BaseModel.save
+    to_dict = BaseModel.to_dict
+    is_dirty = BaseModel.is_dirty
+    mark_clean = BaseModel.mark_clean
+
+    @classmethod
+    def from_dict(cls, dictionary):
+        """Returns the instance represented by dictionary, the output of
+        to_dict(), without running the constructor (see
+        BaseModel.from_dict)
+        """
+        keys = tuple(dictionary)
+        known = _known_keys.setdefault(cls, set())
+        if keys not in known:
+            if not {"id", "created_at", "updated_at"}.issubset(keys):
+                return cls(**dictionary)
+            known.add(keys)
+        obj = cls.__new__(cls)
+        slots = cls.__slots__
+        extra = None
+        for key, value in dictionary.items():
+            if key in slots:
+                object.__setattr__(obj, key, value)
+            elif key not in _BASE_KEYS:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        object.__setattr__(obj, "id", dictionary["id"])
+        parsed = {}
+        for key in ("created_at", "updated_at"):
+            object.__setattr__(obj, key,
+                               _timestamp(dictionary[key], False, parsed))
+        if extra is not None:
+            object.__setattr__(obj, "_extra", extra)
+        return obj
+
+    def __getattr__(self, name):
+        """Returns the attribute name that isn't in a slot: an attribute
+        set on the instance but not declared by the class, or the default
+        value of a declared attribute
+        """
+        if name == "_extra":
+            return None
+        extra = self._extra
+        if extra is not None and name in extra:
+            return extra[name]
+        if name in self.defaults:
+            value = self.defaults[name]
+            if type(value) is list:
+                value = list(value)
+                object.__setattr__(self, name, value)
+            return value
+        raise AttributeError("'{}' object has no attribute '{}'".format(
+            type(self).__name__, name))
+
+    def __setattr__(self, name, value):
+        """Sets the attribute name to value and marks the instance dirty"""
+        if name in self.defaults or name in CompactModel.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            extra = self._extra
+            if extra is None:
+                extra = {}
+                object.__setattr__(self, "_extra", extra)
+            extra[name] = value
+        _dirty.add(self)
+
+    def __delattr__(self, name):
+        """Deletes the attribute name and marks the instance dirty"""
+        extra = self._extra
+        if extra is not None and name in extra:
+            del extra[name]
+        else:
+            object.__delattr__(self, name)
+        _dirty.add(self)
+
+    @property
+    def __dict__(self):
+        """Returns a new dictionary of the attributes set on the instance,
+        as they would be in the __dict__ of a model instance
+        """
+        attributes = {}
+        defaults = self.defaults
+        for name in ("id", "created_at", "updated_at") + self.__slots__:
+            try:
+                value = object.__getattribute__(self, name)
+            except AttributeError:
+                continue
+            if type(value) is not list or value != defaults.get(name):
+                attributes[name] = value
+        if self._extra:
+            attributes.update(self._extra)
+        return attributes
@@ -0,0 +1,122 @@
+#!/usr/bin/python3
+"""This module defines the asyncio interface of the storages
+
+Module Description:
+The storages read and write files (or a database) and serialize the
+objects, which blocks the thread calling them: called from an asyncio
+event loop, a save stalls every other task of the loop until the file
+is written. The AsyncStorage mixin adds a coroutine for each method of
+the storage (asave() for save(), aget() for get()...) that runs the
+method in an executor and lets the loop run other tasks meanwhile:
+
+    user = await storage.aget(User, user_id)
+    user.first_name = "Betty"
+    await storage.anew(user)
+    await storage.asave()
+
+By default the methods run in a thread of the storage, one call after
+the other in the order they were awaited, so they see the changes made
+by the calls awaited before them (a storage that isn't thread safe is
+never used by two threads at once through its coroutines). Another
+executor can be set in the executor attribute of the storage.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncStorage:
+    """Mixin adding the coroutines running the methods of a storage in
+    an executor.
+
+    Private class attributes:
+        __thread: the executor started by the storage, if there is one
+    Public instance attributes:
+        executor: the executor the methods are run in, a thread of the
+                  storage (created on the first call) if it's None.
+    Public instance methods:
+        arun(self, function, *args): runs function(*args) in the executor
+        aall(self, cls): coroutine of all()
+        aget(self, cls, id): coroutine of get()
+        acount(self, cls): coroutine of count()
+        afind(self, cls, **attributes): coroutine of find()
+        anew(self, obj): coroutine of new()
+        adelete(self, obj): coroutine of delete()
+        adestroy(self, obj): coroutine of destroy()
+        asave(self): coroutine of save()
+        areload(self): coroutine of reload()
+        aclose(self): coroutine of close(), stops the thread of the storage
+    """
+    executor = None
+    __thread = None
+
+    async def arun(self, function, *args, **kwargs):
+        """Runs function(*args, **kwargs) in the executor of the storage
+        and returns its result, without blocking the event loop
+        """
+        if self.executor is None:
+            self.executor = self.__thread = ThreadPoolExecutor(
+                1, thread_name_prefix=type(self).__name__)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(function, *args, **kwargs))
+
+    async def aall(self, cls=None):
+        """Returns all(cls) computed in the executor"""
+        return await self.arun(self.all, cls)
+
+    async def aget(self, cls, id):
+        """Returns get(cls, id) computed in the executor"""
+        return await self.arun(self.get, cls, id)
+
+    async def acount(self, cls=None):
+        """Returns count(cls) computed in the executor"""
+        return await self.arun(self.count, cls)
+
+    async def afind(self, cls, **attributes):
+        """Returns find(cls, **attributes) computed in the executor"""
+        return await self.arun(self.find, cls, **attributes)
+
+    async def anew(self, obj):
+        """Calls new(obj) in the executor
+
+        Returns: nothing
+        """
+        await self.arun(self.new, obj)
+
+    async def adelete(self, obj=None):
+        """Calls delete(obj) in the executor
+
+        Returns: nothing
+        """
+        await self.arun(self.delete, obj)
+
+    async def adestroy(self, obj):
+        """Returns destroy(obj) computed in the executor"""
+        return await self.arun(self.destroy, obj)
+
+    async def asave(self):
+        """Calls save() in the executor
+
+        Returns: nothing
+        """
+        await self.arun(self.save)
+
+    async def areload(self):
+        """Calls reload() in the executor
+
+        Returns: nothing
+        """
+        await self.arun(self.reload)
+
+    async def aclose(self):
+        """Calls close() in the executor, then stops the thread of the
+        storage (a new one is started by the next call)
+
+        Returns: nothing
+        """
+        await self.arun(self.close)
+        if self.__thread is not None and self.executor is self.__thread:
+            thread = self.__thread
+            self.executor = self.__thread = None
+            thread.shutdown()
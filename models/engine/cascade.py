@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+"""This module defines the deletion of an object along with the objects
+depending on it
+
+Module Description:
+A model class lists in foreign_keys its attributes holding the id of
+another object, with the class of that object and what happens to the
+instance when that object is deleted, e.g. for City:
+
+    foreign_keys = (("state_id", "State", "cascade"),)
+
+The rules are those of _RULES:
+    cascade: the instance is deleted too (with its own dependents);
+    restrict: the object can't be deleted while the instance refers to it;
+    set-null: the attribute of the instance is set to None.
+
+destroy(storage, obj) first collects the objects to delete, level by
+level, looking the dependents of each object up with storage.find(),
+which goes through the indexes the storage keeps on the foreign keys
+(they're in the indexed_attributes of the classes): a restrict rule
+raises a ValueError before anything is changed. The objects are then
+deleted (and the set-null attributes cleared) inside one
+storage.transaction(), so the file is written once whatever the number
+of dependents.
+"""
+from datetime import datetime
+from models.base_model import BaseModel
+from models.user import User
+from models.place import Place
+from models.state import State
+from models.city import City
+from models.amenity import Amenity
+from models.review import Review
+
+_RULES = ("cascade", "restrict", "set-null")
+_MODELS = (BaseModel, User, Place, State, City, Amenity, Review)
+
+
+def dependents():
+    """Returns the <class name> -> list of (class name, attribute, rule)
+    dictionary of the foreign keys referring to the objects of each class
+
+    Raises: ValueError if a rule isn't one of _RULES
+    """
+    found = {}
+    for cls in _MODELS:
+        for attribute, parent, rule in getattr(cls, "foreign_keys", ()):
+            if rule not in _RULES:
+                raise ValueError("Unknown rule of {}.{}: {}".format(
+                    cls.__name__, attribute, rule))
+            found.setdefault(parent, []).append(
+                (cls.__name__, attribute, rule))
+    return found
+
+
+def plan(storage, obj):
+    """Returns the list of the objects deleted with obj (obj first) and
+    the list of the (object, attribute) pairs set to None, without
+    changing anything
+
+    Raises: ValueError if a restrict rule forbids the deletion
+    """
+    rules = dependents()
+    deleted = {_key(obj): obj}
+    cleared = []
+    level = [obj]
+    while level:
+        following = []
+        for parent in level:
+            for name, attribute, rule in rules.get(type(parent).__name__,
+                                                   ()):
+                for child in storage.find(name, **{attribute: parent.id}):
+                    if rule == "restrict":
+                        raise ValueError("can't delete {}: {} refers to it"
+                                         .format(_key(parent), _key(child)))
+                    if rule == "set-null":
+                        cleared.append((child, attribute))
+                    elif _key(child) not in deleted:
+                        deleted[_key(child)] = child
+                        following.append(child)
+        level = following
+    return (list(deleted.values()),
+            [(child, attribute) for child, attribute in cleared
+             if _key(child) not in deleted])
+
+
+def destroy(storage, obj):
+    """Deletes obj and the objects depending on it, clears the attributes
+    of the set-null dependents and saves the storage, once
+
+    Returns: the list of the deleted objects
+    Raises: ValueError if a restrict rule forbids the deletion, nothing
+            is deleted then
+    """
+    deleted, cleared = plan(storage, obj)
+    now = datetime.now()
+    with storage.transaction():
+        for child, attribute in cleared:
+            setattr(child, attribute, None)
+            child.updated_at = now
+            storage.new(child)
+        for each in deleted:
+            storage.delete(each)
+        storage.save()
+    return deleted
+
+
+def _key(obj):
+    """Returns the <class name>.id key of obj"""
+    return "{}.{}".format(type(obj).__name__, obj.id)
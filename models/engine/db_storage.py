@@ -0,0 +1,376 @@
+#!/usr/bin/python3
+"""This module define the DBStorage that stores instances in a SQLite
+database
+
+Module Description:
+The DBStorage offers the same interface as the FileStorage but keeps
+the instances in a SQLite database (using the sqlite3 module of the
+standard library) with one table per class. The class attributes of a
+model (e.g. Place.city_id, Place.price_by_night) become the columns of
+its table, the attributes that aren't part of the class (added with the
+console's update command for instance) and the values whose type isn't
+the type of their column (e.g. an int name) are kept as a JSON document
+in the "extra" column, so they're read back unchanged. new() and
+delete() write the row of the instance inside the current transaction,
+save() commits it: an update costs one row instead of a rewrite of every
+stored object. The indexed_attributes and sorted_attributes of a class
+get an SQL index.
+
+The instances read from the database are kept by <class name>.id so the
+same object is returned every time it's looked up.
+
+Inside a transaction() save() doesn't commit, the transaction is
+committed once at the end of the outermost one, or rolled back if it
+ends with an exception.
+
+The connection isn't tied to the thread that opened it, so the
+coroutines of the storage (see models.engine.async_storage) can use it
+from their thread; the storage still has to be used by one thread at a
+time.
+"""
+import json
+from contextlib import contextmanager
+import sqlite3
+from models.engine import cascade
+from models.engine.async_storage import AsyncStorage
+from models.engine.query import Query
+from models.base_model import BaseModel, _ListDefault
+from models.user import User
+from models.place import Place
+from models.state import State
+from models.city import City
+from models.amenity import Amenity
+from models.review import Review
+
+
+class DBStorage(AsyncStorage):
+    """DBStorage class definition and provides instance
+    storage operations backed by SQLite.
+
+    Private class attributes:
+        __classes: dictionary - <class name> -> class of the stored objects
+    Public instance methods:
+        all(self, cls): returns the objects (of class cls) by <class name>.id
+        get(self, cls, id): returns the object of class cls with id
+        count(self, cls): returns the number of objects (of class cls)
+        find(self, cls, **attributes): returns the objects of class cls
+                                       with the given attribute values
+        query(self, cls): returns the Query of the objects of class cls
+        new(self, obj): writes the row of obj in the current transaction
+        delete(self, obj): deletes the row of obj in the current transaction
+        destroy(self, obj): deletes obj and the objects depending on it
+        save(self): commits the current transaction
+        transaction(self): context manager deferring the commit to its end
+        reload(self): creates the tables and forgets the loaded objects
+        refresh(self): forgets the loaded objects if another connection
+                       changed the database
+        close(self): closes the database connection
+        asave(self)...: coroutines of the methods, see AsyncStorage
+    """
+    __classes = {"BaseModel": BaseModel, "User": User, "City": City,
+                 "Review": Review, "Amenity": Amenity, "Place": Place,
+                 "State": State}
+    __types = {str: "TEXT", int: "INTEGER", float: "REAL", list: "TEXT"}
+
+    def __init__(self, path="hbnb.db"):
+        """Instantiate the DBStorage
+
+        args:
+            path: path of the SQLite database file (or ":memory:").
+        """
+        self.__path = path
+        self.__connection = None
+        self.__objects = {}
+        self.__schemas = {}
+        self.__depth = 0
+        self.__data_version = None
+
+    def all(self, cls=None):
+        """Returns a dictionary of the objects by <class name>.id
+
+        args:
+            cls: a class or a class name, when given only the objects
+                 of that class are returned.
+        """
+        names = self.__names(cls)
+        result = {}
+        for name in names:
+            rows = self.__execute('SELECT * FROM "{}"'.format(name))
+            for row in rows:
+                obj = self.__instance(name, row)
+                result[name + "." + obj.id] = obj
+        return result
+
+    def get(self, cls, id):
+        """Returns the object of class cls with the given id, or None
+
+        args:
+            cls: a class or a class name, or None to look the id up
+                 whatever the class of the object is.
+            id: the id of the object.
+        """
+        names = self.__names(cls)
+        for name in names:
+            obj = self.__objects.get(name + "." + id)
+            if obj is not None:
+                return obj
+            row = self.__execute('SELECT * FROM "{}" WHERE id = ?'
+                                 .format(name), (id,)).fetchone()
+            if row is not None:
+                return self.__instance(name, row)
+        return None
+
+    def count(self, cls=None):
+        """Returns the number of stored objects, or the number of stored
+        objects of class cls (a class or a class name)
+        """
+        names = self.__names(cls)
+        total = 0
+        for name in names:
+            total += self.__execute('SELECT COUNT(*) FROM "{}"'
+                                    .format(name)).fetchone()[0]
+        return total
+
+    def find(self, cls, **attributes):
+        """Returns the list of objects of class cls whose attributes have
+        the given values, e.g. find(Review, place_id=place.id)
+
+        The attributes that are columns of the table are matched in SQL
+        (the rows keeping a value of another type in "extra" are checked
+        too), the other ones are checked on the instances.
+        """
+        if not self.__names(cls):
+            return []
+        name = self.__class_name(cls)
+        columns = self.__columns(name)
+        where = []
+        params = []
+        for attribute, value in attributes.items():
+            if (attribute in columns and columns[attribute] is not list and
+                    type(value) is columns[attribute]):
+                where.append('("{0}" = ? OR "{0}" IS NULL)'
+                             .format(attribute))
+                params.append(value)
+        query = 'SELECT * FROM "{}"'.format(name)
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        result = []
+        for row in self.__execute(query, params):
+            obj = self.__instance(name, row)
+            for attribute, value in attributes.items():
+                if getattr(obj, attribute, None) != value:
+                    break
+            else:
+                result.append(obj)
+        return result
+
+    def query(self, cls):
+        """Returns the Query of the objects of class cls (a class or a
+        class name), see models.engine.query
+        """
+        return Query(self, cls)
+
+    def new(self, obj):
+        """Writes the row of obj in the current transaction
+
+        args:
+            obj: the instance to be stored.
+        Returns: nothing
+        """
+        name = type(obj).__name__
+        columns = self.__columns(name)
+        row = {}
+        extra = {}
+        for key, value in obj.to_dict().items():
+            if key == "__class__":
+                continue
+            if key in columns and type(value) is columns[key]:
+                if type(value) is list:
+                    value = json.dumps(value)
+                row[key] = value
+                continue
+            extra[key] = value
+        row["extra"] = json.dumps(extra) if extra else None
+        self.__execute('INSERT OR REPLACE INTO "{}" ({}) VALUES ({})'.format(
+            name, ", ".join('"{}"'.format(key) for key in row),
+            ", ".join("?" * len(row))), list(row.values()))
+        self.__objects[name + "." + obj.id] = obj
+
+    def delete(self, obj=None):
+        """Deletes the row of obj in the current transaction
+
+        args:
+            obj: the instance to be deleted
+        Returns: nothing
+        """
+        if obj is None:
+            return
+        name = type(obj).__name__
+        self.__execute('DELETE FROM "{}" WHERE id = ?'.format(name),
+                       (obj.id,))
+        self.__objects.pop(name + "." + obj.id, None)
+
+    def destroy(self, obj):
+        """Deletes obj and the objects depending on it, as told by the
+        foreign_keys of the models, and saves the storage once, see
+        models.engine.cascade
+
+        Returns: the list of the deleted objects
+        Raises: ValueError if a restrict rule forbids the deletion
+        """
+        return cascade.destroy(self, obj)
+
+    def save(self):
+        """Commits the current transaction, unless it's called inside
+        a transaction()
+
+        Returns: nothing
+        """
+        if not self.__depth:
+            self.__connect().commit()
+
+    @contextmanager
+    def transaction(self):
+        """Context manager committing the rows written by the statements
+        of its block once, at the end of the outermost transaction
+
+        If the block raises an exception the database transaction is
+        rolled back and the loaded objects are forgotten, so they're
+        read again from the database.
+        """
+        self.__depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.__depth -= 1
+            if not self.__depth:
+                self.__connect().rollback()
+                self.__objects = {}
+            raise
+        self.__depth -= 1
+        if not self.__depth:
+            self.__connect().commit()
+
+    def reload(self):
+        """Creates the tables (and indexes) that don't exist yet and
+        forgets the objects loaded so far
+
+        Returns: nothing
+        """
+        connection = self.__connect()
+        with connection:
+            for name, cls in self.__classes.items():
+                self.__create_table(connection, name, cls)
+        self.__objects = {}
+
+    def refresh(self):
+        """Forgets the loaded objects if another connection committed
+        changes to the database since the last call, so they're read
+        again
+
+        Returns: True if the database was changed by another connection
+        """
+        version = self.__execute("PRAGMA data_version").fetchone()[0]
+        changed = (self.__data_version is not None and
+                   version != self.__data_version and not self.__depth)
+        self.__data_version = version
+        if changed:
+            self.__objects = {}
+        return changed
+
+    def close(self):
+        """Closes the database connection, uncommitted changes are lost
+
+        Returns: nothing
+        """
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+        self.__objects = {}
+
+    def __connect(self):
+        """Returns the database connection, opening it if needed"""
+        if self.__connection is None:
+            self.__connection = sqlite3.connect(self.__path,
+                                                check_same_thread=False)
+            self.__connection.row_factory = sqlite3.Row
+        return self.__connection
+
+    def __execute(self, query, params=()):
+        """Executes query and returns the cursor"""
+        return self.__connect().execute(query, params)
+
+    def __create_table(self, connection, name, cls):
+        """Creates the table of class cls, adds the columns that are
+        missing from an existing table and the indexes of the class
+        """
+        columns = self.__columns(name)
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS "{}" (id TEXT PRIMARY KEY, '
+            'created_at TEXT, updated_at TEXT, extra TEXT)'.format(name))
+        existing = [row[1] for row in connection.execute(
+            'PRAGMA table_info("{}")'.format(name))]
+        for column, kind in columns.items():
+            if column not in existing:
+                connection.execute('ALTER TABLE "{}" ADD COLUMN "{}" {}'
+                                   .format(name, column, self.__types[kind]))
+        for attribute in (getattr(cls, "indexed_attributes", ()) +
+                          getattr(cls, "sorted_attributes", ())):
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS "{0}_{1}" ON "{0}" ("{1}")'
+                .format(name, attribute))
+
+    def __columns(self, name):
+        """Returns the column -> type dictionary of the table of class
+        name: id, the timestamps and the public class attributes of type
+        str, int, float or list (or declared with _ListDefault)
+        """
+        columns = self.__schemas.get(name)
+        if columns is None:
+            columns = self.__schemas[name] = {"id": str, "created_at": str,
+                                              "updated_at": str}
+            for klass in reversed(self.__classes[name].__mro__):
+                for attribute, value in vars(klass).items():
+                    if type(value) is _ListDefault:
+                        value = value.default
+                    if (not attribute.startswith("_") and
+                            type(value) in self.__types):
+                        columns[attribute] = type(value)
+        return columns
+
+    def __instance(self, name, row):
+        """Returns the instance stored in row of the table of class name,
+        the loaded instance if there is one
+        """
+        key = name + "." + row["id"]
+        obj = self.__objects.get(key)
+        if obj is not None:
+            return obj
+        columns = self.__columns(name)
+        kwargs = {}
+        for column in row.keys():
+            value = row[column]
+            if value is None or column == "extra":
+                continue
+            if columns.get(column) is list:
+                value = json.loads(value)
+            kwargs[column] = value
+        if row["extra"] is not None:
+            kwargs.update(json.loads(row["extra"]))
+        obj = self.__classes[name].from_dict(kwargs)
+        self.__objects[key] = obj
+        return obj
+
+    def __names(self, cls):
+        """Returns the list of the class names matching cls: every class
+        name if cls is None, none if cls isn't a stored class
+        """
+        if cls is None:
+            return list(self.__classes)
+        name = self.__class_name(cls)
+        return [name] if name in self.__classes else []
+
+    @staticmethod
+    def __class_name(cls):
+        """Returns the name of cls, which is a class or a class name"""
+        return cls if isinstance(cls, str) else cls.__name__
@@ -10,9 +10,111 @@ object-oriented realm and the persistent storage layer. It offers
 methods to store and retrieve instances, maintaining them across program
 launches. By converting instances to JSON strings and storing them in a file,
 the FileStorage module enables persistence and seamless data recovery.
+
+In journal mode the file is not rewritten on every save: only the
+objects changed since the last save are appended to a journal next to
+the JSON file, and the journal is folded back into the JSON file once
+it grows past journal_limit entries.
+
+Besides __objects the FileStorage keeps a per-class index (class name ->
+id -> object) and an id -> key map, so an instance can be looked up by
+its id and the instances of one class enumerated or counted without
+scanning every stored object. The attributes listed in the
+indexed_attributes of a model class (e.g. City.state_id) get a hash
+index too, used by find() to answer equality queries; the objects found
+for one such attribute are remembered by the index until one of them is
+stored with another value, another object is stored with that value or
+one of them is deleted, which makes the relationship properties of the
+models (State.cities, City.places, Place.reviews, User.places) cost a
+copy of their list once they've been read. The numeric attributes
+listed in sorted_attributes (e.g. Place.price_by_night) get a
+SortedIndex, used by range() to return the objects whose value is in a
+range, in the order of the values, without scanning the class. The
+(latitude, longitude) pair named by geo_attributes (Place.latitude and
+Place.longitude) gets a GeoIndex, used by near() and k_nearest() to find
+the places around a point by looking at the cells of a grid around it.
+The list attributes named by bitmap_attributes (Place.amenity_ids) get a
+BitmapIndex, used by having() to find the objects whose list holds all
+(or any) of some items with bitwise operations on a bitmap per item.
+The text_attributes of a class (Place.name and Place.description,
+Review.text) get a TextIndex the first time search() is called on the
+class: an inverted index from the words of the texts to the objects.
+close() keeps it in a <file>.<class name>.text file next to the JSON file,
+read back by the first search() after the next start: only the objects
+whose texts changed since then (told by a digest of their texts) are
+split in words again.
+
+The JSON file is read incrementally (see models.engine.streaming), each
+object being turned into an instance as soon as it's decoded. In lazy
+mode reload() doesn't create the instances at all: it keeps the decoded
+dictionaries aside and an instance is only created the first time it's
+accessed through all(), get() or find().
+
+When the whole file is written, the JSON text of each object is kept so
+the next save only serializes the objects that are dirty (see
+BaseModel.is_dirty) and reuses the text of the other ones.
+
+The file is written with the codec given to the constructor (JSON by
+default, see models.engine.formats for the binary ones) and read with
+the codec it was written with. The journal is always JSON.
+
+Inside a transaction() the saves are deferred: the file is written once
+when the outermost transaction ends, and the objects it touched are put
+back in their last saved state if it ends with an exception.
+
+The JSON file is never rewritten in place: the new content is written
+to a temporary file which replaces the JSON file once it's on disk, so
+a crash during a save leaves the previous content intact. With a
+flush_interval save() returns at once and a background thread writes
+the changes at most flush_interval seconds later, the saves made in
+the meantime being written together; flush() (or close()) writes them
+right away.
+
+In sharded mode the objects are spread over one JSON file per class
+(file.<class name>.json for file.json), or over buckets files per class
+(file.<class name>.<bucket>.json) picked from a hash of the id. The
+files of a class are only read the first time the objects of the class
+are accessed, and a save only rewrites the files holding an object that
+changed, instead of the whole store.
+
+A shared file can be used by several processes at the same time: the
+file is locked (see models.engine.locks) while it's read or written,
+refresh() reads it again only if another process wrote it since, and a
+save first reads what the other processes wrote so the file holds both
+their changes and the changes of this process.
+
+The storage can be used by several threads: new(), delete() and the
+reloads hold its reader/writer lock (see models.engine.locks) to write,
+a save holds it to read while it serializes the objects, so it writes a
+consistent snapshot of them, and releases it before writing the file.
+A thread_safe FileStorage holds it to read in all(), get(), count() and
+find() as well: the lookups of several threads run together, and wait
+only while another thread changes the objects.
+
+With processes > 1, a reload decodes a JSON file bigger than
+__parallel_threshold bytes by ranges of lines in several processes, and
+the files of several classes of a sharded storage are decoded each in a
+process (see models.engine.parallel); smaller files are decoded in the
+process of the storage, which is faster than starting other processes.
 """
-import json
-from models.base_model import BaseModel
+import atexit
+import itertools
+import marshal
+import os
+import threading
+import zlib
+from contextlib import contextmanager, nullcontext
+from models.engine import cascade
+from models.engine import journal
+from models.engine import formats
+from models.engine import parallel
+from models.engine.async_storage import AsyncStorage
+from models.engine.indexes import GeoIndex, HashIndex, SortedIndex
+from models.engine.indexes import BitmapIndex, TextIndex
+from models.engine.locks import FileLock, RWLock, file_stamp
+from models.engine.query import Query
+from models.compact import compact as compact_class
+from models.base_model import BaseModel, _dirty
 from models.user import User
 from models.place import Place
 from models.state import State
@@ -21,7 +123,7 @@ from models.amenity import Amenity
 from models.review import Review
 
 
-class FileStorage:
+class FileStorage(AsyncStorage):
     """FileStorage class definition and provides instance
     storage operations.
 
@@ -29,21 +131,415 @@ class FileStorage:
         __file_path: string - path to the JSON file.
         __objects: dictionary - empty but will store all
                             objects by <class name>.id
+        __by_class: dictionary - <class name> -> id -> object index
+        __ids: dictionary - id -> <class name>.id index
+        __pending: dictionary - <class name> -> id -> dictionary of the
+                   objects loaded in lazy mode but not instantiated yet
+        __fragments: dictionary - <class name>.id -> JSON text of the
+                     object written by the last save
+        __attr_indexes: dictionary - <class name> -> attribute -> HashIndex
+                        (remembering the objects find() returned) or
+                        SortedIndex or BitmapIndex,
+                        (latitude, longitude) -> GeoIndex,
+                        text attributes -> TextIndex
+                        (a shared FileStorage has its own copy of the
+                        dictionaries above, so the objects of the process
+                        don't leak into the file of other processes)
+        __classes: dictionary - <class name> -> class of the stored objects
+        __lock: RWLock - held to write while the objects are changed,
+                to read while they're serialized by a save (and by the
+                lookups of a thread_safe FileStorage)
+        __save_lock: lock held while the files are written
+        __parallel_threshold: number of bytes from which the files are
+                              decoded by several processes
+        __range_part: number of ids read from a sorted index at once
     Public instance methods:
-        all(self): returns the dictionary __objects
+        all(self, cls): returns the dictionary __objects, or only the
+                        objects of class cls
+        get(self, cls, id): returns the object of class cls with id
+        count(self, cls): returns the number of objects (of class cls)
+        find(self, cls, **attributes): returns the objects of class cls
+                                       with the given attribute values
+        query(self, cls): returns the Query of the objects of class cls
+        range(self, cls, attribute, low, high...): yields the objects of
+                        class cls sorted by attribute, in a range of values
+        near(self, latitude, longitude, radius): returns the places
+                        within radius km of a point
+        k_nearest(self, latitude, longitude, k): returns the k places
+                        closest to a point
+        search(self, cls, text, prefix): returns the objects of class cls
+                        whose texts hold the words of text
+        having(self, cls, attribute, all_of, any_of): returns the objects
+                        of class cls whose list attribute holds items
+        add_index(self, cls, attribute): indexes attribute of class cls
+        transaction(self): context manager deferring the saves to its end
         new(self, obj): sets in __objects the obj with key <obj class name>.id
+        delete(self, obj): deletes obj from __objects
+        destroy(self, obj): deletes obj and the objects depending on it
         save(self): serializes __objects to the JSON file (path: __file_path)
         reload(self): deserializes the JSON file to __objects
+        compact(self): folds the journal back into the JSON file
+        refresh(self): reads the objects written by other processes
+        flush(self): writes the saves the background thread hasn't yet
+        close(self): writes the pending saves before the program exits
+        asave(self)...: coroutines of the methods, see AsyncStorage
     """
     __file_path = "file.json"
     __objects = {}
+    __by_class = {}
+    __ids = {}
+    __pending = {}
+    __fragments = {}
+    __attr_indexes = {}
+    __fragment_codec = None
+    __classes = {"BaseModel": BaseModel, "User": User, "City": City,
+                 "Review": Review, "Amenity": Amenity, "Place": Place,
+                 "State": State}
+    __lock = RWLock()
+    __save_lock = threading.RLock()
+    __parallel_threshold = 4 << 20
+    __range_part = 256
+
+    def __init__(self, journal=False, journal_limit=1000, lazy=False,
+                 compact=False, flush_interval=0, sharded=False, buckets=1,
+                 codec="json", shared=False, thread_safe=False,
+                 processes=0):
+        """Instantiate the FileStorage
+
+        args:
+            journal: when True, save() appends the changed objects to
+                     <__file_path>.journal instead of rewriting the file.
+            journal_limit: number of journal entries after which the
+                           journal is compacted into the JSON file.
+            lazy: when True, reload() only decodes the JSON file and the
+                  instances are created the first time they're accessed.
+            compact: when True, the instances read from the JSON file are
+                     created with the compact (__slots__ based) variant of
+                     their class, see models.compact.
+            flush_interval: when > 0, save() returns at once and the
+                            changes are written by a background thread
+                            at most flush_interval seconds later.
+            sharded: when True, the objects are kept in one JSON file per
+                     class (and bucket) read when the class is accessed.
+            buckets: number of files the objects of a class are spread
+                     over in sharded mode.
+            codec: name of the codec the file is written with, see
+                   models.engine.formats.
+            shared: when True, the file is locked while it's read or
+                    written and another process writing it is detected,
+                    see refresh().
+            thread_safe: when True, all(), get(), count() and find()
+                         hold the lock to read, so they can be called
+                         while other threads change the objects; all()
+                         then returns a copy of __objects.
+            processes: when > 1, the number of processes a big file is
+                       decoded with.
+        Raises: ValueError if both journal and sharded are True, or if
+                the codec isn't available
+        """
+        if journal and sharded:
+            raise ValueError("journal mode can't be used in sharded mode")
+        self.__lazy = lazy
+        self.__compact = compact
+        self.__journal = journal
+        self.__journal_limit = journal_limit
+        self.__journal_size = 0
+        self.__changed = set()
+        self.__depth = 0
+        self.__deferred = False
+        self.__touched = set()
+        self.__flush_interval = flush_interval
+        self.__timer = None
+        if flush_interval > 0:
+            atexit.register(self.flush)
+        self.__codec = formats.get(codec)
+        self.__sharded = sharded
+        self.__buckets = buckets
+        self.__loaded = set()
+        self.__shared = shared
+        self.__file_lock = None
+        self.__stamps = {}
+        self.__thread_safe = thread_safe
+        self.__processes = processes
+        if shared:
+            self.__objects = {}
+            self.__by_class = {}
+            self.__ids = {}
+            self.__pending = {}
+            self.__fragments = {}
+            self.__attr_indexes = {}
+            self.__fragment_codec = None
+
+    def all(self, cls=None):
+        """Returns the dictionary __objects to saved is json file
+
+        The dictionary is the one the storage indexes: the objects are
+        added and removed with new() and delete(), not by changing it.
+        A thread_safe FileStorage returns a copy of it instead, taken
+        while no other thread changes it.
+
+        args:
+            cls: a class or a class name, when given only the objects
+                 of that class are returned (in a new dictionary).
+        """
+        if cls is None:
+            self.__ensure()
+            for name in list(self.__pending):
+                self.__load_class(name)
+            if not self.__thread_safe:
+                return self.__objects
+            with self.__lock.read():
+                return dict(self.__objects)
+        name = self.__class_name(cls)
+        self.__ensure(name)
+        self.__load_class(name)
+        with self.__reading():
+            objects = self.__by_class.get(name, {})
+            return {name + "." + obj_id: obj
+                    for obj_id, obj in objects.items()}
+
+    def get(self, cls, id):
+        """Returns the object of class cls with the given id, or None
+
+        args:
+            cls: a class or a class name, or None to look the id up
+                 whatever the class of the object is.
+            id: the id of the object.
+        """
+        self.__ensure(None if cls is None else self.__class_name(cls))
+        with self.__reading():
+            if cls is None:
+                key = self.__ids.get(id)
+                if key is None:
+                    return None
+                name = key.partition(".")[0]
+            else:
+                name = self.__class_name(cls)
+            obj = self.__by_class.get(name, {}).get(id)
+            pending = obj is None and id in self.__pending.get(name, {})
+        if pending:
+            obj = self.__load(name, id)
+        return obj
+
+    def count(self, cls=None):
+        """Returns the number of stored objects, or the number of stored
+        objects of class cls (a class or a class name)
+        """
+        if cls is None:
+            self.__ensure()
+            with self.__reading():
+                return len(self.__objects) + sum(
+                    map(len, self.__pending.values()))
+        name = self.__class_name(cls)
+        self.__ensure(name)
+        with self.__reading():
+            return (len(self.__by_class.get(name, {})) +
+                    len(self.__pending.get(name, {})))
+
+    def find(self, cls, **attributes):
+        """Returns the list of objects of class cls whose attributes have
+        the given values, e.g. find(Review, place_id=place.id)
+
+        The hash index of the most selective indexed attribute is used to
+        pick the candidates, the class is scanned if none is indexed. The
+        objects found for one attribute with a hash index are remembered
+        by the index until an object gets or loses that value (through
+        new(), delete() or a reload), so looking the children of a parent
+        up again (see State.cities) doesn't look them up one by one.
+
+        args:
+            cls: a class or a class name.
+            attributes: attribute name/value pairs to be matched.
+        """
+        name = self.__class_name(cls)
+        self.__ensure(name)
+        if name not in self.__attr_indexes:
+            with self.__lock.write():
+                self.__indexes_for(name)
+        memo = None
+        with self.__reading():
+            objects = self.__by_class.get(name, {})
+            pending = self.__pending.get(name, {})
+            indexes = self.__indexes_for(name)
+            if len(attributes) == 1:
+                (attribute, value), = attributes.items()
+                index = indexes.get(attribute)
+                if type(index) is HashIndex:
+                    try:
+                        found = index.recall(value)
+                        memo = (index, value, index.changes)
+                    except TypeError:
+                        found = None
+                    if found is not None:
+                        return [obj for obj in found if self.__value(
+                            name, obj, attribute) == value]
+            candidates = None
+            for attribute, value in attributes.items():
+                if attribute in indexes:
+                    try:
+                        ids = indexes[attribute].lookup(value)
+                    except TypeError:
+                        continue
+                    if candidates is None or len(ids) < len(candidates):
+                        candidates = ids
+            if candidates is None:
+                candidates = list(objects) + list(pending)
+            result = []
+            for obj_id in candidates:
+                record = objects.get(obj_id)
+                if record is None:
+                    record = pending[obj_id]
+                for attribute, value in attributes.items():
+                    if self.__value(name, record, attribute) != value:
+                        break
+                else:
+                    result.append(obj_id)
+        result = [self.get(name, obj_id) for obj_id in result]
+        if memo is not None:
+            index, value, changes = memo
+            with self.__lock.write():
+                index.remember(value, tuple(result), changes)
+        return result
+
+    def range(self, cls, attribute, low=None, high=None, include_low=True,
+              include_high=True, reverse=False):
+        """Returns an iterator over the objects of class cls whose value
+        of attribute, which has a sorted index, is between low and high,
+        sorted by that value (then by id), or in the reverse order:
+
+            for place in storage.range(Place, "price_by_night", high=120):
+
+        The index is read in parts as the iterator advances, so reading
+        the first k objects costs O(log n + k). Without bounds, the
+        objects whose value isn't a number come after the other ones (or
+        before them in the reverse order).
+
+        args:
+            cls: a class or a class name.
+            attribute: the attribute the objects are sorted by.
+            low, high: the bounds of the range, None for no bound.
+            include_low, include_high: whether a value equal to the
+                                       bound is in the range.
+            reverse: if True the greatest values come first.
+        Raises: ValueError if attribute has no sorted index, TypeError
+                if a bound isn't a number
+        """
+        name = self.__class_name(cls)
+        self.__ensure(name)
+        if name not in self.__attr_indexes:
+            with self.__lock.write():
+                self.__indexes_for(name)
+        index = self.__attr_indexes[name].get(attribute)
+        if type(index) is not SortedIndex:
+            raise ValueError("{}.{} has no sorted index"
+                             .format(name, attribute))
+        # checks the bounds now rather than when the iterator is read
+        index.range(low, high, count=0)
+        return self.__range(name, index, (low, high, include_low,
+                                          include_high, reverse))
+
+    def near(self, latitude, longitude, radius, cls=Place):
+        """Returns the list of the (distance, object) pairs of the objects
+        of class cls located within radius km of the point (latitude,
+        longitude), closest first; distance is in km
+
+        Raises: ValueError if cls has no geo_attributes, TypeError if the
+                point or the radius aren't numbers
+        """
+        index, name = self.__geo_index(cls)
+        with self.__reading():
+            found = index.near(latitude, longitude, radius)
+        return self.__located(name, found)
+
+    def k_nearest(self, latitude, longitude, k, cls=Place):
+        """Returns the list of the (distance, object) pairs of the k
+        objects of class cls closest to the point (latitude, longitude),
+        closest first; distance is in km
+
+        Raises: ValueError if cls has no geo_attributes, TypeError if the
+                point isn't made of numbers
+        """
+        index, name = self.__geo_index(cls)
+        with self.__reading():
+            found = index.k_nearest(latitude, longitude, k)
+        return self.__located(name, found)
+
+    def search(self, cls, text, prefix=False):
+        """Returns the list of the objects of class cls whose
+        text_attributes hold every word of text (whatever their case),
+        best match first, e.g. search(Place, "sea view")
 
-    def all(self):
-        """Returns the dictionary __objects to saved is json file"""
-        return self.__objects
+        args:
+            cls: a class or a class name.
+            text: the words searched.
+            prefix: if True the last word of text matches the words it
+                    starts, "sea vi" finding "sea view".
+        Raises: ValueError if cls has no text_attributes
+        """
+        index, name = self.__text_index(cls)
+        with self.__reading():
+            found = index.search(text, prefix)
+        return list(self.__objects_of(name, (obj_id for score, obj_id
+                                             in found)))
+
+    def having(self, cls, attribute, all_of=(), any_of=None):
+        """Returns the list of the objects of class cls whose list
+        attribute, which has a bitmap index, holds every item of all_of
+        and, if any_of isn't None, at least one item of any_of, e.g. the
+        places with Wi-Fi and a pool:
+
+            storage.having(Place, "amenity_ids", [wifi.id, pool.id])
+
+        args:
+            cls: a class or a class name.
+            attribute: the attribute holding a list of items.
+            all_of: the items every object found holds.
+            any_of: items of which every object found holds one.
+        Raises: ValueError if attribute has no bitmap index, TypeError if
+                an item is unhashable
+        """
+        name = self.__class_name(cls)
+        self.__ensure(name)
+        if name not in self.__attr_indexes:
+            with self.__lock.write():
+                self.__indexes_for(name)
+        index = self.__attr_indexes[name].get(attribute)
+        if type(index) is not BitmapIndex:
+            raise ValueError("{}.{} has no bitmap index"
+                             .format(name, attribute))
+        with self.__reading():
+            found = index.having(all_of, any_of)
+        return list(self.__objects_of(name, found))
+
+    def add_index(self, cls, attribute, sorted=False):
+        """Maintains an index on attribute for the objects of class cls (a
+        class or a class name), on top of its indexed_attributes and
+        sorted_attributes: a SortedIndex if sorted is True, a HashIndex
+        otherwise (a SortedIndex answers the equality queries as well, it
+        isn't replaced by a HashIndex)
+        """
+        name = self.__class_name(cls)
+        self.__ensure(name)
+        kind = SortedIndex if sorted else HashIndex
+        with self.__lock.write():
+            indexes = self.__indexes_for(name)
+            current = type(indexes.get(attribute))
+            if current is not kind and current is not SortedIndex:
+                index = kind(attribute)
+                for obj_id, record in self.__records(name):
+                    index.add(obj_id, self.__value(name, record, attribute))
+                indexes[attribute] = index
+
+    def query(self, cls):
+        """Returns the Query of the objects of class cls (a class or a
+        class name), see models.engine.query
+        """
+        return Query(self, cls)
 
     def new(self, obj):
-        """Sets in __objects the obj with key <obj class name>.id
+        """Sets in __objects the obj with key <obj class name>.id, it's
+        serialized again on the next save (even if it was changed in a
+        way that didn't mark it dirty, e.g. by appending to a list)
 
         args:
             obj: A dictionary to be set as a value to <obj class name>.id
@@ -51,37 +547,806 @@ class FileStorage:
         Returns: nothing
         """
         key = "{}.{}".format(type(obj).__name__, obj.id)
-        self.__objects[key] = obj
+        self.__ensure(type(obj).__name__)
+        with self.__lock.write():
+            self.__put(key, obj)
+            self.__fragments.pop(key, None)
+            self.__changed.add(key)
+            if self.__depth:
+                self.__touched.add(key)
+
+    def delete(self, obj=None):
+        """Deletes obj from __objects if it's inside, the change is
+        written to the JSON file on the next save()
+
+        args:
+            obj: the instance to be deleted
+        Returns: nothing
+        """
+        if obj is None:
+            return
+        key = "{}.{}".format(type(obj).__name__, obj.id)
+        self.__ensure(type(obj).__name__)
+        with self.__lock.write():
+            if self.__drop(key) is not None:
+                self.__changed.add(key)
+                if self.__depth:
+                    self.__touched.add(key)
+
+    def destroy(self, obj):
+        """Deletes obj and the objects depending on it, as told by the
+        foreign_keys of the models, and saves the storage once, see
+        models.engine.cascade
+
+        Returns: the list of the deleted objects
+        Raises: ValueError if a restrict rule forbids the deletion
+        """
+        return cascade.destroy(self, obj)
 
     def save(self):
         """Serializes __objects to the JSON file (path: __file_path)
 
+        In journal mode only the objects changed since the last save
+        are appended to the journal. Inside a transaction nothing is
+        written until the transaction ends. With a flush_interval the
+        write is left to the background thread.
+
         Returns: nothing
         """
-        data = {}
-        for key in self.__objects:
-            data[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, "w", encoding="utf-8") as file:
-            json.dump(data, file)
+        if self.__depth:
+            self.__deferred = True
+            return
+        if self.__flush_interval > 0:
+            with self.__lock.write():
+                if self.__timer is None:
+                    self.__timer = threading.Timer(self.__flush_interval,
+                                                   self.flush)
+                    self.__timer.daemon = True
+                    self.__timer.start()
+            return
+        self.__write()
+
+    def flush(self):
+        """Writes the changes saved since the last write of the
+        background thread, if there are any
+
+        The changes of a write that failed are kept, so they're written
+        again by the next flush() or close().
+
+        Returns: nothing
+        """
+        with self.__save_lock:
+            with self.__lock.write():
+                timer = self.__timer
+                pending = timer is not None or (self.__flush_interval > 0 and
+                                                bool(self.__changed))
+            if timer is not None:
+                timer.cancel()
+            try:
+                if pending:
+                    self.__write()
+            finally:
+                with self.__lock.write():
+                    if self.__timer is timer:
+                        self.__timer = None
+
+    def close(self):
+        """Writes the pending saves, called when the program exits, and
+        the text indexes that changed
+
+        Returns: nothing
+        """
+        self.flush()
+        with self.__save_lock:
+            with self.__lock.read():
+                documents = []
+                for name, indexes in self.__attr_indexes.items():
+                    for index in indexes.values():
+                        if type(index) is TextIndex and index.changed:
+                            documents.append((self.__text_path(name),
+                                              marshal.dumps(index.dump())))
+            for path, data in documents:
+                self.__write_file(path, data)
+
+    @contextmanager
+    def transaction(self):
+        """Context manager collecting the objects changed by the
+        statements of its block and saving them once, at the end of the
+        outermost transaction:
+
+            with storage.transaction():
+                place.name = "Home"
+                place.save()
+                review.save()
+
+        If the block raises an exception nothing is saved and the
+        objects added, updated or deleted in the transaction are put
+        back in the state they had in the file (the instances held by
+        the caller are replaced in the storage, not modified).
+        """
+        self.__depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.__depth -= 1
+            if not self.__depth:
+                self.__rollback()
+            raise
+        self.__depth -= 1
+        if not self.__depth:
+            self.__touched.clear()
+            if self.__deferred:
+                self.__deferred = False
+                self.save()
+
+    def compact(self):
+        """Writes every object of __objects to the JSON file (to every
+        file in sharded mode) and empties the journal
+
+        The objects are serialized while the lock is held to read, the
+        files are written once it's released.
+
+        Returns: nothing
+        """
+        self.__ensure()
+        with self.__save_lock, self.__locked():
+            self.__refresh()
+            with self.__lock.read():
+                changed = self.__take_changes()
+                if self.__sharded:
+                    documents = [self.__shard_document(shard)
+                                 for name in self.__classes
+                                 for shard in self.__shards(name)]
+                else:
+                    documents = [self.__document()]
+            self.__write_documents(documents, changed)
+            if self.__journal_size:
+                journal.truncate(self.__journal_path())
+                self.__journal_size = 0
+                self.__stamp(self.__journal_path())
 
     def reload(self):
         """Deserializes the JSON file to __objects (only if the JSON file
         (__file_path) exists ; otherwise, do nothing.
         If the file doesn’t exist, no exception should be raised)
+        followed by the entries of the journal, if there is one.
 
         Returns: nothing
         """
-        classes_dict = {"BaseModel": BaseModel, "User": User, "City": City,
-                        "Review": Review, "Amenity": Amenity, "Place": Place,
-                        "State": State}
+        with self.__locked(False), self.__lock.write():
+            if self.__sharded:
+                self.__loaded.clear()
+                return
+            if os.path.exists(self.__file_path):
+                empty = True
+                for key, value in self.__read_all(self.__file_path):
+                    empty = False
+                    self.__restore(key, value)
+                if empty:
+                    self.__objects.clear()
+                    self.__by_class.clear()
+                    self.__ids.clear()
+                    self.__pending.clear()
+                    self.__fragments.clear()
+                    self.__clear_indexes()
+            self.__journal_size = 0
+            for key, value in journal.replay(self.__journal_path()):
+                self.__journal_size += 1
+                if value is None:
+                    self.__drop(key)
+                else:
+                    self.__restore(key, value)
+            self.__stamp(self.__file_path)
+            self.__stamp(self.__journal_path())
+
+    def refresh(self):
+        """Reads again the objects another process wrote since this one
+        last read or wrote the file (only if the file is shared), keeping
+        the changes of this process that aren't saved yet
+
+        Returns: True if another process wrote the file
+        """
+        if not self.__shared:
+            return False
+        with self.__locked(False):
+            return self.__refresh()
+
+    def __write(self):
+        """Writes the changes: rewrites the JSON file, or appends the
+        changed objects to the journal in journal mode
+        """
+        with self.__save_lock, self.__locked():
+            self.__refresh()
+            if not self.__sharded and not self.__journal:
+                self.compact()
+                return
+            with self.__lock.read():
+                changed = self.__take_changes()
+                if self.__sharded:
+                    shards = {self.__shard(key) for key in changed}
+                    for obj in list(_dirty):
+                        key = "{}.{}".format(type(obj).__name__,
+                                             getattr(obj, "id", None))
+                        if self.__objects.get(key) is obj:
+                            shards.add(self.__shard(key))
+                    documents = [self.__shard_document(shard)
+                                 for shard in shards]
+                else:
+                    entries = []
+                    for key in changed:
+                        obj = self.__objects.get(key)
+                        entries.append((key, obj.to_dict() if obj is not None
+                                        else None))
+            if self.__sharded:
+                self.__write_documents(documents, changed)
+                return
+            try:
+                self.__journal_size += journal.append(self.__journal_path(),
+                                                      entries)
+            except BaseException:
+                self.__give_back(changed)
+                raise
+            self.__stamp(self.__journal_path())
+            if self.__journal_size > self.__journal_limit:
+                self.compact()
+
+    def __take_changes(self):
+        """Returns the keys changed since the last save and starts a new
+        set of changes, called while the lock is held
+        """
+        changed = self.__changed
+        self.__changed = set()
+        return changed
+
+    def __give_back(self, changed):
+        """Puts the keys changed returned by __take_changes back in the
+        changes, when they couldn't be written
+        """
+        with self.__lock.write():
+            self.__changed |= changed
+
+    def __write_documents(self, documents, changed):
+        """Writes the (path, content) documents, putting the keys changed
+        back in the changes if one of them couldn't be written
+        """
+        try:
+            for path, data in documents:
+                self.__write_file(path, data)
+        except BaseException:
+            self.__give_back(changed)
+            raise
+
+    def __document(self):
+        """Returns the (path, content) of the JSON file, holding every
+        object (and pending object)
+        """
+        self.__use_codec()
+        items = []
+        for key, obj in self.__objects.items():
+            items.append((key, self.__fragment(key, obj)))
+        for name, pending in self.__pending.items():
+            for obj_id, value in pending.items():
+                key = name + "." + obj_id
+                items.append((key, self.__fragment(key, value)))
+        return self.__file_path, self.__codec.document(items)
+
+    def __shard_document(self, shard):
+        """Returns the (path, content) of the JSON file of shard"""
+        name, _, bucket = shard.partition(".")
+        self.__use_codec()
+        items = []
+        for obj_id, record in self.__records(name):
+            key = name + "." + obj_id
+            if bucket and self.__shard(key) != shard:
+                continue
+            items.append((key, self.__fragment(key, record)))
+        return self.__shard_path(shard), self.__codec.document(items)
+
+    def __reading(self):
+        """Returns the context manager holding the lock to read if the
+        FileStorage is thread_safe, which does nothing otherwise
+        """
+        if self.__thread_safe:
+            return self.__lock.read()
+        return nullcontext()
+
+    def __use_codec(self):
+        """Forgets the fragments if they were encoded by another codec"""
+        if self.__fragment_codec != self.__codec.name:
+            self.__fragments.clear()
+            owner = self if self.__shared else FileStorage
+            owner.__fragment_codec = self.__codec.name
+
+    def __fragment(self, key, record):
+        """Returns the encoded record, the object or the pending
+        dictionary stored under key, serializing it only if it's dirty or
+        hasn't been serialized yet
+        """
+        fragment = self.__fragments.get(key)
+        if type(record) is dict:
+            if fragment is None:
+                fragment = self.__codec.fragment(record)
+                self.__fragments[key] = fragment
+        elif fragment is None or record.is_dirty():
+            # marked clean first, so a change made while it's serialized
+            # marks it dirty again
+            record.mark_clean()
+            fragment = self.__codec.fragment(record.to_dict())
+            self.__fragments[key] = fragment
+        return fragment
+
+    def __write_file(self, path, data):
+        """Replaces the content of the file at path by the bytes data:
+        they're written to a temporary file, synced to disk, then renamed
+        over the file
+        """
+        temp_path = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            with open(temp_path, "wb") as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.__stamp(path)
+        try:
+            directory = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+        except OSError:
+            return
         try:
-            with open(self.__file_path, "r") as file:
-                data = json.load(file)
-                if data:
-                    for key, value in data.items():
-                        name = key.split(".")
-                        self.__objects[key] = classes_dict[name[0]](**value)
+            os.fsync(directory)
+        except OSError:
+            pass
+        finally:
+            os.close(directory)
+
+    def __rollback(self):
+        """Puts the objects touched by the transaction back in the state
+        they have in the JSON file (and journal)
+        """
+        with self.__lock.write():
+            touched = self.__touched
+            self.__touched = set()
+            self.__deferred = False
+            saved = {}
+            if self.__sharded:
+                paths = {self.__shard_path(self.__shard(key))
+                         for key in touched}
+            else:
+                paths = [self.__file_path]
+            for path in paths:
+                for key, value in self.__read(path):
+                    if key in touched:
+                        saved[key] = value
+            for key, value in journal.replay(self.__journal_path()):
+                if key in touched:
+                    saved[key] = value
+            for key in touched:
+                self.__drop(key)
+                if saved.get(key) is not None:
+                    self.__restore(key, saved[key])
+            self.__changed -= touched
+
+    def __ensure(self, name=None):
+        """Reads the files of class name (of every class if name is None)
+        that haven't been read yet, in sharded mode
+        """
+        if not self.__sharded:
+            return
+        names = self.__classes if name is None else (name,)
+        if all(name in self.__loaded or name not in self.__classes
+               for name in names):
+            return
+        with self.__locked(False), self.__lock.write():
+            names = [name for name in names if name in self.__classes and
+                     name not in self.__loaded]
+            self.__loaded.update(names)
+            paths = [self.__shard_path(shard) for name in names
+                     for shard in self.__shards(name)]
+            for key, value in self.__read_files(paths):
+                self.__restore(key, value)
+            for path in paths:
+                self.__stamp(path)
+
+    def __locked(self, exclusive=True):
+        """Returns the context manager holding the lock of the file shared
+        with other processes, which does nothing if it isn't shared
+        """
+        if not self.__shared:
+            return nullcontext()
+        path = self.__file_path + ".lock"
+        if self.__file_lock is None or self.__file_lock.path != path:
+            self.__file_lock = FileLock(path)
+        return self.__file_lock.hold(exclusive)
+
+    def __stamp(self, path):
+        """Remembers the version of the file at path read or written by
+        this process, if the file is shared
+        """
+        if self.__shared:
+            self.__stamps[path] = file_stamp(path)
+
+    def __refresh(self):
+        """Reads again the files another process wrote since this one
+        last read or wrote them, if the file is shared
+
+        Returns: True if there was such a file
+        """
+        if not self.__shared:
+            return False
+        with self.__lock.write():
+            if self.__sharded:
+                changed = False
+                for name in list(self.__loaded):
+                    paths = [self.__shard_path(shard)
+                             for shard in self.__shards(name)]
+                    if any(file_stamp(path) != self.__stamps.get(path)
+                           for path in paths):
+                        self.__reread(paths, [name])
+                        changed = True
+                return changed
+            paths = [self.__file_path, self.__journal_path()]
+            if all(file_stamp(path) == self.__stamps.get(path)
+                   for path in paths):
+                return False
+            self.__reread([self.__file_path], list(self.__classes))
+            return True
+
+    def __reread(self, paths, names):
+        """Reads the files at paths (and the journal if not in sharded
+        mode) again: the objects this process didn't change take the
+        value read, the objects of the classes names that aren't in the
+        files anymore are removed
+        """
+        seen = set()
+        for path in paths:
+            for key, value in self.__read(path):
+                seen.add(key)
+                self.__merge(key, value)
+            self.__stamp(path)
+        if not self.__sharded:
+            self.__journal_size = 0
+            for key, value in journal.replay(self.__journal_path()):
+                self.__journal_size += 1
+                if value is None:
+                    seen.discard(key)
+                    if not self.__is_local(key):
+                        self.__drop(key)
                 else:
-                    self.__objects = {}
+                    seen.add(key)
+                    self.__merge(key, value)
+            self.__stamp(self.__journal_path())
+        for name in names:
+            for obj_id, record in list(self.__records(name)):
+                key = name + "." + obj_id
+                if key not in seen and not self.__is_local(key):
+                    self.__drop(key)
+
+    def __merge(self, key, value):
+        """Stores the object read again from the file under key, unless
+        this process changed it or it didn't change: the instance already
+        stored is then kept, so the callers holding it aren't left with a
+        stale copy
+        """
+        if self.__is_local(key):
+            return
+        name, _, obj_id = key.partition(".")
+        obj = self.__objects.get(key)
+        if obj is not None:
+            if obj.to_dict() == value:
+                return
+        elif self.__pending.get(name, {}).get(obj_id) == value:
+            return
+        self.__restore(key, value)
+
+    def __is_local(self, key):
+        """Returns True if the object stored under key has been changed
+        by this process and not saved yet
+        """
+        if key in self.__changed:
+            return True
+        obj = self.__objects.get(key)
+        return obj is not None and obj.is_dirty()
+
+    def __read_all(self, path):
+        """Returns an iterator over the (key, value) pairs of the JSON file
+        at path, decoded by several processes if it's big enough
+        """
+        if (self.__processes > 1 and self.__codec.name == "json" and
+                os.path.getsize(path) >= self.__parallel_threshold):
+            pairs = parallel.read_ranges(path, self.__processes)
+            if pairs is not None:
+                return iter(pairs)
+        return self.__read(path)
+
+    def __read_files(self, paths):
+        """Returns an iterator over the (key, value) pairs of the files at
+        paths, each decoded by a process if they're big enough
+        """
+        if self.__processes > 1 and len(paths) > 1:
+            size = sum(os.path.getsize(path) for path in paths
+                       if os.path.exists(path))
+            if size >= self.__parallel_threshold:
+                return iter(parallel.read_files(paths, self.__codec.name,
+                                                self.__processes))
+        return itertools.chain.from_iterable(map(self.__read, paths))
+
+    def __read(self, path):
+        """Yields the (key, value) pairs of the JSON file at path, none if
+        the file doesn't exist
+        """
+        try:
+            file = open(path, "rb")
         except FileNotFoundError:
-            pass
+            return
+        with file:
+            yield from formats.read(file, self.__codec)
+
+    def __shards(self, name):
+        """Returns the shards of class name"""
+        if self.__buckets > 1:
+            return ["{}.{}".format(name, bucket)
+                    for bucket in range(self.__buckets)]
+        return [name]
+
+    def __shard(self, key):
+        """Returns the shard of the object stored under key: its class
+        name, followed by its bucket if there are several
+        """
+        name, _, obj_id = key.partition(".")
+        if self.__buckets > 1:
+            bucket = zlib.crc32(obj_id.encode("utf-8")) % self.__buckets
+            return "{}.{}".format(name, bucket)
+        return name
+
+    def __shard_path(self, shard):
+        """Returns the path of the JSON file of shard"""
+        root, extension = os.path.splitext(self.__file_path)
+        return "{}.{}{}".format(root, shard, extension)
+
+    def __restore(self, key, value):
+        """Stores the object read from the file under key, value being
+        its dictionary representation (kept as is in lazy mode)
+        """
+        name, _, obj_id = key.partition(".")
+        if not self.__lazy:
+            self.__put(key, self.__model(name).from_dict(value))
+            return
+        if key in self.__objects:
+            self.__drop(key)
+        self.__stage(key, value)
+
+    def __stage(self, key, value):
+        """Sets value in __pending and in the indexes under key"""
+        name, _, obj_id = key.partition(".")
+        self.__fragments.pop(key, None)
+        self.__pending.setdefault(name, {})[obj_id] = value
+        self.__ids[obj_id] = key
+        for attribute, index in self.__indexes_for(name).items():
+            index.add(obj_id, self.__value(name, value, attribute))
+
+    def __load(self, name, obj_id):
+        """Instantiates the pending object obj_id of class name
+
+        Returns: the new instance
+        """
+        with self.__lock.write():
+            value = self.__pending.get(name, {}).pop(obj_id, None)
+            if value is None:
+                return self.__by_class.get(name, {}).get(obj_id)
+            if not self.__pending[name]:
+                del self.__pending[name]
+            obj = self.__model(name).from_dict(value)
+            self.__put(name + "." + obj_id, obj)
+            return obj
+
+    def __load_class(self, name):
+        """Instantiates every pending object of class name"""
+        for obj_id in list(self.__pending.get(name, {})):
+            self.__load(name, obj_id)
+
+    def __model(self, name):
+        """Returns the class the objects of class name are created with"""
+        if self.__compact:
+            return compact_class(self.__classes[name])
+        return self.__classes[name]
+
+    def __put(self, key, obj):
+        """Sets obj in __objects and in the indexes under key"""
+        previous = self.__objects.get(key)
+        if previous is not obj:
+            self.__fragments.pop(key, None)
+        self.__objects[key] = obj
+        name, _, obj_id = key.partition(".")
+        if previous is not None and previous is not obj:
+            # the results remembered by the hash indexes hold previous
+            for index in self.__indexes_for(name).values():
+                if type(index) is HashIndex:
+                    index.discard(obj_id)
+        self.__by_class.setdefault(name, {})[obj_id] = obj
+        self.__ids[obj_id] = key
+        if name in self.__pending:
+            self.__pending[name].pop(obj_id, None)
+        for attribute, index in self.__indexes_for(name).items():
+            index.add(obj_id, self.__value(name, obj, attribute))
+
+    def __drop(self, key):
+        """Removes key from __objects and from the indexes
+
+        Returns: the removed object, or None if key wasn't stored
+        """
+        name, _, obj_id = key.partition(".")
+        obj = self.__objects.pop(key, None)
+        self.__fragments.pop(key, None)
+        if obj is None:
+            obj = self.__pending.get(name, {}).pop(obj_id, None)
+        else:
+            self.__by_class.get(name, {}).pop(obj_id, None)
+        if obj is not None:
+            if self.__ids.get(obj_id) == key:
+                del self.__ids[obj_id]
+            for index in self.__indexes_for(name).values():
+                index.discard(obj_id)
+        return obj
+
+    def __range(self, name, index, bounds):
+        """Yields the objects of class name found by index in the range
+        of values bounds, reading the index by parts of __range_part
+        pairs (see range())
+        """
+        low, high, include_low, include_high, reverse = bounds
+        unsorted = []
+        if low is None and high is None:
+            with self.__reading():
+                unsorted = index.unsorted()
+        if reverse:
+            yield from self.__objects_of(name, unsorted)
+        after = None
+        while True:
+            with self.__reading():
+                pairs = index.range(low, high, include_low, include_high,
+                                    reverse, after, self.__range_part)
+            yield from self.__objects_of(name, (obj_id for value, obj_id
+                                                in pairs))
+            if len(pairs) < self.__range_part:
+                break
+            after = pairs[-1]
+        if not reverse:
+            yield from self.__objects_of(name, unsorted)
+
+    def __geo_index(self, cls):
+        """Returns the GeoIndex of class cls and the name of the class
+
+        Raises: ValueError if cls has no geo_attributes
+        """
+        name = self.__class_name(cls)
+        self.__ensure(name)
+        if name not in self.__attr_indexes:
+            with self.__lock.write():
+                self.__indexes_for(name)
+        attributes = getattr(self.__classes.get(name), "geo_attributes", None)
+        index = self.__attr_indexes[name].get(attributes)
+        if type(index) is not GeoIndex:
+            raise ValueError("{} has no geo_attributes".format(name))
+        return index, name
+
+    def __text_index(self, cls):
+        """Returns the TextIndex of class cls and the name of the class,
+        creating it from the file written by close() and the objects of
+        the class the first time
+
+        Raises: ValueError if cls has no text_attributes
+        """
+        name = self.__class_name(cls)
+        self.__ensure(name)
+        attributes = getattr(self.__classes.get(name), "text_attributes",
+                             None)
+        if attributes is None:
+            raise ValueError("{} has no text_attributes".format(name))
+        index = self.__attr_indexes.get(name, {}).get(attributes)
+        if index is not None:
+            return index, name
+        with self.__lock.write():
+            indexes = self.__indexes_for(name)
+            index = indexes.get(attributes)
+            if index is None:
+                index = TextIndex(attributes)
+                try:
+                    with open(self.__text_path(name), "rb") as file:
+                        index.load(marshal.loads(file.read()))
+                except (OSError, EOFError, ValueError, TypeError):
+                    index.clear()
+                ids = set()
+                for obj_id, record in self.__records(name):
+                    index.add(obj_id, self.__value(name, record, attributes))
+                    ids.add(obj_id)
+                index.retain(ids)
+                indexes[attributes] = index
+        return index, name
+
+    def __text_path(self, name):
+        """Returns the path of the file keeping the TextIndex of class
+        name
+        """
+        return "{}.{}.text".format(self.__file_path, name)
+
+    def __located(self, name, found):
+        """Returns the (distance, object) pairs of the (distance, id)
+        pairs found of the objects of class name that are still stored
+        """
+        located = []
+        for distance, obj_id in found:
+            obj = self.get(name, obj_id)
+            if obj is not None:
+                located.append((distance, obj))
+        return located
+
+    def __objects_of(self, name, ids):
+        """Yields the objects of class name with the given ids that are
+        still stored
+        """
+        for obj_id in ids:
+            obj = self.get(name, obj_id)
+            if obj is not None:
+                yield obj
+
+    def __indexes_for(self, name):
+        """Returns the attribute -> index dictionary of the class name,
+        creating the indexes declared by the class the first time
+        """
+        indexes = self.__attr_indexes.get(name)
+        if indexes is None:
+            indexes = self.__attr_indexes[name] = {}
+            cls = self.__classes.get(name)
+            for attribute in getattr(cls, "indexed_attributes", ()):
+                indexes[attribute] = HashIndex(attribute)
+            for attribute in getattr(cls, "sorted_attributes", ()):
+                indexes[attribute] = SortedIndex(attribute)
+            for attribute in getattr(cls, "bitmap_attributes", ()):
+                indexes[attribute] = BitmapIndex(attribute)
+            attributes = getattr(cls, "geo_attributes", None)
+            if attributes is not None:
+                indexes[attributes] = GeoIndex(attributes)
+            for obj_id, record in self.__records(name):
+                for attribute, index in indexes.items():
+                    index.add(obj_id, self.__value(name, record, attribute))
+        return indexes
+
+    def __records(self, name):
+        """Yields the (id, object or pending dictionary) pairs of the
+        objects of class name
+        """
+        yield from self.__by_class.get(name, {}).items()
+        yield from self.__pending.get(name, {}).items()
+
+    def __value(self, name, record, attribute):
+        """Returns the value of attribute of record, an instance of the
+        class name or its pending dictionary representation (the tuple of
+        the values if attribute is a tuple of attributes)
+        """
+        if type(attribute) is tuple:
+            return tuple(self.__value(name, record, each)
+                         for each in attribute)
+        if type(record) is not dict:
+            return getattr(record, attribute, None)
+        if attribute in record:
+            return record[attribute]
+        return getattr(self.__classes.get(name), attribute, None)
+
+    def __clear_indexes(self):
+        """Empties every attribute index"""
+        for indexes in self.__attr_indexes.values():
+            for index in indexes.values():
+                index.clear()
+
+    @staticmethod
+    def __class_name(cls):
+        """Returns the name of cls, which is a class or a class name"""
+        return cls if isinstance(cls, str) else cls.__name__
+
+    def __journal_path(self):
+        """Returns the path of the journal kept next to the JSON file"""
+        return self.__file_path + ".journal"
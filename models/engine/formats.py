@@ -0,0 +1,227 @@
+#!/usr/bin/python3
+"""This module defines the codecs the FileStorage can write its file with
+
+Module Description:
+A codec turns the dictionary representation of each stored object into
+a fragment (fragment()), and the (key, fragment) pairs into the content
+of the file (document()), so the storage can keep the fragment of the
+objects that didn't change between two saves. It reads the (key, value)
+pairs back from a file with iter_items().
+
+The available codecs are:
+    json: the json module of the standard library (the default).
+    orjson: the same JSON format, encoded and decoded by the orjson
+            package when it's installed.
+    msgpack: the MessagePack binary format, when the msgpack package
+             is installed.
+    marshal: the binary format of the marshal module of the standard
+             library (version 2, which doesn't depend on the Python
+             version writing it).
+
+The binary formats start with a magic line, read() uses it to pick the
+codec a file was written with, whatever codec the storage writes with.
+
+Running this module converts a file to another format:
+    python3 -m models.engine.formats <source> <destination> <codec>
+"""
+import io
+import json
+import marshal
+import sys
+from models.engine import streaming
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class JSONCodec:
+    """Codec writing a JSON object, one object per line.
+
+    Public class attributes:
+        name: string - name of the codec.
+        magic: bytes - first bytes of a file written by the codec.
+    Public instance methods:
+        fragment(self, value): returns the encoded value
+        document(self, items): returns the content of the file holding
+                               the (key, fragment) pairs items
+        iter_items(self, file): yields the (key, value) pairs of file
+    """
+    name = "json"
+    magic = b""
+
+    def fragment(self, value):
+        """Returns the JSON text of value"""
+        return json.dumps(value)
+
+    def document(self, items):
+        """Returns the content of the file holding the (key, fragment)
+        pairs items
+        """
+        lines = [json.dumps(key) + ": " + fragment for key, fragment in items]
+        return ("{\n" + ",\n".join(lines) + "\n}").encode("utf-8")
+
+    def iter_items(self, file):
+        """Yields the (key, value) pairs of file, opened in binary mode,
+        decoding them one at a time (see models.engine.streaming)
+        """
+        yield from streaming.iter_items(io.TextIOWrapper(file,
+                                                         encoding="utf-8"))
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec encoding and decoding with the orjson package"""
+    name = "orjson"
+
+    def fragment(self, value):
+        """Returns the JSON text of value"""
+        return orjson.dumps(value).decode("utf-8")
+
+    def iter_items(self, file):
+        """Yields the (key, value) pairs of file, opened in binary mode"""
+        data = file.read()
+        if not data.strip():
+            return
+        value = orjson.loads(data)
+        if value:
+            if not isinstance(value, dict):
+                raise ValueError("The JSON file doesn't hold an object")
+            yield from value.items()
+
+
+class MsgpackCodec:
+    """Codec writing a MessagePack map"""
+    name = "msgpack"
+    magic = b"HBNB msgpack\n"
+
+    def fragment(self, value):
+        """Returns the MessagePack encoding of value"""
+        return msgpack.packb(value)
+
+    def document(self, items):
+        """Returns the content of the file holding the (key, fragment)
+        pairs items
+        """
+        parts = []
+        for key, fragment in items:
+            parts.append(msgpack.packb(key))
+            parts.append(fragment)
+        count = len(parts) // 2
+        if count < 16:
+            header = bytes([0x80 | count])
+        elif count < 1 << 16:
+            header = b"\xde" + count.to_bytes(2, "big")
+        else:
+            header = b"\xdf" + count.to_bytes(4, "big")
+        return self.magic + header + b"".join(parts)
+
+    def iter_items(self, file):
+        """Yields the (key, value) pairs of file, opened in binary mode
+        and positioned after the magic line
+        """
+        unpacker = msgpack.Unpacker(file, raw=False)
+        for n in range(unpacker.read_map_header()):
+            yield unpacker.unpack(), unpacker.unpack()
+
+
+class MarshalCodec:
+    """Codec writing a dictionary with the marshal module"""
+    name = "marshal"
+    magic = b"HBNB marshal\n"
+    version = 2
+
+    def fragment(self, value):
+        """Returns the marshal encoding of value"""
+        return marshal.dumps(value, self.version)
+
+    def document(self, items):
+        """Returns the content of the file holding the (key, fragment)
+        pairs items: the marshal encoding of a dictionary is its pairs
+        between "{" and "0"
+        """
+        parts = [self.magic, b"{"]
+        for key, fragment in items:
+            parts.append(marshal.dumps(key, self.version))
+            parts.append(fragment)
+        parts.append(b"0")
+        return b"".join(parts)
+
+    def iter_items(self, file):
+        """Yields the (key, value) pairs of file, opened in binary mode
+        and positioned after the magic line
+        """
+        yield from marshal.loads(file.read()).items()
+
+
+_codecs = {"json": (JSONCodec, True), "orjson": (OrjsonCodec, orjson),
+           "msgpack": (MsgpackCodec, msgpack), "marshal": (MarshalCodec, True)}
+
+
+def available():
+    """Returns the list of the names of the codecs that can be used"""
+    return [name for name, (codec, module) in _codecs.items() if module]
+
+
+def get(name):
+    """Returns the codec called name
+
+    Raises: ValueError if there is no such codec or if the package it
+            needs isn't installed
+    """
+    if name not in _codecs:
+        raise ValueError("Unknown codec: {}".format(name))
+    codec, module = _codecs[name]
+    if not module:
+        raise ValueError("The {} codec needs the {} package".format(name,
+                                                                    name))
+    return codec()
+
+
+def detect(file, default=None):
+    """Returns the codec the content of file, opened in binary mode, was
+    written with and positions file after its magic line
+
+    A file without a magic line is JSON, read with default if it's a
+    JSON codec, with the fastest JSON codec available otherwise.
+    """
+    for name, (codec, module) in _codecs.items():
+        if codec.magic:
+            if file.read(len(codec.magic)) == codec.magic:
+                return get(name)
+            file.seek(0)
+    if default is not None and not default.magic:
+        return default
+    return get("orjson" if orjson else "json")
+
+
+def read(file, default=None):
+    """Yields the (key, value) pairs of file, opened in binary mode,
+    decoded by the codec it was written with (see detect())
+    """
+    yield from detect(file, default).iter_items(file)
+
+
+def convert(source, destination, name):
+    """Writes the objects stored in the file source to the file
+    destination with the codec called name
+
+    Returns: the number of objects written
+    """
+    codec = get(name)
+    with open(source, "rb") as file:
+        items = [(key, codec.fragment(value)) for key, value in read(file)]
+    with open(destination, "wb") as file:
+        file.write(codec.document(items))
+    return len(items)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        print("usage: {} <source> <destination> <codec>\ncodecs: {}".format(
+            sys.argv[0], ", ".join(available())))
+        sys.exit(1)
+    print("{} objects written".format(convert(*sys.argv[1:])))
@@ -0,0 +1,725 @@
+#!/usr/bin/python3
+"""This module defines the secondary indexes maintained by FileStorage
+
+Module Description:
+A secondary index maps the value of one attribute of the instances of
+a class to the ids of the instances holding that value, so the storage
+can answer queries such as "the reviews of this place" without looking
+at every stored object. The storage tells the index about every
+instance that is stored (add) or removed (discard), the index remembers
+the value it saw for each id so it can move the id when the value
+changes.
+
+A HashIndex answers equality queries, it can also remember the result
+the storage built from the ids of a value (remember/recall), forgotten
+as soon as an id is added under that value or removed from it. A
+SortedIndex keeps the ids
+sorted by the value of a numeric attribute (two lists searched with
+bisect), so the ids whose value is in a range, or the ids of the k
+smallest or greatest values, are found in O(log n + k); it answers
+equality queries too. A GeoIndex keeps the ids of the objects located
+by a (latitude, longitude) pair of attributes in the cells of a grid of
+cell degrees, so the objects within a radius of a point are found by
+looking at the cells around it instead of at every object. A TextIndex
+maps the words of some text attributes to the ids of the objects whose
+texts hold them (an inverted index), so the objects holding some words
+are found by intersecting the lists of ids of these words. A
+BitmapIndex indexes an attribute holding a list of items (the amenity
+ids of a place): each object gets an ordinal, each item a bitmap of the
+ordinals of the objects holding it, so the objects holding all (or any)
+of some items are found with a few bitwise operations.
+"""
+import hashlib
+import math
+import re
+from bisect import bisect_left, bisect_right, insort
+
+EARTH_RADIUS = 6371.0088
+_WORD = re.compile(r"\w+")
+_NONZERO = re.compile(rb"[^\x00]")
+_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1)
+              for byte in range(256))
+_LISTS = (list, tuple, set, frozenset)
+
+
+class HashIndex:
+    """Equality index on one attribute.
+
+    Public instance attributes:
+        attribute: string - name of the indexed attribute.
+        changes: number of times the ids of a value changed.
+    Public instance methods:
+        add(self, obj_id, value): indexes obj_id under value
+        discard(self, obj_id): removes obj_id from the index
+        lookup(self, value): returns the ids indexed under value
+        remember(self, value, result, changes): remembers result for value
+        recall(self, value): returns the result remembered for value
+        clear(self): empties the index
+    """
+    def __init__(self, attribute):
+        """Instantiate an empty index on attribute"""
+        self.attribute = attribute
+        self.changes = 0
+        self.__ids = {}
+        self.__values = {}
+        self.__results = {}
+
+    def add(self, obj_id, value):
+        """Indexes obj_id under value, moving it if it was indexed under
+        another value. Unhashable values (lists...) are not indexed.
+        """
+        old = self.__values.get(obj_id, self)
+        if old is not self:
+            if old == value:
+                return
+            self.discard(obj_id)
+        try:
+            self.__ids.setdefault(value, {})[obj_id] = None
+        except TypeError:
+            return
+        self.__values[obj_id] = value
+        self.__results.pop(value, None)
+        self.changes += 1
+
+    def discard(self, obj_id):
+        """Removes obj_id from the index, if it's inside"""
+        if obj_id not in self.__values:
+            return
+        value = self.__values.pop(obj_id)
+        ids = self.__ids[value]
+        del ids[obj_id]
+        if not ids:
+            del self.__ids[value]
+        self.__results.pop(value, None)
+        self.changes += 1
+
+    def lookup(self, value):
+        """Returns the ids (in insertion order) indexed under value
+
+        Raises: TypeError if value is unhashable
+        """
+        return self.__ids.get(value, {}).keys()
+
+    def remember(self, value, result, changes):
+        """Remembers result, built from the ids of value, until the ids of
+        value change. Nothing is remembered if an id was added or removed
+        since changes was read.
+
+        Raises: TypeError if value is unhashable
+        """
+        if changes == self.changes:
+            self.__results[value] = result
+
+    def recall(self, value):
+        """Returns the result remembered for value, or None
+
+        Raises: TypeError if value is unhashable
+        """
+        return self.__results.get(value)
+
+    def clear(self):
+        """Empties the index"""
+        self.__ids.clear()
+        self.__values.clear()
+        self.__results.clear()
+        self.changes += 1
+
+
+class SortedIndex:
+    """Ordered index on one numeric attribute.
+
+    The ids are kept sorted by (value, id) in two parallel lists: moving
+    an id costs two bisections and a list insertion. Values that aren't
+    numbers (None, strings...) aren't sorted, their ids are kept apart.
+
+    Public instance attributes:
+        attribute: string - name of the indexed attribute.
+    Public instance methods:
+        add(self, obj_id, value): indexes obj_id under value
+        discard(self, obj_id): removes obj_id from the index
+        lookup(self, value): returns the ids indexed under value
+        range(self, low, high...): returns the (value, id) pairs of a range
+        unsorted(self): returns the ids whose value isn't a number
+        clear(self): empties the index
+    """
+    def __init__(self, attribute):
+        """Instantiate an empty index on attribute"""
+        self.attribute = attribute
+        self.__keys = []
+        self.__ids = []
+        self.__values = {}
+        self.__others = {}
+
+    def add(self, obj_id, value):
+        """Indexes obj_id under value, moving it if it was indexed under
+        another value
+        """
+        if not _is_number(value):
+            if obj_id not in self.__others:
+                self.discard(obj_id)
+                self.__others[obj_id] = None
+            return
+        old = self.__values.get(obj_id)
+        if old is not None:
+            if old == value:
+                return
+            self.discard(obj_id)
+        self.__others.pop(obj_id, None)
+        position = self.__position(value, obj_id)
+        self.__keys.insert(position, value)
+        self.__ids.insert(position, obj_id)
+        self.__values[obj_id] = value
+
+    def discard(self, obj_id):
+        """Removes obj_id from the index, if it's inside"""
+        if obj_id in self.__others:
+            del self.__others[obj_id]
+            return
+        if obj_id not in self.__values:
+            return
+        position = self.__position(self.__values.pop(obj_id), obj_id)
+        del self.__keys[position]
+        del self.__ids[position]
+
+    def lookup(self, value):
+        """Returns the ids indexed under value, sorted
+
+        Raises: TypeError if value isn't a number
+        """
+        if not _is_number(value):
+            raise TypeError("Only numbers are sorted")
+        return self.__ids[bisect_left(self.__keys, value):
+                          bisect_right(self.__keys, value)]
+
+    def range(self, low=None, high=None, include_low=True,
+              include_high=True, reverse=False, after=None, count=None):
+        """Returns the list of the (value, id) pairs whose value is
+        between low and high (None for no bound), sorted by value then
+        id, or in the reverse order
+
+        args:
+            include_low, include_high: whether a value equal to the
+                                       bound is in the range.
+            after: a (value, id) pair, only the pairs that come after it
+                   in the order are returned (to read a range in parts).
+            count: maximum number of pairs returned.
+        Raises: TypeError if a bound isn't a number
+        """
+        for bound in (low, high):
+            if bound is not None and not _is_number(bound):
+                raise TypeError("Only numbers are sorted")
+        keys = self.__keys
+        start, stop = 0, len(keys)
+        if low is not None:
+            start = (bisect_left if include_low else bisect_right)(keys,
+                                                                   low)
+        if high is not None:
+            stop = (bisect_right if include_high else bisect_left)(keys,
+                                                                   high)
+        if after is not None:
+            value, obj_id = after
+            if reverse:
+                stop = min(stop, self.__position(value, obj_id))
+            else:
+                start = max(start, self.__position(value, obj_id, True))
+        if count is not None:
+            if reverse:
+                start = max(start, stop - count)
+            else:
+                stop = min(stop, start + count)
+        if start >= stop:
+            return []
+        pairs = list(zip(keys[start:stop], self.__ids[start:stop]))
+        if reverse:
+            pairs.reverse()
+        return pairs
+
+    def unsorted(self):
+        """Returns the ids whose value isn't a number"""
+        return list(self.__others)
+
+    def clear(self):
+        """Empties the index"""
+        self.__keys.clear()
+        self.__ids.clear()
+        self.__values.clear()
+        self.__others.clear()
+
+    def __position(self, value, obj_id, after=False):
+        """Returns the position of the pair (value, obj_id) in the lists,
+        or of the first pair coming after it if after is True
+        """
+        low = bisect_left(self.__keys, value)
+        high = bisect_right(self.__keys, value, low)
+        search = bisect_right if after else bisect_left
+        return search(self.__ids, obj_id, low, high)
+
+
+class GeoIndex:
+    """Grid index on a pair of latitude and longitude attributes.
+
+    The grid divides the globe in cells of cell degrees of latitude by
+    cell degrees of longitude, each holding the id -> (latitude,
+    longitude) dictionary of the objects located inside. A search looks
+    at the cells overlapping the box around the circle it covers, then
+    computes the (haversine) distance of the objects of these cells.
+    Objects whose latitude or longitude isn't a number, or is out of
+    range, aren't located.
+
+    Public instance attributes:
+        attribute: tuple - names of the latitude and longitude attributes.
+    Public instance methods:
+        add(self, obj_id, value): locates obj_id at the value pair
+        discard(self, obj_id): removes obj_id from the index
+        near(self, latitude, longitude, radius): returns the ids within
+                                                 radius km of a point
+        k_nearest(self, latitude, longitude, k): returns the k closest ids
+        clear(self): empties the index
+    """
+    def __init__(self, attribute, cell=0.1):
+        """Instantiate an empty index on the (latitude, longitude) pair
+        of attributes, with cells of cell degrees
+        """
+        self.attribute = attribute
+        self.__cell = cell
+        self.__columns = math.ceil(360 / cell)
+        self.__cells = {}
+        self.__locations = {}
+
+    def add(self, obj_id, value):
+        """Locates obj_id at the (latitude, longitude) pair value, or
+        removes it if value isn't a location
+        """
+        location = self.__locations.get(obj_id)
+        if location is not None and location[:2] == value:
+            return
+        self.discard(obj_id)
+        latitude, longitude = value
+        if not (_is_number(latitude) and _is_number(longitude) and
+                -90 <= latitude <= 90 and -180 <= longitude <= 180):
+            return
+        cell = self.__cell_of(latitude, longitude)
+        self.__cells.setdefault(cell, {})[obj_id] = (latitude, longitude)
+        self.__locations[obj_id] = (latitude, longitude, cell)
+
+    def discard(self, obj_id):
+        """Removes obj_id from the index, if it's inside"""
+        location = self.__locations.pop(obj_id, None)
+        if location is None:
+            return
+        cell = location[2]
+        ids = self.__cells[cell]
+        del ids[obj_id]
+        if not ids:
+            del self.__cells[cell]
+
+    def near(self, latitude, longitude, radius):
+        """Returns the list of the (distance, id) pairs of the ids located
+        within radius km of the point (latitude, longitude), closest
+        first
+
+        Raises: TypeError if the point isn't made of finite numbers or
+                the radius isn't a number
+        """
+        for value in (latitude, longitude, radius):
+            if not _is_number(value) or (value is not radius and
+                                         math.isinf(value)):
+                raise TypeError("The point and radius must be numbers")
+        # half the circumference of the Earth covers all of it
+        reach = math.degrees(min(radius, math.pi * EARTH_RADIUS) /
+                             EARTH_RADIUS)
+        low = math.floor((latitude - reach + 90) / self.__cell)
+        high = math.floor((latitude + reach + 90) / self.__cell)
+        widest = max(abs(latitude - reach), abs(latitude + reach))
+        if widest >= 90 or reach >= 90:
+            columns = None
+        else:
+            span = reach / math.cos(math.radians(widest))
+            first = math.floor((longitude - span + 180) / self.__cell)
+            last = math.floor((longitude + span + 180) / self.__cell)
+            if last - first + 1 >= self.__columns:
+                columns = None
+            else:
+                columns = [column % self.__columns
+                           for column in range(first, last + 1)]
+        if columns is None or (high - low + 1) * len(columns) > len(
+                self.__cells):
+            wanted = None if columns is None else set(columns)
+            cells = [ids for (row, column), ids in self.__cells.items()
+                     if low <= row <= high and
+                     (wanted is None or column in wanted)]
+        else:
+            cells = []
+            for row in range(low, high + 1):
+                for column in columns:
+                    ids = self.__cells.get((row, column))
+                    if ids is not None:
+                        cells.append(ids)
+        found = []
+        for ids in cells:
+            for obj_id, (other_latitude, other_longitude) in ids.items():
+                distance = haversine(latitude, longitude, other_latitude,
+                                     other_longitude)
+                if distance <= radius:
+                    found.append((distance, obj_id))
+        found.sort()
+        return found
+
+    def k_nearest(self, latitude, longitude, k):
+        """Returns the list of the (distance, id) pairs of the k ids
+        located closest to the point (latitude, longitude), closest first
+
+        The ids within the width of a cell are searched first, the
+        radius being doubled until k ids are found. No id is returned if
+        k is less than 1.
+        """
+        if k < 1:
+            return []
+        radius = math.radians(self.__cell) * EARTH_RADIUS
+        while True:
+            found = self.near(latitude, longitude, radius)
+            if len(found) >= k or radius >= math.pi * EARTH_RADIUS:
+                return found[:k]
+            radius *= 2
+
+    def clear(self):
+        """Empties the index"""
+        self.__cells.clear()
+        self.__locations.clear()
+
+    def __cell_of(self, latitude, longitude):
+        """Returns the (row, column) of the cell holding a location"""
+        return (math.floor((latitude + 90) / self.__cell),
+                math.floor((longitude + 180) / self.__cell) % self.__columns)
+
+
+class TextIndex:
+    """Inverted index on text attributes.
+
+    Each word (a sequence of letters or digits, case folded) of the texts
+    of an object maps to the ids of the objects holding it, with the
+    number of times they hold it. The index keeps a digest of the texts
+    of each object, so indexing an object whose texts didn't change
+    costs a digest instead of splitting the texts in words; dump() and
+    load() turn the index in a dictionary that can be kept in a file and
+    read back, the digests telling which objects changed meanwhile.
+
+    Public instance attributes:
+        attribute: tuple - names of the indexed text attributes.
+        changed: True if the index changed since it was created, loaded
+                 or dumped.
+    Public instance methods:
+        add(self, obj_id, value): indexes the texts of obj_id
+        discard(self, obj_id): removes obj_id from the index
+        search(self, text, prefix): returns the ids holding the words
+        retain(self, ids): removes the ids that aren't in ids
+        dump(self): returns the content of the index
+        load(self, content): replaces the content of the index
+        clear(self): empties the index
+    """
+    def __init__(self, attribute):
+        """Instantiate an empty index on the tuple of attributes"""
+        self.attribute = attribute
+        self.changed = False
+        self.__postings = {}
+        self.__documents = {}
+        self.__words = []
+
+    def add(self, obj_id, value):
+        """Indexes obj_id under the words of the tuple of texts value,
+        values that aren't strings being ignored
+        """
+        texts = [text for text in value if type(text) is str]
+        digest = hashlib.blake2b("\0".join(texts).encode("utf-8"),
+                                 digest_size=8).digest()
+        document = self.__documents.get(obj_id)
+        if document is not None and document[0] == digest:
+            return
+        self.discard(obj_id)
+        counts = {}
+        for text in texts:
+            for word in _WORD.findall(text.casefold()):
+                counts[word] = counts.get(word, 0) + 1
+        for word, count in counts.items():
+            ids = self.__postings.get(word)
+            if ids is None:
+                ids = self.__postings[word] = {}
+                insort(self.__words, word)
+            ids[obj_id] = count
+        self.__documents[obj_id] = (digest, tuple(counts))
+        self.changed = True
+
+    def discard(self, obj_id):
+        """Removes obj_id from the index, if it's inside"""
+        document = self.__documents.pop(obj_id, None)
+        if document is None:
+            return
+        for word in document[1]:
+            ids = self.__postings[word]
+            del ids[obj_id]
+            if not ids:
+                del self.__postings[word]
+                del self.__words[bisect_left(self.__words, word)]
+        self.changed = True
+
+    def search(self, text, prefix=False):
+        """Returns the list of the (score, id) pairs of the ids holding
+        every word of text, best score first
+
+        The score of an id adds, for each word, (1 + log(count)) *
+        log(1 + number of ids / number of ids holding the word): rare
+        words repeated in the texts of the id weigh more.
+
+        args:
+            text: the words searched.
+            prefix: if True the last word of text matches every word it
+                    starts (e.g. "sea vi" finds "sea view").
+        """
+        words = _WORD.findall(text.casefold())
+        if not words:
+            return []
+        postings = [self.__postings.get(word, {}) for word in words]
+        if prefix:
+            postings[-1] = self.__starting(words[-1])
+        postings.sort(key=len)
+        total = len(self.__documents)
+        scores = {}
+        for position, ids in enumerate(postings):
+            weight = math.log(1 + total / max(len(ids), 1))
+            if position == 0:
+                candidates = ids
+            else:
+                candidates = [obj_id for obj_id in scores if obj_id in ids]
+                scores = {obj_id: scores[obj_id] for obj_id in candidates}
+            for obj_id in candidates:
+                scores[obj_id] = (scores.get(obj_id, 0) +
+                                  (1 + math.log(ids[obj_id])) * weight)
+            if not scores:
+                return []
+        return sorted(((score, obj_id) for obj_id, score in scores.items()),
+                      key=lambda pair: (-pair[0], pair[1]))
+
+    def retain(self, ids):
+        """Removes from the index the ids that aren't in the set ids"""
+        for obj_id in [obj_id for obj_id in self.__documents
+                       if obj_id not in ids]:
+            self.discard(obj_id)
+
+    def dump(self):
+        """Returns the content of the index, a dictionary of strings,
+        bytes, integers, tuples and dictionaries, and marks it unchanged
+        """
+        self.changed = False
+        return {"attribute": self.attribute, "postings": self.__postings,
+                "documents": self.__documents}
+
+    def load(self, content):
+        """Replaces the content of the index by content, returned by the
+        dump() of an index on the same attributes
+
+        Raises: ValueError if content isn't the content of such an index
+        """
+        try:
+            attribute = content["attribute"]
+            postings = content["postings"]
+            documents = content["documents"]
+        except (KeyError, TypeError) as error:
+            raise ValueError("Invalid text index") from error
+        if type(postings) is not dict or type(documents) is not dict:
+            raise ValueError("Invalid text index")
+        if attribute != self.attribute:
+            raise ValueError("The index is on other attributes")
+        self.__postings = postings
+        self.__documents = documents
+        self.__words = sorted(postings)
+        self.changed = False
+
+    def clear(self):
+        """Empties the index"""
+        self.__postings.clear()
+        self.__documents.clear()
+        self.__words.clear()
+        self.changed = True
+
+    def __starting(self, start):
+        """Returns the id -> count dictionary of the ids holding a word
+        starting with start, count being the number of such words
+        """
+        found = {}
+        position = bisect_left(self.__words, start)
+        while (position < len(self.__words) and
+               self.__words[position].startswith(start)):
+            for obj_id, count in self.__postings[
+                    self.__words[position]].items():
+                found[obj_id] = found.get(obj_id, 0) + count
+            position += 1
+        return found
+
+
+class BitmapIndex:
+    """Index on an attribute holding a list of items.
+
+    The items are mapped to dense codes, the objects to dense ordinals
+    (reused once their object is discarded). The bitmap of an item is a
+    bytearray whose bit n is set when the object of ordinal n holds the
+    item: storing an object sets or clears one bit per item that it
+    gained or lost. A query turns the bitmaps it needs into ints, ANDs
+    or ORs them and reads the ordinals of the bits set in the result.
+
+    Public instance attributes:
+        attribute: string - name of the indexed attribute.
+    Public instance methods:
+        add(self, obj_id, value): indexes obj_id under the items of value
+        discard(self, obj_id): removes obj_id from the index
+        having(self, all_of, any_of): returns the ids holding the items
+        lookup(self, value): returns the ids holding every item of value
+        clear(self): empties the index
+    """
+    def __init__(self, attribute):
+        """Instantiate an empty index on attribute"""
+        self.attribute = attribute
+        self.__codes = {}
+        self.__bitmaps = []
+        self.__ordinals = {}
+        self.__ids = []
+        self.__free = []
+        self.__items = {}
+        self.__every = bytearray()
+
+    def add(self, obj_id, value):
+        """Indexes obj_id under the hashable items of value (none if value
+        isn't a list), updating the bits of the items it gained or lost
+        """
+        items = _items(value)
+        old = self.__items.get(obj_id)
+        if old is None:
+            if self.__free:
+                ordinal = self.__free.pop()
+                self.__ids[ordinal] = obj_id
+            else:
+                ordinal = len(self.__ids)
+                self.__ids.append(obj_id)
+            self.__ordinals[obj_id] = ordinal
+            _set(self.__every, ordinal)
+            old = frozenset()
+        elif old == items:
+            return
+        ordinal = self.__ordinals[obj_id]
+        for item in old - items:
+            _clear(self.__bitmaps[self.__codes[item]], ordinal)
+        for item in items - old:
+            code = self.__codes.get(item)
+            if code is None:
+                code = self.__codes[item] = len(self.__bitmaps)
+                self.__bitmaps.append(bytearray())
+            _set(self.__bitmaps[code], ordinal)
+        self.__items[obj_id] = items
+
+    def discard(self, obj_id):
+        """Removes obj_id from the index, if it's inside"""
+        items = self.__items.pop(obj_id, None)
+        if items is None:
+            return
+        ordinal = self.__ordinals.pop(obj_id)
+        for item in items:
+            _clear(self.__bitmaps[self.__codes[item]], ordinal)
+        _clear(self.__every, ordinal)
+        self.__ids[ordinal] = None
+        self.__free.append(ordinal)
+
+    def having(self, all_of=(), any_of=None):
+        """Returns the list of the ids holding every item of all_of and,
+        if any_of isn't None, at least one item of any_of, in the order
+        of their ordinals
+
+        Raises: TypeError if an item is unhashable
+        """
+        found = int.from_bytes(self.__every, "little")
+        for item in all_of:
+            found &= self.__bitmap(item)
+        if any_of is not None:
+            either = 0
+            for item in any_of:
+                either |= self.__bitmap(item)
+            found &= either
+        data = found.to_bytes((found.bit_length() + 7) // 8, "little")
+        ids = self.__ids
+        return [ids[match.start() << 3 | bit]
+                for match in _NONZERO.finditer(data)
+                for bit in _BITS[data[match.start()]]]
+
+    def lookup(self, value):
+        """Returns the ids holding every item of value (all the ids if
+        value isn't a list), a superset of the ids whose value is equal
+
+        Raises: TypeError if an item is unhashable
+        """
+        return self.having(value if type(value) in _LISTS else ())
+
+    def clear(self):
+        """Empties the index"""
+        self.__codes.clear()
+        self.__bitmaps.clear()
+        self.__ordinals.clear()
+        self.__ids.clear()
+        self.__free.clear()
+        self.__items.clear()
+        self.__every = bytearray()
+
+    def __bitmap(self, item):
+        """Returns the bitmap of item as an int, 0 for an unknown item"""
+        code = self.__codes.get(item)
+        if code is None:
+            return 0
+        return int.from_bytes(self.__bitmaps[code], "little")
+
+
+def haversine(latitude, longitude, other_latitude, other_longitude):
+    """Returns the distance in km between two points of the Earth"""
+    latitude, other_latitude = map(math.radians,
+                                   (latitude, other_latitude))
+    delta = math.radians(other_longitude - longitude)
+    value = (math.sin((other_latitude - latitude) / 2) ** 2 +
+             math.cos(latitude) * math.cos(other_latitude) *
+             math.sin(delta / 2) ** 2)
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(min(value, 1.0)))
+
+
+def _set(bitmap, ordinal):
+    """Sets the bit ordinal of bitmap, a bytearray grown as needed"""
+    position = ordinal >> 3
+    if position >= len(bitmap):
+        bitmap.extend(bytes(position + 1 - len(bitmap)))
+    bitmap[position] |= 1 << (ordinal & 7)
+
+
+def _clear(bitmap, ordinal):
+    """Clears the bit ordinal of bitmap"""
+    position = ordinal >> 3
+    if position < len(bitmap):
+        bitmap[position] &= ~(1 << (ordinal & 7)) & 0xff
+
+
+def _items(value):
+    """Returns the frozenset of the hashable items of value, empty if
+    value isn't a list (or a tuple or a set)
+    """
+    if type(value) not in _LISTS:
+        return frozenset()
+    try:
+        return frozenset(value)
+    except TypeError:
+        items = set()
+        for item in value:
+            try:
+                items.add(item)
+            except TypeError:
+                pass
+        return frozenset(items)
+
+
+def _is_number(value):
+    """Returns True if value is an int or a float (but not NaN) that a
+    SortedIndex sorts
+    """
+    return type(value) in (int, float) and value == value
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""This module defines the append-only journal used by FileStorage
+
+Module Description:
+In journal mode the FileStorage does not rewrite the whole JSON file
+on every save. Instead each changed object is appended to a journal
+file (one JSON document per line) next to the snapshot. A journal
+entry is a dictionary with the object key and either the dictionary
+representation of the object or None when the object was deleted.
+Replaying the snapshot followed by the journal gives back the current
+state of the store.
+"""
+import json
+import os
+
+
+def append(path, entries):
+    """Appends entries to the journal file at path
+
+    args:
+        path: path of the journal file.
+        entries: iterable of (key, value) pairs, value is the to_dict()
+                 of the object or None when the object was deleted.
+    Returns: the number of entries written
+    """
+    lines = []
+    for key, value in entries:
+        lines.append(json.dumps({"key": key, "value": value}) + "\n")
+    if lines:
+        with open(path, "a", encoding="utf-8") as file:
+            file.write("".join(lines))
+    return len(lines)
+
+
+def replay(path):
+    """Yields the (key, value) pairs recorded in the journal at path
+
+    A torn last line (left behind by a crash in the middle of an append)
+    is ignored. If the journal doesn't exist nothing is yielded.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                yield entry["key"], entry["value"]
+    except FileNotFoundError:
+        return
+
+
+def truncate(path):
+    """Removes the journal file at path, if it exists"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,158 @@
+#!/usr/bin/python3
+"""This module defines the locks used by the storages shared between
+processes
+
+Module Description:
+Several processes (consoles, batch jobs) can use the same store. A
+FileLock is an advisory lock (fcntl.flock) on a lock file next to the
+store: the process writing the store holds it exclusively, the processes
+reading it hold it shared, so a reader never sees a file being replaced
+and two writers never interleave. On the systems without fcntl the lock
+does nothing.
+
+file_stamp() returns what identifies the version of a file (inode,
+modification time, size): a process compares it with the stamp it saw
+when it last read or wrote the file to find out, without reading it,
+whether another process wrote the file since.
+
+Inside a process, the threads using the same storage are synchronized
+with a RWLock: any number of threads can hold it to read, a thread
+holding it to write holds it alone. A thread waiting to write is served
+before the threads that want to read after it, so a steady flow of
+reads can't keep a writer waiting forever.
+"""
+import os
+import threading
+from contextlib import contextmanager
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def file_stamp(path):
+    """Returns the (inode, modification time, size) of the file at path,
+    or None if it doesn't exist
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class FileLock:
+    """Advisory lock on a lock file, that can be held several times by
+    the same thread (the mode of the outermost hold applies), the other
+    threads of the process waiting until it's released.
+
+    Public instance attributes:
+        path: string - path of the lock file.
+    Public instance methods:
+        hold(self, exclusive): context manager holding the lock
+    """
+    def __init__(self, path):
+        """Instantiate the lock on the file at path, created when the
+        lock is first held
+        """
+        self.path = path
+        self.__file = None
+        self.__depth = 0
+        self.__thread_lock = threading.RLock()
+
+    @contextmanager
+    def hold(self, exclusive=True):
+        """Context manager holding the lock, exclusively or shared with
+        the other processes holding it shared
+        """
+        if fcntl is None:
+            yield self
+            return
+        with self.__thread_lock:
+            if not self.__depth:
+                file = open(self.path, "a")
+                try:
+                    fcntl.flock(file, fcntl.LOCK_EX if exclusive
+                                else fcntl.LOCK_SH)
+                except BaseException:
+                    file.close()
+                    raise
+                self.__file = file
+            self.__depth += 1
+            try:
+                yield self
+            finally:
+                self.__depth -= 1
+                if not self.__depth:
+                    fcntl.flock(self.__file, fcntl.LOCK_UN)
+                    self.__file.close()
+                    self.__file = None
+
+
+class RWLock:
+    """Reader/writer lock: shared by the threads reading, held by one
+    thread to write. A thread can take it again while it holds it, to
+    read or write if it holds it to write, to read if it holds it to
+    read (a read lock can't be turned into a write lock).
+
+    Public instance methods:
+        read(self): context manager holding the lock to read
+        write(self): context manager holding the lock to write
+    """
+    def __init__(self):
+        """Instantiate the lock, held by no thread"""
+        self.__condition = threading.Condition(threading.Lock())
+        self.__readers = {}
+        self.__writer = None
+        self.__writes = 0
+        self.__waiting = 0
+
+    @contextmanager
+    def read(self):
+        """Context manager holding the lock to read, waiting while a
+        thread holds it to write or waits to
+        """
+        me = threading.get_ident()
+        with self.__condition:
+            if self.__writer != me and me not in self.__readers:
+                while self.__writer is not None or self.__waiting:
+                    self.__condition.wait()
+            self.__readers[me] = self.__readers.get(me, 0) + 1
+        try:
+            yield self
+        finally:
+            with self.__condition:
+                if self.__readers[me] == 1:
+                    del self.__readers[me]
+                    self.__condition.notify_all()
+                else:
+                    self.__readers[me] -= 1
+
+    @contextmanager
+    def write(self):
+        """Context manager holding the lock to write, waiting until no
+        other thread holds it
+
+        Raises: RuntimeError if the thread holds the lock to read only
+        """
+        me = threading.get_ident()
+        with self.__condition:
+            if self.__writer != me:
+                if me in self.__readers:
+                    raise RuntimeError("a read lock can't be upgraded")
+                self.__waiting += 1
+                try:
+                    while self.__writer is not None or self.__readers:
+                        self.__condition.wait()
+                finally:
+                    self.__waiting -= 1
+                self.__writer = me
+            self.__writes += 1
+        try:
+            yield self
+        finally:
+            with self.__condition:
+                self.__writes -= 1
+                if not self.__writes:
+                    self.__writer = None
+                    self.__condition.notify_all()
@@ -0,0 +1,474 @@
+#!/usr/bin/python3
+"""This module define the MmapStorage that stores instances in a binary
+file read through mmap
+
+Module Description:
+The MmapStorage offers the same interface as the FileStorage but keeps
+the instances in a binary file made of:
+    a header: magic, offset of the footer, number of unused bytes.
+    the records: the <class name>.id key and the JSON text of an object.
+    a footer: the first entry and the number of entries of each class,
+              followed by one (hash of the key, offset, length) entry per
+              record, sorted by class then hash.
+The file is mapped in memory with mmap, so get() only reads the header,
+the footer entries visited by a binary search and the record of the
+object: looking an object up doesn't depend on the size of the file.
+The objects are only decoded when they're accessed.
+
+new() and delete() keep the changes in memory, save() appends the new
+records and a new footer after the current footer and then points the
+header to it: until the header is written the file still reads as it
+was before the save. The records replaced or deleted and the previous
+footers are left in place until the file is compacted, which happens
+when they take more than half of the file. Inside a transaction() the
+changes are written once, at the end of the outermost one, or forgotten
+if it ends with an exception.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+from models.engine import cascade
+from models.engine.async_storage import AsyncStorage
+from models.engine.query import Query
+from models.engine.locks import file_stamp
+from models.base_model import BaseModel
+from models.user import User
+from models.place import Place
+from models.state import State
+from models.city import City
+from models.amenity import Amenity
+from models.review import Review
+
+_MAGIC = b"HBNBMM01"
+_HEADER = struct.Struct("<8sQQ")
+_ENTRY = struct.Struct("<QQI")
+_SIZE = struct.Struct("<I")
+_KEY_SIZE = struct.Struct("<H")
+
+
+def _hash(key):
+    """Returns the 64 bits hash of the bytes key stored in the footer"""
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(),
+                          "little")
+
+
+class MmapStorage(AsyncStorage):
+    """MmapStorage class definition and provides instance
+    storage operations backed by a memory-mapped file.
+
+    Private class attributes:
+        __classes: dictionary - <class name> -> class of the stored objects
+    Public instance methods:
+        all(self, cls): returns the objects (of class cls) by <class name>.id
+        get(self, cls, id): returns the object of class cls with id
+        count(self, cls): returns the number of objects (of class cls)
+        find(self, cls, **attributes): returns the objects of class cls
+                                       with the given attribute values
+        query(self, cls): returns the Query of the objects of class cls
+        new(self, obj): stores obj, written on the next save
+        delete(self, obj): deletes obj, written on the next save
+        destroy(self, obj): deletes obj and the objects depending on it
+        save(self): writes the changes to the file
+        transaction(self): context manager deferring the save to its end
+        reload(self): maps the file and forgets the loaded objects
+        refresh(self): maps the file again if another process wrote it
+        compact(self): rewrites the file without its unused records
+        close(self): unmaps the file
+        asave(self)...: coroutines of the methods, see AsyncStorage
+    """
+    __classes = {"BaseModel": BaseModel, "User": User, "City": City,
+                 "Review": Review, "Amenity": Amenity, "Place": Place,
+                 "State": State}
+
+    def __init__(self, path="file.hbnb"):
+        """Instantiate the MmapStorage
+
+        args:
+            path: path of the binary file.
+        """
+        self.__path = path
+        self.__file = None
+        self.__map = None
+        self.__table = {}
+        self.__entries = 0
+        self.__garbage = 0
+        self.__objects = {}
+        self.__changes = {}
+        self.__depth = 0
+        self.__stamp = None
+
+    def all(self, cls=None):
+        """Returns a dictionary of the objects by <class name>.id
+
+        args:
+            cls: a class or a class name, when given only the objects
+                 of that class are returned.
+        """
+        result = {}
+        for name in self.__names(cls):
+            for entry_hash, offset, length in self.__entries_of(name):
+                key = self.__key(offset)
+                if key not in self.__changes:
+                    result[key] = self.__instance(key, offset, length)
+            for key, obj in self.__changes.items():
+                if obj is not None and key.partition(".")[0] == name:
+                    result[key] = obj
+        return result
+
+    def get(self, cls, id):
+        """Returns the object of class cls with the given id, or None
+
+        args:
+            cls: a class or a class name, or None to look the id up
+                 whatever the class of the object is.
+            id: the id of the object.
+        """
+        for name in self.__names(cls):
+            key = name + "." + id
+            if key in self.__changes:
+                obj = self.__changes[key]
+            else:
+                obj = self.__objects.get(key)
+                if obj is None:
+                    span = self.__lookup(key)
+                    if span is not None:
+                        obj = self.__instance(key, *span)
+            if obj is not None:
+                return obj
+        return None
+
+    def count(self, cls=None):
+        """Returns the number of stored objects, or the number of stored
+        objects of class cls (a class or a class name)
+        """
+        total = 0
+        for name in self.__names(cls):
+            total += self.__table.get(name, (0, 0))[1]
+            for key, obj in self.__changes.items():
+                if key.partition(".")[0] == name:
+                    stored = self.__lookup(key) is not None
+                    total += (obj is not None) - stored
+        return total
+
+    def find(self, cls, **attributes):
+        """Returns the list of objects of class cls whose attributes have
+        the given values, e.g. find(Review, place_id=place.id)
+        """
+        result = []
+        for obj in self.all(cls).values():
+            for attribute, value in attributes.items():
+                if getattr(obj, attribute, None) != value:
+                    break
+            else:
+                result.append(obj)
+        return result
+
+    def query(self, cls):
+        """Returns the Query of the objects of class cls (a class or a
+        class name), see models.engine.query
+        """
+        return Query(self, cls)
+
+    def new(self, obj):
+        """Stores obj, it's written to the file on the next save
+
+        args:
+            obj: the instance to be stored.
+        Returns: nothing
+        """
+        key = type(obj).__name__ + "." + obj.id
+        self.__changes[key] = obj
+        self.__objects[key] = obj
+
+    def delete(self, obj=None):
+        """Deletes obj, the deletion is written to the file on the next
+        save
+
+        args:
+            obj: the instance to be deleted
+        Returns: nothing
+        """
+        if obj is None:
+            return
+        key = type(obj).__name__ + "." + obj.id
+        self.__changes[key] = None
+        self.__objects.pop(key, None)
+
+    def destroy(self, obj):
+        """Deletes obj and the objects depending on it, as told by the
+        foreign_keys of the models, and saves the storage once, see
+        models.engine.cascade
+
+        Returns: the list of the deleted objects
+        Raises: ValueError if a restrict rule forbids the deletion
+        """
+        return cascade.destroy(self, obj)
+
+    def save(self):
+        """Appends the new records and a new footer to the file, unless
+        it's called inside a transaction()
+
+        Returns: nothing
+        """
+        if self.__depth:
+            return
+        changes = self.__changes
+        for key, obj in self.__objects.items():
+            if key not in changes and obj.is_dirty():
+                changes[key] = obj
+        if not changes:
+            return
+        self.__open()
+        hashes = {_hash(key.encode("utf-8")) for key in changes}
+        garbage = self.__garbage + len(self.__map) - self.__footer_offset()
+        entries = {}
+        for name in self.__table:
+            kept = entries[name] = []
+            for entry in self.__entries_of(name):
+                if entry[0] in hashes and self.__key(entry[1]) in changes:
+                    garbage += entry[2]
+                else:
+                    kept.append(entry)
+        end = len(self.__map)
+        self.__unmap()
+        file = self.__file
+        file.seek(end)
+        for key, obj in changes.items():
+            if obj is not None:
+                record = self.__record(key, obj)
+                entries.setdefault(key.partition(".")[0], []).append(
+                    (_hash(key.encode("utf-8")), end, len(record)))
+                file.write(record)
+                end += len(record)
+                obj.mark_clean()
+        for records in entries.values():
+            records.sort()
+        self.__write_footer(file, end, entries, garbage)
+        changes.clear()
+        self.__map_file()
+        if self.__garbage > self.__footer_offset() // 2:
+            self.compact()
+
+    @contextmanager
+    def transaction(self):
+        """Context manager writing the changes made by the statements of
+        its block once, at the end of the outermost transaction
+
+        If the block raises an exception the changes are forgotten and
+        the loaded objects too, so they're read again from the file.
+        """
+        self.__depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.__depth -= 1
+            if not self.__depth:
+                self.__changes.clear()
+                self.__objects.clear()
+            raise
+        self.__depth -= 1
+        if not self.__depth:
+            self.save()
+
+    def reload(self):
+        """Maps the file and forgets the objects loaded so far
+
+        Returns: nothing
+        """
+        self.close()
+        if os.path.exists(self.__path):
+            self.__open()
+
+    def refresh(self):
+        """Maps the file again if another process wrote it since this one
+        last mapped it, keeping the changes that aren't saved yet
+
+        Returns: True if another process wrote the file
+        """
+        if self.__file is None or file_stamp(self.__path) == self.__stamp:
+            return False
+        changes = self.__changes
+        objects = {key: self.__objects[key] for key in changes
+                   if key in self.__objects}
+        self.close()
+        self.__open()
+        self.__changes = changes
+        self.__objects = objects
+        return True
+
+    def compact(self):
+        """Rewrites the file without the records that have been replaced
+        or deleted
+
+        Returns: nothing
+        """
+        temp_path = self.__path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, 0, 0))
+            end = _HEADER.size
+            entries = {}
+            for name in self.__table:
+                kept = entries[name] = []
+                for entry_hash, offset, length in self.__entries_of(name):
+                    file.write(self.__map[offset:offset + length])
+                    kept.append((entry_hash, end, length))
+                    end += length
+            self.__write_footer(file, end, entries, 0)
+        self.__unmap()
+        self.__file.close()
+        self.__file = None
+        os.replace(temp_path, self.__path)
+        self.__open()
+
+    def close(self):
+        """Unmaps and closes the file, unsaved changes are lost
+
+        Returns: nothing
+        """
+        self.__unmap()
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+        self.__table = {}
+        self.__entries = 0
+        self.__garbage = 0
+        self.__objects = {}
+        self.__changes = {}
+
+    def __open(self):
+        """Opens and maps the file, creating it if it doesn't exist"""
+        if self.__file is not None:
+            return
+        if not os.path.exists(self.__path):
+            with open(self.__path, "wb") as file:
+                self.__write_footer(file, _HEADER.size, {}, 0)
+        self.__file = open(self.__path, "r+b")
+        self.__map_file()
+
+    def __map_file(self):
+        """Maps the file and reads its header and class table"""
+        self.__unmap()
+        self.__map = mmap.mmap(self.__file.fileno(), 0,
+                               access=mmap.ACCESS_READ)
+        magic, footer, self.__garbage = _HEADER.unpack_from(self.__map, 0)
+        if magic != _MAGIC:
+            raise ValueError("{} isn't an MmapStorage file".format(
+                self.__path))
+        size, = _SIZE.unpack_from(self.__map, footer)
+        start = footer + _SIZE.size
+        self.__table = json.loads(self.__map[start:start + size])
+        self.__entries = start + size
+        self.__stamp = file_stamp(self.__path)
+
+    def __unmap(self):
+        """Unmaps the file, if it's mapped"""
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+
+    def __write_footer(self, file, end, entries, garbage):
+        """Writes the footer holding entries (class name -> sorted list
+        of (hash, offset, length)) at offset end of file, and then the
+        header pointing to it
+        """
+        table = {}
+        first = 0
+        for name, records in entries.items():
+            if records:
+                table[name] = (first, len(records))
+                first += len(records)
+        data = json.dumps(table).encode("utf-8")
+        file.seek(end)
+        file.write(_SIZE.pack(len(data)) + data)
+        for name in table:
+            file.write(b"".join(_ENTRY.pack(*entry)
+                                for entry in entries[name]))
+        file.truncate()
+        file.flush()
+        os.fsync(file.fileno())
+        file.seek(0)
+        file.write(_HEADER.pack(_MAGIC, end, garbage))
+        file.flush()
+        os.fsync(file.fileno())
+
+    def __footer_offset(self):
+        """Returns the offset of the footer, where the records end"""
+        if self.__map is None:
+            return _HEADER.size
+        return _HEADER.unpack_from(self.__map, 0)[1]
+
+    def __entries_of(self, name):
+        """Returns an iterator over the (hash, offset, length) footer
+        entries of the records of class name
+        """
+        first, count = self.__table.get(name, (0, 0))
+        if not count:
+            return iter(())
+        start = self.__entries + first * _ENTRY.size
+        return _ENTRY.iter_unpack(self.__map[start:start +
+                                             count * _ENTRY.size])
+
+    def __lookup(self, key):
+        """Returns the (offset, length) of the record of key in the file,
+        or None, with a binary search over the footer entries of its class
+        """
+        first, count = self.__table.get(key.partition(".")[0], (0, 0))
+        if not count:
+            return None
+        key_hash = _hash(key.encode("utf-8"))
+        low, high = first, first + count
+        while low < high:
+            middle = (low + high) // 2
+            entry = _ENTRY.unpack_from(self.__map,
+                                       self.__entries + middle * _ENTRY.size)
+            if entry[0] < key_hash:
+                low = middle + 1
+            else:
+                high = middle
+        while low < first + count:
+            entry_hash, offset, length = _ENTRY.unpack_from(
+                self.__map, self.__entries + low * _ENTRY.size)
+            if entry_hash != key_hash:
+                break
+            if self.__key(offset) == key:
+                return offset, length
+            low += 1
+        return None
+
+    def __key(self, offset):
+        """Returns the key of the record at offset"""
+        size, = _KEY_SIZE.unpack_from(self.__map, offset)
+        start = offset + _KEY_SIZE.size
+        return self.__map[start:start + size].decode("utf-8")
+
+    def __instance(self, key, offset, length):
+        """Returns the instance stored in the record at offset, the
+        loaded instance if there is one
+        """
+        obj = self.__objects.get(key)
+        if obj is None:
+            size, = _KEY_SIZE.unpack_from(self.__map, offset)
+            start = offset + _KEY_SIZE.size + size
+            value = json.loads(self.__map[start:offset + length])
+            obj = self.__classes[key.partition(".")[0]].from_dict(value)
+            self.__objects[key] = obj
+        return obj
+
+    @staticmethod
+    def __record(key, obj):
+        """Returns the record of obj stored under key"""
+        data = key.encode("utf-8")
+        return (_KEY_SIZE.pack(len(data)) + data +
+                json.dumps(obj.to_dict()).encode("utf-8"))
+
+    def __names(self, cls):
+        """Returns the list of the class names matching cls: every class
+        name if cls is None, none if cls isn't a stored class
+        """
+        if cls is None:
+            return list(self.__classes)
+        name = cls if isinstance(cls, str) else cls.__name__
+        return [name] if name in self.__classes else []
@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""This module decodes the files of the FileStorage with several processes
+
+Module Description:
+Decoding the file is most of the time a reload takes, and it runs on one
+core. The functions of this module spread it over the processes of a
+ProcessPoolExecutor:
+    read_ranges() cuts a JSON file written by the FileStorage, which
+        holds one object per line, in ranges of lines each decoded by a
+        process.
+    read_files() decodes each file of a sharded FileStorage in a process.
+A process sends back the (key, value) pairs it decoded encoded with
+marshal, which the storage process decodes several times faster than
+JSON; the storage process then creates the instances. The processes only
+receive a path and a range of bytes, not the content of the file.
+
+A file that isn't laid out one object per line (written by another
+program, or with indentation) can't be cut in ranges: read_ranges()
+returns None and the storage reads the file in its process.
+"""
+import json
+import marshal
+import os
+from concurrent.futures import ProcessPoolExecutor
+from models.engine import formats
+
+
+def split(path, parts):
+    """Returns the list of (start, end) byte ranges cutting the JSON file
+    at path in at most parts ranges of whole lines, or None if the file
+    doesn't hold one object per line
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as file:
+        if file.read(2) != b"{\n":
+            return None
+        ranges = []
+        start = 2
+        for part in range(1, parts):
+            file.seek(max(start, size * part // parts))
+            file.readline()
+            end = file.tell()
+            if end >= size:
+                break
+            if end > start:
+                ranges.append((start, end))
+                start = end
+    ranges.append((start, size))
+    return ranges
+
+
+def decode_range(path, start, end):
+    """Decodes the lines of the JSON file at path between the offsets
+    start and end, each holding one "<key>": <value> pair
+
+    Returns: the marshal encoding of the list of (key, value) pairs
+    Raises: ValueError if a line isn't such a pair
+    """
+    with open(path, "rb") as file:
+        file.seek(start)
+        data = file.read(end - start).decode("utf-8")
+    lines = []
+    for line in data.split("\n"):
+        if line.endswith(","):
+            line = line[:-1]
+        if line and line != "}":
+            lines.append(line)
+    value = json.loads("{" + ",".join(lines) + "}")
+    for item in value.values():
+        if type(item) is not dict:
+            raise ValueError("The objects must be JSON objects")
+    return marshal.dumps(list(value.items()))
+
+
+def decode_file(path, codec):
+    """Decodes the file at path, written with the codec called codec (or
+    any codec, see formats.read())
+
+    Returns: the marshal encoding of the list of (key, value) pairs
+    """
+    try:
+        file = open(path, "rb")
+    except FileNotFoundError:
+        return marshal.dumps([])
+    with file:
+        return marshal.dumps(list(formats.read(file, formats.get(codec))))
+
+
+def run(jobs, processes):
+    """Runs the (function, args) jobs in at most processes processes
+
+    Returns: the list of the (key, value) pairs decoded by the jobs, in
+             the order of the jobs
+    """
+    with ProcessPoolExecutor(min(processes, len(jobs))) as executor:
+        futures = [executor.submit(function, *args)
+                   for function, args in jobs]
+        results = [future.result() for future in futures]
+    pairs = []
+    for result in results:
+        pairs.extend(marshal.loads(result))
+    return pairs
+
+
+def read_ranges(path, processes):
+    """Returns the list of the (key, value) pairs of the JSON file at
+    path, decoded by ranges of lines in processes processes, or None if
+    the file doesn't hold one object per line
+    """
+    ranges = split(path, processes)
+    if ranges is None:
+        return None
+    try:
+        return run([(decode_range, (path, start, end))
+                    for start, end in ranges], processes)
+    except ValueError:
+        return None
+
+
+def read_files(paths, codec, processes):
+    """Returns the list of the (key, value) pairs of the files at paths,
+    written with the codec called codec, each decoded in a process
+    """
+    return run([(decode_file, (path, codec)) for path in paths], processes)
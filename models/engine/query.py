@@ -0,0 +1,317 @@
+#!/usr/bin/python3
+"""This module defines the queries over the objects of a storage
+
+Module Description:
+storage.query(cls) returns a Query on the objects of class cls, refined
+by chaining its methods, each returning a new Query:
+
+    places = (storage.query(Place)
+              .where(price_by_night__lt=100, max_guest__gte=4)
+              .order_by("price_by_night", "-max_guest")
+              .limit(20).offset(40))
+    for place in places:
+        ...
+
+The conditions of where() are <attribute>=<value> (equality) or
+<attribute>__<operator>=<value> with one of the operators of
+_OPERATORS; an object is selected when all of them hold. A Query is
+evaluated when it's iterated, as a generator, the candidates being
+picked through the indexes of the storage:
+    the equality conditions are handed to storage.find(), which uses
+        the hash indexes;
+    otherwise the contains, contains_all and contains_any conditions on
+        a list attribute with a bitmap index (Place.amenity_ids) are
+        handed to storage.having(), which answers them with bitwise
+        operations;
+    otherwise, when the query is sorted by one attribute that has a
+        sorted index (see FileStorage.range()), the candidates are read
+        from it in order, within the bounds of the conditions on that
+        attribute: a page of the cheapest places costs O(log n + page);
+    otherwise the bounds of a condition on an attribute with a sorted
+        index select the candidates.
+The conditions are checked on each candidate as it's produced. Sorted
+with a limit, only the offset + limit first objects are kept (in a heap)
+instead of sorting every match; without order_by(), or in the order of
+a sorted index, the iteration stops as soon as the page is full.
+only() turns the objects produced in dictionaries of some of their
+attributes.
+
+An object missing an attribute (or holding a value that can't be
+compared with the one of the condition) doesn't match the conditions
+on it. Values of different types are sorted without comparing them
+with each other: the numbers come first, then the values of each other
+type grouped by type name (values that can't be ordered, such as
+dictionaries, by their repr()), and None values last.
+"""
+import heapq
+import itertools
+import operator
+
+_OPERATORS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "in": lambda value, values: value in values,
+    "contains": lambda value, item: item in value,
+    "contains_all": lambda value, items: all(item in value
+                                             for item in items),
+    "contains_any": lambda value, items: any(item in value
+                                             for item in items),
+}
+_BOUNDS = {"lt": ("high", False), "lte": ("high", True),
+           "gt": ("low", False), "gte": ("low", True)}
+_MISSING = object()
+
+
+def _sort_value(value):
+    """Returns the key value is sorted with, which can be compared with
+    the key of a value of any type (see the module docstring)
+    """
+    if value is None:
+        return (True, "", 0)
+    if type(value) in (int, float, bool):
+        return (False, "", value)
+    kind = type(value).__name__
+    if type(value) is not str:
+        try:
+            value < value
+        except TypeError:
+            return (False, kind, repr(value))
+    return (False, kind, value)
+
+
+class _Descending:
+    """Sort key of a value sorted in descending order"""
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        """Wraps value"""
+        self.value = value
+
+    def __eq__(self, other):
+        """Returns True if both wrapped values are equal"""
+        return self.value == other.value
+
+    def __lt__(self, other):
+        """Returns True if the wrapped value is greater than the other"""
+        return other.value < self.value
+
+
+class Query:
+    """Query on the objects of one class of a storage.
+
+    Private instance attributes:
+        __storage: the storage queried.
+        __cls: the class (or class name) of the objects queried.
+        __conditions: tuple of (attribute, operator, value) conditions.
+        __order: tuple of (attribute, descending) sort keys.
+        __offset: number of objects skipped.
+        __limit: maximum number of objects produced, None for no limit.
+        __fields: tuple of the attributes produced by only(), or None.
+    Public instance methods:
+        where(self, **conditions): selects the objects matching conditions
+        order_by(self, *attributes): sorts the objects by attributes
+        offset(self, count): skips the first count objects
+        limit(self, count): produces at most count objects
+        page(self, number, size): selects the page number of size objects
+        only(self, *attributes): produces dictionaries of attributes
+        first(self): returns the first object, or None
+        count(self): returns the number of objects matching the conditions
+    """
+    def __init__(self, storage, cls):
+        """Instantiate the query of every object of class cls
+
+        args:
+            storage: the storage the objects are read from.
+            cls: a class or a class name.
+        """
+        self.__storage = storage
+        self.__cls = cls
+        self.__conditions = ()
+        self.__order = ()
+        self.__offset = 0
+        self.__limit = None
+        self.__fields = None
+
+    def where(self, **conditions):
+        """Returns the query of the objects that also match conditions,
+        e.g. where(city_id=city.id, price_by_night__lte=120)
+
+        Raises: ValueError if the operator of a condition is unknown
+        """
+        parsed = []
+        for key, value in conditions.items():
+            attribute, _, name = key.rpartition("__")
+            if not attribute:
+                attribute, name = key, "eq"
+            elif name not in _OPERATORS:
+                raise ValueError("Unknown operator: {}".format(name))
+            parsed.append((attribute, name, value))
+        return self.__copy(conditions=self.__conditions + tuple(parsed))
+
+    def order_by(self, *attributes):
+        """Returns the query of the objects sorted by attributes, an
+        attribute prefixed by "-" being sorted in descending order
+        """
+        order = tuple((attribute.lstrip("-"), attribute.startswith("-"))
+                      for attribute in attributes)
+        return self.__copy(order=order)
+
+    def offset(self, count):
+        """Returns the query skipping the first count objects"""
+        return self.__copy(offset=count)
+
+    def limit(self, count):
+        """Returns the query producing at most count objects"""
+        return self.__copy(limit=count)
+
+    def page(self, number, size):
+        """Returns the query of the page number (from 1) of size objects"""
+        return self.__copy(offset=(number - 1) * size, limit=size)
+
+    def only(self, *attributes):
+        """Returns the query producing, instead of the objects, the
+        dictionaries of their given attributes
+        """
+        return self.__copy(fields=attributes)
+
+    def first(self):
+        """Returns the first object (or dictionary) produced, or None"""
+        return next(iter(self.limit(1)), None)
+
+    def count(self):
+        """Returns the number of objects matching the conditions, whatever
+        the offset and limit of the query are
+        """
+        return sum(1 for obj in self.__candidates()[0])
+
+    def __iter__(self):
+        """Yields the objects (or dictionaries) selected by the query"""
+        objects, ordered = self.__candidates()
+        stop = None if self.__limit is None else self.__offset + self.__limit
+        if self.__order and not ordered:
+            if stop is None:
+                objects = sorted(objects, key=self.__sort_key)
+            else:
+                objects = heapq.nsmallest(stop, objects, key=self.__sort_key)
+        objects = itertools.islice(objects, self.__offset, stop)
+        if self.__fields is None:
+            yield from objects
+            return
+        for obj in objects:
+            yield {attribute: getattr(obj, attribute, None)
+                   for attribute in self.__fields}
+
+    def __copy(self, **changes):
+        """Returns a copy of the query with the attributes in changes"""
+        query = Query(self.__storage, self.__cls)
+        query.__conditions = changes.get("conditions", self.__conditions)
+        query.__order = changes.get("order", self.__order)
+        query.__offset = changes.get("offset", self.__offset)
+        query.__limit = changes.get("limit", self.__limit)
+        query.__fields = changes.get("fields", self.__fields)
+        return query
+
+    def __candidates(self):
+        """Returns an iterator over the objects matching the conditions,
+        and True if it produces them in the order of the query
+        """
+        equal = {}
+        others = []
+        for condition in self.__conditions:
+            attribute, name, value = condition
+            if name == "eq" and attribute not in equal:
+                equal[attribute] = value
+            else:
+                others.append(condition)
+        candidates = None
+        ordered = False
+        if equal:
+            candidates = self.__storage.find(self.__cls, **equal)
+        if candidates is None:
+            candidates = self.__having(others)
+        if candidates is None and len(self.__order) == 1:
+            candidates = self.__range(*self.__order[0])
+            ordered = candidates is not None
+        for attribute, name, value in others:
+            if candidates is None and name in _BOUNDS:
+                candidates = self.__range(attribute, False)
+        if candidates is None:
+            candidates = self.__storage.all(self.__cls).values()
+        return (obj for obj in candidates
+                if all(self.__holds(obj, condition)
+                       for condition in others)), ordered
+
+    def __having(self, conditions):
+        """Returns the objects found by storage.having() for the contains
+        conditions on one attribute that has a bitmap index, or None
+        """
+        having = getattr(self.__storage, "having", None)
+        if having is None:
+            return None
+        items = {}
+        for attribute, name, value in conditions:
+            if not name.startswith("contains"):
+                continue
+            all_of, any_of = items.get(attribute, ((), None))
+            try:
+                if name == "contains":
+                    all_of += (value,)
+                elif name == "contains_all":
+                    all_of += tuple(value)
+                elif any_of is None:
+                    any_of = tuple(value)
+            except TypeError:
+                continue
+            items[attribute] = (all_of, any_of)
+        for attribute, (all_of, any_of) in items.items():
+            try:
+                return having(self.__cls, attribute, all_of, any_of)
+            except (ValueError, TypeError):
+                pass
+        return None
+
+    def __range(self, attribute, descending):
+        """Returns the iterator of storage.range() over the objects sorted
+        by attribute within the bounds of the conditions on it, or None
+        if the storage has no sorted index on attribute
+        """
+        scan = getattr(self.__storage, "range", None)
+        if scan is None:
+            return None
+        bounds = {}
+        for condition_attribute, name, value in self.__conditions:
+            if condition_attribute == attribute and name in _BOUNDS:
+                bound, inclusive = _BOUNDS[name]
+                if bound not in bounds:
+                    bounds[bound] = value
+                    bounds["include_" + bound] = inclusive
+        try:
+            return scan(self.__cls, attribute, reverse=descending, **bounds)
+        except (ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def __holds(obj, condition):
+        """Returns True if obj matches the (attribute, operator, value)
+        condition
+        """
+        attribute, name, value = condition
+        actual = getattr(obj, attribute, _MISSING)
+        if actual is _MISSING:
+            return False
+        try:
+            return bool(_OPERATORS[name](actual, value))
+        except TypeError:
+            return False
+
+    def __sort_key(self, obj):
+        """Returns the key obj is sorted with"""
+        key = []
+        for attribute, descending in self.__order:
+            value = _sort_value(getattr(obj, attribute, None))
+            key.append(_Descending(value) if descending else value)
+        return key
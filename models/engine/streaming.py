@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+"""This module defines an incremental parser for the JSON file of the
+FileStorage
+
+Module Description:
+json.load() reads and decodes the whole JSON file before the first
+instance can be created, so a reload holds the entire decoded document
+and every instance in memory at the same time. iter_items() reads the
+file chunk by chunk and yields the <class name>.id keys of the top-level
+JSON object one at a time together with their decoded value, so the
+caller can turn each of them into an instance (or keep it aside) before
+the next one is decoded.
+"""
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _Reader:
+    """Buffered reader over a text file handing out JSON values"""
+    def __init__(self, file, chunk_size):
+        """Instantiate the reader over the opened text file"""
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Reads the next chunk of the file into the buffer
+
+        Returns: False once the end of the file is reached
+        """
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Returns the next non whitespace character, None at the end"""
+        while True:
+            while (self.pos < len(self.buffer) and
+                   self.buffer[self.pos] in _WHITESPACE):
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return None
+
+    def take(self, expected):
+        """Consumes the next non whitespace character which must be one
+        of expected, and returns it
+        """
+        char = self.peek()
+        if char is None or char not in expected:
+            raise ValueError("Expecting one of {!r} at offset {} of the "
+                             "JSON file, found {!r}".format(expected,
+                                                            self.pos, char))
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decodes and returns the next JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            if end < len(self.buffer) or not self.fill():
+                self.pos = end
+                return value
+
+    def rest(self):
+        """Returns the rest of the file as a string"""
+        while self.fill():
+            pass
+        return self.buffer[self.pos:]
+
+
+def iter_items(file, chunk_size=1 << 16):
+    """Yields the (key, value) pairs of the JSON object stored in file
+
+    An empty file (or one holding only whitespace) and a document that
+    isn't an object but decodes to a falsy value (e.g. an empty string)
+    yield nothing, like an empty object.
+
+    args:
+        file: a file opened in text mode.
+        chunk_size: number of characters read at a time.
+    Raises: ValueError if the file isn't a valid JSON document
+    """
+    reader = _Reader(file, chunk_size)
+    if reader.peek() is None:
+        return
+    if reader.peek() != "{":
+        if json.loads(reader.rest()):
+            raise ValueError("The JSON file doesn't hold an object")
+        return
+    reader.take("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ValueError("Expecting a string key in the JSON file")
+        reader.take(":")
+        yield key, reader.value()
+        if reader.take(",}") == "}":
+            return
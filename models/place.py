@@ -9,7 +9,9 @@ price_by_night, latitude, longitude, and amenity_ids. These attributes
 store details related to the place's location, features, and amenities.
 Instances of this class facilitate property management and reservations.
 """
-from models.base_model import BaseModel
+import models
+from models.base_model import BaseModel, _ListDefault
+from models.review import Review
 
 
 class Place(BaseModel):
@@ -17,6 +19,17 @@ class Place(BaseModel):
     several attributes including city_id, user_id, name, description,
     number_rooms, number_bathrooms, max_guest,
     price_by_night, latitude, longitude, and amenity_ids
+
+    indexed_attributes lists the attributes the storage keeps an index on,
+    sorted_attributes the numeric ones it keeps sorted for range queries,
+    bitmap_attributes the lists it keeps a bitmap per item of for
+    having(), geo_attributes the pair it locates the place with and
+    text_attributes the ones search() looks words up in. foreign_keys
+    lists the ids of other objects the place refers to: it's deleted
+    with its city, and its owner can't be deleted while it exists (see
+    models.engine.cascade). reviews is the list of the Review instances
+    of the place. Each place gets its own amenity_ids list the first time
+    it's read.
     """
     city_id = ""
     user_id = ""
@@ -28,4 +41,17 @@ class Place(BaseModel):
     price_by_night = 0
     latitude = 0.0
     longitude = 0.0
-    amenity_ids = []
+    amenity_ids = _ListDefault()
+    indexed_attributes = ("city_id", "user_id")
+    foreign_keys = (("city_id", "City", "cascade"),
+                    ("user_id", "User", "restrict"))
+    sorted_attributes = ("price_by_night", "max_guest", "number_rooms",
+                         "number_bathrooms")
+    bitmap_attributes = ("amenity_ids",)
+    geo_attributes = ("latitude", "longitude")
+    text_attributes = ("name", "description")
+
+    @property
+    def reviews(self):
+        """Returns the list of the Review instances of the place"""
+        return models.storage.find(Review, place_id=self.id)
@@ -16,7 +16,17 @@ from models.base_model import BaseModel
 class Review(BaseModel):
     """A user review class that inherits from BaseModel and
     It includes attributes such as place_id, user_id, and text.
+
+    indexed_attributes lists the attributes the storage keeps an index on,
+    text_attributes the ones search() looks words up in and foreign_keys
+    the ids of other objects the review refers to: it's deleted with its
+    place, and its user_id is set to None when its author is deleted
+    (see models.engine.cascade).
     """
     place_id = ""
     user_id = ""
     text = ""
+    indexed_attributes = ("place_id", "user_id")
+    foreign_keys = (("place_id", "Place", "cascade"),
+                    ("user_id", "User", "set-null"))
+    text_attributes = ("text",)
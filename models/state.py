@@ -7,11 +7,22 @@ It has a name attribute, which stores the name of the state. Instances of this
 class serve as a means of organizing and categorizing locations within a larger
 geographical context.
 """
+import models
 from models.base_model import BaseModel
+from models.city import City
 
 
 class State(BaseModel):
     """A state class with a name attributes to represent
     geographical state.
+
+    cities: the list of the City instances of the state.
     """
     name = ""
+
+    @property
+    def cities(self):
+        """Returns the list of the City instances whose state_id is
+        the id of the state
+        """
+        return models.storage.find(City, state_id=self.id)
@@ -7,7 +7,9 @@ encapsulating user-related information within the application.
 It represents individuals who interact with the system and provides
 attributes for managing their profile details.
 """
+import models
 from models.base_model import BaseModel
+from models.place import Place
 
 
 class User(BaseModel):
@@ -25,8 +27,14 @@ class User(BaseModel):
     last_name: A string attribute representing the user's last name.
         Similar to first_name, it initializes as an empty string
         and holds the user's surname.
+    places: the list of the Place instances owned by the user.
     """
     email = ""
     password = ""
     first_name = ""
     last_name = ""
+
+    @property
+    def places(self):
+        """Returns the list of the Place instances owned by the user"""
+        return models.storage.find(Place, user_id=self.id)
@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""This module defines unit test for the console"""
+import unittest
+from io import StringIO
+from unittest import mock
+from console import HBNBCommand
+from models import storage
+from models.place import Place
+
+
+class Test_console_near(unittest.TestCase):
+    """tests for the near and nearest commands"""
+    def setUp(self):
+        self.place = Place(latitude=48.8566, longitude=2.3522)
+        storage.new(self.place)
+
+    def tearDown(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+
+    def run_command(self, line):
+        with mock.patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd(line)
+        return output.getvalue().strip()
+
+    def test_near(self):
+        output = self.run_command("near 48.86 2.35 10")
+        self.assertIn(self.place.id, output)
+        self.assertIn(self.place.id, self.run_command("near 0 0 1e300"))
+
+    def test_nearest(self):
+        output = self.run_command("nearest 0 0 1")
+        self.assertIn(self.place.id, output)
+
+    def test_invalid_numbers(self):
+        self.assertEqual(self.run_command("near nan 0 10"),
+                         "** latitude must be finite **")
+        self.assertEqual(self.run_command("near 0 -inf 10"),
+                         "** longitude must be finite **")
+        self.assertEqual(self.run_command("near 0 0 inf"),
+                         "** radius must be finite **")
+        self.assertEqual(self.run_command("near 0 0 1e400"),
+                         "** radius must be finite **")
+        self.assertEqual(self.run_command("nearest 0 0 1e400"),
+                         "** count must be finite **")
+        self.assertEqual(self.run_command("nearest 0 0 -1"),
+                         "** count must be at least 1 **")
+        self.assertEqual(self.run_command("nearest 0 0 0"),
+                         "** count must be at least 1 **")
+        self.assertEqual(self.run_command("near 0 0 x"),
+                         "** radius must be a number **")
+        self.assertEqual(self.run_command("near 0"),
+                         "** longitude missing **")
+
+
+if __name__ == "__main__":
+    unittest.main()
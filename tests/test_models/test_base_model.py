@@ -23,9 +23,10 @@ Test the to_dict method:
 """
 import unittest
 import os
+from unittest import mock
 from datetime import datetime
 from models import storage
-from models.base_model import BaseModel
+from models.base_model import BaseModel, parse_datetime
 from models import storage
 
 
@@ -40,9 +41,9 @@ class Test_BaseModel(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
-        all_objs = list(storage.all().keys())
-        for obj_id in all_objs:
-            del storage._FileStorage__objects[obj_id]
+        all_objs = list(storage.all().values())
+        for obj in all_objs:
+            storage.delete(obj)
             storage.save()
         if os.path.exists(cls.temp_file_path):
             os.remove(cls.temp_file_path)
@@ -121,6 +122,24 @@ class Test_BaseModel(unittest.TestCase):
         self.assertEqual(new_instance.__class__, BaseModel)
         self.assertIsNot(new_instance, instance)
 
+    def test_dirty_tracking(self):
+        """Tests that creating, setting or deleting an attribute and
+        saving marks the instance dirty
+        """
+        instance = BaseModel()
+        self.assertTrue(instance.is_dirty())
+        instance.mark_clean()
+        self.assertFalse(instance.is_dirty())
+        instance.name = "Example"
+        self.assertTrue(instance.is_dirty())
+        instance.mark_clean()
+        del instance.name
+        self.assertTrue(instance.is_dirty())
+        self.assertNotIn("name", instance.to_dict())
+        instance.save()
+        self.assertFalse(instance.is_dirty())
+        self.assertEqual(len(instance.to_dict()), 4)
+
     def test_time_format(self):
         instance = BaseModel()
         datetime_format = instance.to_dict()["created_at"]
@@ -129,6 +148,85 @@ class Test_BaseModel(unittest.TestCase):
         formatted_datetime = parsed_datetime.strftime("%Y-%m-%dT%H:%M:%S.%f")
         self.assertEqual(datetime_format, formatted_datetime)
 
+    def test_parse_datetime(self):
+        """Tests the ISO format and the legacy formats are parsed"""
+        moment = datetime(2023, 8, 14, 4, 33, 39, 418067)
+        self.assertEqual(parse_datetime(moment.isoformat()), moment)
+        self.assertEqual(parse_datetime("2023-08-14 04:33:39.418067"),
+                         moment)
+        self.assertEqual(parse_datetime("2023-08-14T04:33:39"),
+                         moment.replace(microsecond=0))
+        with self.assertRaises(ValueError):
+            parse_datetime("14/08/2023")
+        with self.assertRaises(TypeError):
+            parse_datetime(None)
+
+    def test_re_create_without_microseconds(self):
+        """Tests a timestamp without microseconds is read back"""
+        instance = BaseModel()
+        instance.created_at = instance.created_at.replace(microsecond=0)
+        copy = BaseModel(**instance.to_dict())
+        self.assertEqual(copy.created_at, instance.created_at)
+        self.assertIs(type(copy.created_at), datetime)
+
+    def test_lazy_timestamps(self):
+        """Tests the timestamps of a lazy_timestamps class are parsed
+        when they're read and kept as they are by to_dict
+        """
+        class LazyModel(BaseModel):
+            lazy_timestamps = True
+
+        kwargs = BaseModel().to_dict()
+        kwargs["updated_at"] = "2023-08-14 04:33:39.418067"
+        instance = LazyModel(**kwargs)
+        self.assertIs(type(instance.__dict__["created_at"]), str)
+        self.assertEqual(instance.to_dict()["updated_at"],
+                         kwargs["updated_at"])
+        instance.mark_clean()
+        self.assertEqual(instance.updated_at,
+                         datetime(2023, 8, 14, 4, 33, 39, 418067))
+        self.assertIs(type(instance.__dict__["updated_at"]), datetime)
+        self.assertFalse(instance.is_dirty())
+        self.assertIn("datetime.datetime", str(instance))
+        self.assertEqual(instance.to_dict()["created_at"],
+                         kwargs["created_at"])
+        with self.assertRaises(TypeError):
+            LazyModel(created_at=None)
+
+    def test_from_dict(self):
+        """Tests from_dict creates the same instance as the constructor
+        without generating an id and without marking it dirty
+        """
+        instance = BaseModel()
+        instance.name = "Example"
+        instance.number = 98
+        dictionary = instance.to_dict()
+        with mock.patch("models.base_model.uuid4") as uuid4:
+            copy = BaseModel.from_dict(dictionary)
+            again = BaseModel.from_dict(dictionary)
+        uuid4.assert_not_called()
+        self.assertIs(type(copy), BaseModel)
+        self.assertDictEqual(copy.to_dict(), dictionary)
+        self.assertDictEqual(copy.__dict__, BaseModel(**dictionary).__dict__)
+        self.assertEqual(str(copy), str(instance))
+        self.assertFalse(copy.is_dirty())
+        self.assertIsNot(again, copy)
+        self.assertEqual(again.created_at, instance.created_at)
+
+    def test_from_dict_fallback(self):
+        """Tests from_dict gives the dictionaries it can't set at once
+        to the constructor
+        """
+        dictionary = {"__class__": "BaseModel", "name": "Example"}
+        instance = BaseModel.from_dict(dictionary)
+        self.assertEqual(instance.name, "Example")
+        self.assertIsInstance(instance.created_at, datetime)
+        self.assertTrue(instance.is_dirty())
+        dictionary = BaseModel().to_dict()
+        dictionary["created_at"] = None
+        with self.assertRaises(TypeError):
+            BaseModel.from_dict(dictionary)
+
 
 if __name__ == '__main__':
     unittest.main()
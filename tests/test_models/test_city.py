@@ -7,6 +7,7 @@ import models
 from datetime import datetime
 from time import sleep
 from models.city import City
+from models.place import Place
 
 
 class TestCityMethods(unittest.TestCase):
@@ -183,6 +184,26 @@ class TestCityMethods(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.city.to_dict(None)
 
+    def test_places(self):
+        """Test if places returns the Place instances of the city."""
+        city = City()
+        first = Place(city_id=city.id)
+        second = Place(city_id=city.id)
+        models.storage.new(first)
+        models.storage.new(Place())
+        self.assertListEqual(city.places, [first])
+        models.storage.new(second)
+        self.assertListEqual(city.places, [first, second])
+        first.city_id = "other"
+        models.storage.new(first)
+        self.assertListEqual(city.places, [second])
+        models.storage.delete(second)
+        self.assertListEqual(city.places, [])
+        for obj in list(models.storage.all(Place).values()):
+            models.storage.delete(obj)
+        with self.assertRaises(AttributeError):
+            city.places = []
+
 
 if __name__ == "__main__":
     unittest.main()
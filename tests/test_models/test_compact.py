@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+"""Defines unittests for models/compact.py."""
+import unittest
+import json
+import os
+from datetime import datetime
+from models import storage
+from models.compact import compact, schema
+from models.engine.file_storage import FileStorage
+from models.base_model import BaseModel
+from models.place import Place
+from models.review import Review
+
+
+class TestCompact(unittest.TestCase):
+    """Unittests for the compact variant of the model classes."""
+
+    def setUp(self):
+        self.CompactPlace = compact(Place)
+
+    def test_same_class_is_returned(self):
+        """Test if compact returns the same class for a model class."""
+        self.assertIs(compact(Place), self.CompactPlace)
+        self.assertEqual(self.CompactPlace.__name__, "Place")
+        self.assertIs(self.CompactPlace.model, Place)
+
+    def test_schema(self):
+        """Test if the schema holds the declared attributes."""
+        fields = schema(Review)
+        self.assertDictEqual(fields, {"place_id": "", "user_id": "",
+                                      "text": ""})
+        self.assertIn("amenity_ids", schema(Place))
+        self.assertNotIn("indexed_attributes", schema(Place))
+
+    def test_no_instance_dict(self):
+        """Test if the attributes are kept in slots."""
+        place = self.CompactPlace()
+        place.name = "Home"
+        self.assertIn("name", self.CompactPlace.__slots__)
+        self.assertEqual(self.CompactPlace.__dictoffset__, 0)
+        vars(place)["name"] = "x"
+        self.assertEqual(place.name, "Home")
+
+    def test_defaults_and_class_attributes(self):
+        """Test if the declared attributes default to the class ones."""
+        place = self.CompactPlace()
+        self.assertEqual(place.city_id, "")
+        self.assertEqual(place.max_guest, 0)
+        self.assertEqual(place.latitude, 0.0)
+        self.assertEqual(self.CompactPlace.indexed_attributes,
+                         Place.indexed_attributes)
+        with self.assertRaises(AttributeError):
+            place.unknown
+
+    def test_to_dict_and_str_match_model(self):
+        """Test if to_dict and __str__ match the ones of the model."""
+        place = Place()
+        place.name = "Home"
+        place.price_by_night = 80
+        place.nickname = "my place"
+        copy = self.CompactPlace(**place.to_dict())
+        self.assertDictEqual(copy.to_dict(), place.to_dict())
+        self.assertEqual(str(copy), str(place))
+
+    def test_kwargs_constructor(self):
+        """Test instantiation with keyword arguments."""
+        current_time = datetime.today()
+        place = self.CompactPlace(id="415",
+                                  created_at=current_time.isoformat(),
+                                  updated_at=current_time.isoformat())
+        self.assertEqual(place.id, "415")
+        self.assertEqual(place.created_at, current_time)
+        self.assertEqual(place.updated_at, current_time)
+
+    def test_from_dict(self):
+        """Test if from_dict creates the same instance as the constructor"""
+        place = Place()
+        place.name = "Home"
+        place.nickname = "my place"
+        dictionary = place.to_dict()
+        copy = self.CompactPlace.from_dict(dictionary)
+        self.assertIs(type(copy), self.CompactPlace)
+        self.assertDictEqual(copy.to_dict(), dictionary)
+        self.assertEqual(str(copy), str(place))
+        self.assertFalse(copy.is_dirty())
+        copy = self.CompactPlace.from_dict({"name": "Home"})
+        self.assertEqual(copy.name, "Home")
+        self.assertIsInstance(copy.created_at, datetime)
+
+    def test_list_default_is_not_shared(self):
+        """Test if appending to a list default changes only the instance"""
+        place = self.CompactPlace()
+        other = self.CompactPlace()
+        self.assertNotIn("amenity_ids", place.to_dict())
+        place.amenity_ids.append("a1")
+        self.assertEqual(place.amenity_ids, ["a1"])
+        self.assertEqual(other.amenity_ids, [])
+        self.assertEqual(Place.amenity_ids, [])
+        self.assertEqual(place.to_dict()["amenity_ids"], ["a1"])
+        self.assertNotIn("amenity_ids", other.to_dict())
+
+    def test_not_an_instance_of_the_model(self):
+        """Test if the model class of a compact instance is known."""
+        place = self.CompactPlace()
+        self.assertNotIsInstance(place, Place)
+        self.assertIsInstance(place, (Place, self.CompactPlace))
+        self.assertIs(type(place).model, Place)
+
+    def test_delete_and_dirty(self):
+        """Test if deleting attributes works and marks dirty."""
+        place = self.CompactPlace()
+        place.name = "Home"
+        place.nickname = "x"
+        place.mark_clean()
+        del place.name
+        self.assertTrue(place.is_dirty())
+        del place.nickname
+        self.assertEqual(place.name, "")
+        self.assertNotIn("nickname", place.to_dict())
+        with self.assertRaises(AttributeError):
+            del place.nickname
+
+    def test_storage_creates_compact_instances(self):
+        """Test if a compact FileStorage reloads compact instances."""
+        path = "airbnb_compact.json"
+        place = Place()
+        place.name = "Home"
+        with open(path, "w") as file:
+            json.dump({"Place." + place.id: place.to_dict()}, file)
+        s_instance = FileStorage(compact=True)
+        s_instance._FileStorage__file_path = path
+        try:
+            s_instance.reload()
+            stored = s_instance.get(Place, place.id)
+            self.assertIs(type(stored), self.CompactPlace)
+            self.assertDictEqual(stored.to_dict(), place.to_dict())
+            self.assertListEqual(s_instance.find(Place, name="Home"),
+                                 [stored])
+        finally:
+            for obj in list(storage.all().values()):
+                storage.delete(obj)
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
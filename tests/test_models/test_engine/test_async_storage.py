@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""This module defines unit test for the coroutines of the storages"""
+import asyncio
+import io
+import os
+import threading
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+from console import HBNBCommand
+from models import storage
+from models.engine.db_storage import DBStorage
+from models.engine.file_storage import FileStorage
+from models.engine.mmap_storage import MmapStorage
+from models.user import User
+
+
+class Test_AsyncStorage(unittest.IsolatedAsyncioTestCase):
+    """tests for the AsyncStorage coroutines of the storages"""
+    def setUp(self):
+        self.paths = ["airbnb_async.json", "airbnb_async.db",
+                      "airbnb_async.hbnb"]
+
+    def tearDown(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        for path in self.paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def storages(self):
+        file_storage = FileStorage()
+        file_storage._FileStorage__file_path = self.paths[0]
+        return [file_storage, DBStorage(self.paths[1]),
+                MmapStorage(self.paths[2])]
+
+    async def test_round_trip(self):
+        for s_instance in self.storages():
+            with self.subTest(type(s_instance).__name__):
+                await s_instance.areload()
+                user = User(first_name="Betty")
+                await s_instance.anew(user)
+                await s_instance.asave()
+                self.assertIs(await s_instance.aget(User, user.id), user)
+                self.assertEqual(await s_instance.acount(User), 1)
+                self.assertEqual(await s_instance.afind(
+                    User, first_name="Betty"), [user])
+                self.assertIn("User." + user.id, await s_instance.aall())
+                await s_instance.adelete(user)
+                await s_instance.asave()
+                self.assertIsNone(await s_instance.aget(User, user.id))
+                await s_instance.aclose()
+                self.assertIsNone(s_instance.executor)
+
+    async def test_loop_runs_during_save(self):
+        s_instance = self.storages()[0]
+        s_instance.new(User())
+        writing = threading.Event()
+        written = threading.Event()
+        compact = s_instance.compact
+
+        def slow_compact():
+            writing.set()
+            written.wait(5)
+            compact()
+
+        with mock.patch.object(s_instance, "compact", slow_compact):
+            save = asyncio.ensure_future(s_instance.asave())
+            while not writing.is_set():
+                await asyncio.sleep(0.01)
+            self.assertFalse(save.done())
+            written.set()
+            await save
+        self.assertTrue(os.path.exists(self.paths[0]))
+        await s_instance.aclose()
+
+    async def test_calls_run_in_order(self):
+        s_instance = self.storages()[0]
+        users = [User() for n in range(20)]
+        await asyncio.gather(*[s_instance.anew(user) for user in users],
+                             s_instance.asave())
+        self.assertEqual(await s_instance.acount(User), 20)
+        with open(self.paths[0], "r") as file:
+            self.assertEqual(file.read().count("User."), 20)
+        await s_instance.aclose()
+
+    async def test_console_aonecmd(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            await HBNBCommand().aonecmd("create User")
+        user_id = output.getvalue().strip()
+        self.assertIsNotNone(storage.get(User, user_id))
+        output = io.StringIO()
+        with redirect_stdout(output):
+            stop = await HBNBCommand().aonecmd("count User")
+        self.assertEqual(output.getvalue().strip(), "1")
+        self.assertFalse(stop)
+        self.assertTrue(await HBNBCommand().aonecmd("quit"))
+        await storage.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
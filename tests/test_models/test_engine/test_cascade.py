@@ -0,0 +1,131 @@
+#!/usr/bin/python3
+"""This module defines unit test for the cascade deletions of the
+storages
+"""
+import json
+import os
+import unittest
+from unittest import mock
+from models import storage
+from models.engine import cascade
+from models.engine.db_storage import DBStorage
+from models.engine.file_storage import FileStorage
+from models.state import State
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.user import User
+
+
+class Test_cascade(unittest.TestCase):
+    """tests for the deletion of the objects depending on an object"""
+    def setUp(self):
+        self.temp_file_path = "airbnb_cascade.json"
+        self.s_instance = self.storage()
+        self.user = User()
+        self.author = User()
+        self.states = [State(), State()]
+        self.cities = [City(state_id=state.id) for state in self.states]
+        self.places = [Place(city_id=city.id, user_id=self.user.id)
+                       for city in self.cities]
+        self.reviews = [Review(place_id=place.id, user_id=self.author.id)
+                        for place in self.places for n in range(2)]
+        for obj in ([self.user, self.author] + self.states + self.cities +
+                    self.places + self.reviews):
+            self.s_instance.new(obj)
+        self.s_instance.save()
+
+    def tearDown(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        storage._FileStorage__fragments.clear()
+        if os.path.exists(self.temp_file_path):
+            os.remove(self.temp_file_path)
+
+    def storage(self):
+        s_instance = FileStorage()
+        s_instance._FileStorage__file_path = self.temp_file_path
+        return s_instance
+
+    def stored(self, cls):
+        return list(self.s_instance.all(cls).values())
+
+    def test_cascade(self):
+        deleted = self.s_instance.destroy(self.states[0])
+        self.assertCountEqual(deleted, [self.states[0], self.cities[0],
+                                        self.places[0]] + self.reviews[:2])
+        self.assertIs(deleted[0], self.states[0])
+        self.assertListEqual(self.stored(State), [self.states[1]])
+        self.assertListEqual(self.stored(City), [self.cities[1]])
+        self.assertListEqual(self.stored(Place), [self.places[1]])
+        self.assertCountEqual(self.stored(Review), self.reviews[2:])
+
+    def test_restrict(self):
+        with self.assertRaises(ValueError) as error:
+            self.s_instance.destroy(self.user)
+        self.assertIn("User." + self.user.id, str(error.exception))
+        self.assertEqual(self.s_instance.count(User), 2)
+        self.assertEqual(self.s_instance.count(Place), 2)
+        self.s_instance.destroy(self.cities[0])
+        self.assertRaises(ValueError, self.s_instance.destroy, self.user)
+        self.s_instance.destroy(self.cities[1])
+        self.assertListEqual(self.s_instance.destroy(self.user),
+                             [self.user])
+
+    def test_set_null(self):
+        self.assertListEqual(self.s_instance.destroy(self.author),
+                             [self.author])
+        self.assertEqual(self.s_instance.count(Review), 4)
+        for review in self.stored(Review):
+            self.assertIsNone(review.user_id)
+        self.assertListEqual(
+            self.s_instance.find(Review, user_id=self.author.id), [])
+
+    def test_plan_changes_nothing(self):
+        deleted, cleared = cascade.plan(self.s_instance, self.author)
+        self.assertListEqual(deleted, [self.author])
+        self.assertCountEqual(cleared, [(review, "user_id")
+                                        for review in self.reviews])
+        self.assertEqual(self.reviews[0].user_id, self.author.id)
+        deleted, cleared = cascade.plan(self.s_instance, self.places[0])
+        self.assertListEqual(cleared, [])
+        self.assertEqual(self.s_instance.count(), 12)
+
+    def test_unknown_rule(self):
+        with mock.patch.object(City, "foreign_keys",
+                               (("state_id", "State", "ignore"),)):
+            self.assertRaises(ValueError, self.s_instance.destroy,
+                              self.states[0])
+        self.assertEqual(self.s_instance.count(), 12)
+
+    def test_saved_once(self):
+        with mock.patch.object(FileStorage, "_FileStorage__write") as write:
+            self.s_instance.destroy(self.states[0])
+        write.assert_called_once()
+        self.s_instance.save()
+        with open(self.temp_file_path) as file:
+            keys = json.load(file)
+        self.assertEqual(len(keys), 7)
+        self.assertNotIn("State." + self.states[0].id, keys)
+        self.assertNotIn("Review." + self.reviews[0].id, keys)
+
+
+class Test_cascade_db(Test_cascade):
+    """tests for the cascade deletions of the DBStorage"""
+    def storage(self):
+        s_instance = DBStorage(":memory:")
+        s_instance.reload()
+        return s_instance
+
+    def tearDown(self):
+        self.s_instance.close()
+
+    def test_saved_once(self):
+        self.s_instance.destroy(self.states[0])
+        self.s_instance.reload()
+        self.assertEqual(self.s_instance.count(), 7)
+        self.assertIsNone(self.s_instance.get(State, self.states[0].id))
+
+
+if __name__ == "__main__":
+    unittest.main()
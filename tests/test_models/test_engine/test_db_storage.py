@@ -0,0 +1,157 @@
+#!/usr/bin/python3
+"""This module defines unit test for DBStorage class"""
+import unittest
+import sqlite3
+import os
+from models.engine.db_storage import DBStorage
+from models.user import User
+from models.city import City
+from models.place import Place
+
+
+class Test_DBStorage(unittest.TestCase):
+    """tests for the SQLite backed DBStorage class"""
+    def setUp(self):
+        self.temp_file_path = "airbnb_test.db"
+        self.s_instance = DBStorage(self.temp_file_path)
+        self.s_instance.reload()
+
+    def tearDown(self):
+        self.s_instance.close()
+        if os.path.exists(self.temp_file_path):
+            os.remove(self.temp_file_path)
+
+    def reopen(self):
+        self.s_instance.close()
+        self.s_instance = DBStorage(self.temp_file_path)
+        self.s_instance.reload()
+
+    def test_new_save_and_get(self):
+        user = User()
+        user.email = "a@b.c"
+        self.s_instance.new(user)
+        self.s_instance.save()
+        self.assertIs(self.s_instance.get(User, user.id), user)
+        self.reopen()
+        stored = self.s_instance.get("User", user.id)
+        self.assertIsNot(stored, user)
+        self.assertDictEqual(stored.to_dict(), user.to_dict())
+        self.assertIs(self.s_instance.get(None, user.id), stored)
+        self.assertIsNone(self.s_instance.get(City, user.id))
+        self.assertIsNone(self.s_instance.get("Unknown", user.id))
+
+    def test_round_trip_of_extra_and_list_attributes(self):
+        place = Place()
+        place.amenity_ids = ["a1", "a2"]
+        place.price_by_night = 120
+        place.latitude = 12.5
+        place.nickname = "home"
+        place.rating = None
+        self.s_instance.new(place)
+        self.s_instance.save()
+        self.reopen()
+        stored = self.s_instance.get(Place, place.id)
+        self.assertDictEqual(stored.to_dict(), place.to_dict())
+        self.assertNotIn("name", stored.__dict__)
+
+    def test_round_trip_of_values_of_another_type(self):
+        place = Place()
+        place.name = 5
+        place.latitude = 3
+        place.max_guest = True
+        self.s_instance.new(place)
+        self.s_instance.save()
+        self.reopen()
+        stored = self.s_instance.get(Place, place.id)
+        self.assertDictEqual(stored.to_dict(), place.to_dict())
+        self.assertIs(type(stored.name), int)
+        self.assertIs(type(stored.latitude), int)
+        self.assertIs(stored.max_guest, True)
+        self.assertListEqual(self.s_instance.find(Place, name=5), [stored])
+        self.assertListEqual(self.s_instance.find(Place, name="5"), [])
+        self.assertListEqual(self.s_instance.find(Place, latitude=3.0),
+                             [stored])
+
+    def test_all_and_count(self):
+        users = [User() for n in range(3)]
+        for instance in users + [City()]:
+            self.s_instance.new(instance)
+        self.s_instance.save()
+        self.reopen()
+        self.assertListEqual(sorted(self.s_instance.all(User).keys()),
+                             sorted("User." + user.id for user in users))
+        self.assertEqual(len(self.s_instance.all()), 4)
+        self.assertEqual(self.s_instance.count(User), 3)
+        self.assertEqual(self.s_instance.count(), 4)
+        self.assertEqual(self.s_instance.count("Unknown"), 0)
+
+    def test_find(self):
+        city1 = City(state_id="s1")
+        city2 = City(state_id="s2")
+        city1.name = "Zomba"
+        for instance in (city1, city2):
+            self.s_instance.new(instance)
+        self.assertListEqual(self.s_instance.find(City, state_id="s1"),
+                             [city1])
+        self.assertListEqual(
+            self.s_instance.find(City, state_id="s1", name="Blantyre"), [])
+
+    def test_delete(self):
+        user = User()
+        self.s_instance.new(user)
+        self.s_instance.save()
+        self.s_instance.delete(user)
+        self.s_instance.save()
+        self.reopen()
+        self.assertIsNone(self.s_instance.get(User, user.id))
+        self.assertEqual(self.s_instance.count(User), 0)
+
+    def test_uncommitted_changes_are_not_visible(self):
+        user = User()
+        self.s_instance.new(user)
+        other = sqlite3.connect(self.temp_file_path)
+        count = other.execute('SELECT COUNT(*) FROM "User"').fetchone()[0]
+        other.close()
+        self.assertEqual(count, 0)
+        self.reopen()
+        self.assertIsNone(self.s_instance.get(User, user.id))
+
+    def test_indexed_columns(self):
+        connection = sqlite3.connect(self.temp_file_path)
+        indexes = [row[1] for row in
+                   connection.execute('PRAGMA index_list("Review")')]
+        connection.close()
+        self.assertIn("Review_place_id", indexes)
+        self.assertIn("Review_user_id", indexes)
+
+    def test_transaction_commits_once(self):
+        users = [User() for n in range(3)]
+        with self.s_instance.transaction():
+            for user in users:
+                self.s_instance.new(user)
+                self.s_instance.save()
+            other = sqlite3.connect(self.temp_file_path)
+            count = other.execute('SELECT COUNT(*) FROM "User"').fetchone()
+            other.close()
+            self.assertEqual(count[0], 0)
+        self.reopen()
+        self.assertEqual(self.s_instance.count(User), 3)
+
+    def test_transaction_rollback(self):
+        user = User()
+        self.s_instance.new(user)
+        self.s_instance.save()
+        with self.assertRaises(ValueError):
+            with self.s_instance.transaction():
+                user.email = "changed"
+                self.s_instance.new(user)
+                self.s_instance.new(City())
+                raise ValueError("failure")
+        self.assertEqual(self.s_instance.count(City), 0)
+        stored = self.s_instance.get(User, user.id)
+        self.assertIsNot(stored, user)
+        self.assertEqual(stored.email, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,9 +3,23 @@
 import unittest
 import json
 import os
+import subprocess
+import sys
+import tempfile
+import threading
+from unittest import mock
+from datetime import datetime
+import models
 from models import storage
 from models.engine.file_storage import FileStorage
+from models.engine import locks
+from models.engine import parallel
 from models.base_model import BaseModel
+from models.user import User
+from models.state import State
+from models.city import City
+from models.place import Place
+from models.review import Review
 
 
 class Test_FileStorage(unittest.TestCase):
@@ -21,17 +35,17 @@ class Test_FileStorage(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
-        all_objs = list(storage.all().keys())
-        for obj_id in all_objs:
-            del storage._FileStorage__objects[obj_id]
+        all_objs = list(storage.all().values())
+        for obj in all_objs:
+            storage.delete(obj)
             storage.save()
         if os.path.exists(cls.temp_file_path):
             os.remove(cls.temp_file_path)
 
     def tearDown(self):
-        all_objs = list(storage.all().keys())
-        for obj_id in all_objs:
-            del storage._FileStorage__objects[obj_id]
+        all_objs = list(storage.all().values())
+        for obj in all_objs:
+            storage.delete(obj)
             storage.save()
 
     def test_Initialization_and_Reload_empty_file(self):
@@ -47,6 +61,13 @@ class Test_FileStorage(unittest.TestCase):
         self.assertEqual(return_value, {})
         self.assertEqual(type(return_value), dict)
 
+    def test_reload_blank_file(self):
+        open(self.temp_file_path, "w").close()
+        s_instance = FileStorage()
+        s_instance._FileStorage__file_path = self.temp_file_path
+        s_instance.reload()
+        self.assertEqual(s_instance.all(), {})
+
     def test_all_empty_store(self):
         store_instance = FileStorage()
         stored = store_instance.all()
@@ -189,5 +210,1141 @@ class Test_FileStorage(unittest.TestCase):
         instance = BaseModel()
 
 
+class Test_FileStorage_journal(unittest.TestCase):
+    """tests for the append-only journal mode of the FileStorage class"""
+    def setUp(self):
+        self.temp_file_path = "airbnb_journal.json"
+        self.s_instance = FileStorage(journal=True, journal_limit=3)
+        self.s_instance._FileStorage__file_path = self.temp_file_path
+
+    def tearDown(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        for path in (self.temp_file_path, self.temp_file_path + ".journal"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def read_journal(self):
+        with open(self.temp_file_path + ".journal", "r") as file:
+            return [json.loads(line) for line in file]
+
+    def test_save_appends_only_changed_objects(self):
+        instance1 = BaseModel()
+        instance2 = BaseModel()
+        self.s_instance.new(instance1)
+        self.s_instance.new(instance2)
+        self.s_instance.save()
+        instance2.name = "changed"
+        self.s_instance.new(instance2)
+        self.s_instance.save()
+        entries = self.read_journal()
+        self.assertEqual(len(entries), 3)
+        self.assertEqual(entries[-1]["key"], "BaseModel." + instance2.id)
+        self.assertEqual(entries[-1]["value"]["name"], "changed")
+        self.assertFalse(os.path.exists(self.temp_file_path))
+
+    def test_reload_replays_journal(self):
+        instance1 = BaseModel()
+        instance2 = BaseModel()
+        self.s_instance.new(instance1)
+        self.s_instance.new(instance2)
+        self.s_instance.save()
+        self.s_instance.delete(instance1)
+        instance2.name = "changed"
+        self.s_instance.new(instance2)
+        self.s_instance.save()
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        self.s_instance.reload()
+        stored = self.s_instance.all()
+        self.assertNotIn("BaseModel." + instance1.id, stored)
+        self.assertEqual(stored["BaseModel." + instance2.id].name, "changed")
+
+    def test_compaction_past_journal_limit(self):
+        for n in range(4):
+            self.s_instance.new(BaseModel())
+            self.s_instance.save()
+        self.assertFalse(os.path.exists(self.temp_file_path + ".journal"))
+        with open(self.temp_file_path, "r") as file:
+            self.assertEqual(len(json.load(file)), 4)
+        instance = BaseModel()
+        self.s_instance.new(instance)
+        self.s_instance.save()
+        self.assertEqual(len(self.read_journal()), 1)
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        self.s_instance.reload()
+        self.assertEqual(len(self.s_instance.all()), 5)
+
+    def test_reload_ignores_torn_last_entry(self):
+        instance = BaseModel()
+        self.s_instance.new(instance)
+        self.s_instance.save()
+        with open(self.temp_file_path + ".journal", "a") as file:
+            file.write('{"key": "BaseModel.1234", "val')
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        self.s_instance.reload()
+        self.assertEqual(list(self.s_instance.all().keys()),
+                         ["BaseModel." + instance.id])
+
+    def test_delete_method(self):
+        instance = BaseModel()
+        self.s_instance.new(instance)
+        self.s_instance.delete(instance)
+        self.assertNotIn("BaseModel." + instance.id, self.s_instance.all())
+        self.s_instance.delete(None)
+
+
+class Test_FileStorage_index(unittest.TestCase):
+    """tests for the per-class and id lookups of the FileStorage class"""
+    def setUp(self):
+        self.s_instance = FileStorage()
+
+    def tearDown(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+
+    def test_get_by_class_and_id(self):
+        instance = User()
+        self.s_instance.new(instance)
+        self.assertIs(self.s_instance.get(User, instance.id), instance)
+        self.assertIs(self.s_instance.get("User", instance.id), instance)
+        self.assertIs(self.s_instance.get(None, instance.id), instance)
+        self.assertIsNone(self.s_instance.get(BaseModel, instance.id))
+        self.assertIsNone(self.s_instance.get(User, "1234"))
+
+    def test_all_and_count_by_class(self):
+        users = [User() for n in range(3)]
+        for instance in users + [BaseModel()]:
+            self.s_instance.new(instance)
+        stored = self.s_instance.all(User)
+        self.assertListEqual(list(stored.keys()),
+                             ["User." + user.id for user in users])
+        self.assertEqual(self.s_instance.count(User), 3)
+        self.assertEqual(self.s_instance.count("BaseModel"), 1)
+        self.assertEqual(self.s_instance.count(), 4)
+        self.assertEqual(self.s_instance.count("State"), 0)
+
+    def test_delete_updates_index(self):
+        instance = User()
+        self.s_instance.new(instance)
+        self.s_instance.delete(instance)
+        self.assertIsNone(self.s_instance.get(User, instance.id))
+        self.assertIsNone(self.s_instance.get(None, instance.id))
+        self.assertEqual(self.s_instance.count(User), 0)
+
+    def test_index_follows_replaced_objects(self):
+        instance = User()
+        self.s_instance.new(instance)
+        other = User(**instance.to_dict())
+        self.s_instance.new(other)
+        self.assertIs(self.s_instance.get(User, instance.id), other)
+        self.assertIs(self.s_instance.get(None, instance.id), other)
+        self.assertEqual(self.s_instance.count(User), 1)
+
+
+class Test_FileStorage_find(unittest.TestCase):
+    """tests for the attribute indexes and find() of the FileStorage class"""
+    def setUp(self):
+        self.s_instance = FileStorage()
+
+    def tearDown(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+
+    def test_find_uses_declared_index(self):
+        state1 = State()
+        state2 = State()
+        cities = [City(state_id=state1.id), City(state_id=state2.id),
+                  City(state_id=state1.id)]
+        for instance in cities:
+            self.s_instance.new(instance)
+        found = self.s_instance.find(City, state_id=state1.id)
+        self.assertListEqual(found, [cities[0], cities[2]])
+        self.assertListEqual(self.s_instance.find("City", state_id="x"), [])
+
+    def test_find_follows_updates_and_deletes(self):
+        place = Place()
+        review1 = Review(place_id=place.id)
+        review2 = Review(place_id=place.id)
+        self.s_instance.new(review1)
+        self.s_instance.new(review2)
+        review1.place_id = "elsewhere"
+        self.s_instance.new(review1)
+        self.s_instance.delete(review2)
+        self.assertListEqual(self.s_instance.find(Review, place_id=place.id),
+                             [])
+        self.assertListEqual(
+            self.s_instance.find(Review, place_id="elsewhere"), [review1])
+
+    def test_find_with_several_attributes(self):
+        review1 = Review(place_id="p1", user_id="u1")
+        review2 = Review(place_id="p1", user_id="u2")
+        self.s_instance.new(review1)
+        self.s_instance.new(review2)
+        self.assertListEqual(
+            self.s_instance.find(Review, place_id="p1", user_id="u2"),
+            [review2])
+        self.assertListEqual(
+            self.s_instance.find(Review, place_id="p1", text=""),
+            [review1, review2])
+
+    def test_find_without_index_and_add_index(self):
+        user = User()
+        user.email = "a@b.c"
+        self.s_instance.new(user)
+        self.assertListEqual(self.s_instance.find(User, email="a@b.c"),
+                             [user])
+        self.s_instance.add_index(User, "email")
+        self.assertIn("email",
+                      self.s_instance._FileStorage__indexes_for("User"))
+        self.assertListEqual(self.s_instance.find(User, email="a@b.c"),
+                             [user])
+        self.assertListEqual(self.s_instance.find(User, email=["x"]), [])
+
+    def test_find_remembers_results(self):
+        state = State()
+        city1 = City(state_id=state.id)
+        city2 = City(state_id=state.id)
+        self.s_instance.new(city1)
+        self.s_instance.new(city2)
+        self.assertListEqual(self.s_instance.find(City, state_id=state.id),
+                             [city1, city2])
+        with mock.patch.object(FileStorage, "get") as get:
+            found = self.s_instance.find(City, state_id=state.id)
+            get.assert_not_called()
+        self.assertListEqual(found, [city1, city2])
+        found.clear()
+        self.assertListEqual(self.s_instance.find(City, state_id=state.id),
+                             [city1, city2])
+
+    def test_remembered_results_follow_changes(self):
+        state = State()
+        city1 = City(state_id=state.id)
+        self.s_instance.new(city1)
+        self.assertListEqual(self.s_instance.find(City, state_id=state.id),
+                             [city1])
+        city2 = City(state_id=state.id)
+        self.s_instance.new(city2)
+        self.assertListEqual(self.s_instance.find(City, state_id=state.id),
+                             [city1, city2])
+        city1.state_id = "other"
+        self.assertListEqual(self.s_instance.find(City, state_id=state.id),
+                             [city2])
+        self.s_instance.new(city1)
+        self.assertListEqual(self.s_instance.find(City, state_id="other"),
+                             [city1])
+        self.s_instance.delete(city2)
+        self.assertListEqual(self.s_instance.find(City, state_id=state.id),
+                             [])
+        copy = City(**city1.to_dict())
+        self.s_instance.new(copy)
+        found = self.s_instance.find(City, state_id="other")
+        self.assertEqual(len(found), 1)
+        self.assertIs(found[0], copy)
+
+
+class Test_FileStorage_lazy(unittest.TestCase):
+    """tests for the lazy reload mode of the FileStorage class"""
+    def setUp(self):
+        self.temp_file_path = "airbnb_lazy.json"
+        self.s_instance = FileStorage(lazy=True)
+        self.s_instance._FileStorage__file_path = self.temp_file_path
+        self.state = State()
+        self.cities = [City(state_id=self.state.id) for n in range(3)]
+        data = {}
+        for instance in [self.state] + self.cities:
+            key = type(instance).__name__ + "." + instance.id
+            data[key] = instance.to_dict()
+        with open(self.temp_file_path, "w") as file:
+            json.dump(data, file)
+        self.clear()
+        self.s_instance.reload()
+
+    def tearDown(self):
+        self.clear()
+        if os.path.exists(self.temp_file_path):
+            os.remove(self.temp_file_path)
+
+    def clear(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        storage._FileStorage__pending.clear()
+
+    def test_reload_does_not_instantiate(self):
+        self.assertDictEqual(self.s_instance._FileStorage__objects, {})
+        self.assertEqual(self.s_instance.count(City), 3)
+        self.assertEqual(self.s_instance.count(), 4)
+
+    def test_get_instantiates_one_object(self):
+        city = self.s_instance.get(City, self.cities[1].id)
+        self.assertIsInstance(city, City)
+        self.assertIsInstance(city.created_at, datetime)
+        self.assertEqual(city.state_id, self.state.id)
+        self.assertIs(self.s_instance.get(None, self.cities[1].id), city)
+        self.assertEqual(len(self.s_instance._FileStorage__objects), 1)
+        self.assertEqual(self.s_instance.count(City), 3)
+
+    def test_all_instantiates(self):
+        cities = self.s_instance.all(City)
+        self.assertEqual(len(cities), 3)
+        self.assertEqual(len(self.s_instance._FileStorage__objects), 3)
+        self.assertEqual(len(self.s_instance.all()), 4)
+
+    def test_find_on_pending_objects(self):
+        found = self.s_instance.find(City, state_id=self.state.id)
+        self.assertListEqual([city.id for city in found],
+                             [city.id for city in self.cities])
+        self.assertListEqual(self.s_instance.find(State, name=""),
+                             [self.s_instance.get(State, self.state.id)])
+
+    def test_save_keeps_pending_objects(self):
+        city = self.s_instance.get(City, self.cities[0].id)
+        city.name = "Lilongwe"
+        self.s_instance.new(city)
+        self.s_instance.save()
+        with open(self.temp_file_path, "r") as file:
+            data = json.load(file)
+        self.assertEqual(len(data), 4)
+        self.assertEqual(data["City." + city.id]["name"], "Lilongwe")
+        self.assertEqual(self.s_instance.count(City), 3)
+
+    def test_delete_pending_object(self):
+        city = self.s_instance.get(City, self.cities[0].id)
+        self.s_instance.delete(city)
+        self.assertEqual(self.s_instance.count(City), 2)
+        self.assertIsNone(self.s_instance.get(City, city.id))
+
+
+class Test_FileStorage_transaction(unittest.TestCase):
+    """tests for the transaction() context manager of the FileStorage"""
+    def setUp(self):
+        self.temp_file_path = "airbnb_transaction.json"
+        self.s_instance = FileStorage()
+        self.s_instance._FileStorage__file_path = self.temp_file_path
+
+    def tearDown(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        if os.path.exists(self.temp_file_path):
+            os.remove(self.temp_file_path)
+
+    def test_saves_once_at_the_end(self):
+        instances = [User() for n in range(3)]
+        with mock.patch.object(self.s_instance, "compact",
+                               wraps=self.s_instance.compact) as compact:
+            with self.s_instance.transaction():
+                for instance in instances:
+                    self.s_instance.new(instance)
+                    self.s_instance.save()
+                with self.s_instance.transaction():
+                    self.s_instance.save()
+                self.assertFalse(os.path.exists(self.temp_file_path))
+            self.assertEqual(compact.call_count, 1)
+        with open(self.temp_file_path, "r") as file:
+            self.assertEqual(len(json.load(file)), 3)
+
+    def test_nothing_to_save(self):
+        with self.s_instance.transaction():
+            pass
+        self.assertFalse(os.path.exists(self.temp_file_path))
+
+    def test_rollback_on_exception(self):
+        kept = User()
+        kept.first_name = "Betty"
+        removed = User()
+        self.s_instance.new(kept)
+        self.s_instance.new(removed)
+        self.s_instance.save()
+        added = User()
+        with self.assertRaises(KeyError):
+            with self.s_instance.transaction():
+                kept.first_name = "Holberton"
+                self.s_instance.new(kept)
+                self.s_instance.save()
+                self.s_instance.delete(removed)
+                self.s_instance.new(added)
+                raise KeyError("failure")
+        self.assertEqual(self.s_instance.get(User, kept.id).first_name,
+                         "Betty")
+        self.assertIsNotNone(self.s_instance.get(User, removed.id))
+        self.assertIsNone(self.s_instance.get(User, added.id))
+        with open(self.temp_file_path, "r") as file:
+            self.assertEqual(len(json.load(file)), 2)
+        self.s_instance.save()
+        with open(self.temp_file_path, "r") as file:
+            data = json.load(file)
+        self.assertEqual(data["User." + kept.id]["first_name"], "Betty")
+
+
+class Test_FileStorage_dirty(unittest.TestCase):
+    """tests for the serialization of the dirty objects only"""
+    def setUp(self):
+        self.temp_file_path = "airbnb_dirty.json"
+        self.s_instance = FileStorage()
+        self.s_instance._FileStorage__file_path = self.temp_file_path
+
+    def tearDown(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        storage._FileStorage__fragments.clear()
+        if os.path.exists(self.temp_file_path):
+            os.remove(self.temp_file_path)
+
+    def test_only_dirty_objects_are_serialized(self):
+        instances = [User() for n in range(3)]
+        for instance in instances:
+            self.s_instance.new(instance)
+        self.s_instance.save()
+        self.assertFalse(any(obj.is_dirty() for obj in instances))
+        instances[1].first_name = "Betty"
+        with mock.patch.object(User, "to_dict", autospec=True,
+                               side_effect=BaseModel.to_dict) as to_dict:
+            self.s_instance.save()
+        self.assertEqual(to_dict.call_count, 1)
+        self.assertIs(to_dict.call_args[0][0], instances[1])
+        with open(self.temp_file_path, "r") as file:
+            data = json.load(file)
+        self.assertEqual(len(data), 3)
+        self.assertEqual(data["User." + instances[1].id]["first_name"],
+                         "Betty")
+
+    def test_replaced_object_is_serialized(self):
+        instance = User()
+        self.s_instance.new(instance)
+        self.s_instance.save()
+        copy = User(**instance.to_dict())
+        copy.mark_clean()
+        copy.__dict__["first_name"] = "Betty"
+        self.s_instance.new(copy)
+        self.s_instance.save()
+        with open(self.temp_file_path, "r") as file:
+            data = json.load(file)
+        self.assertEqual(data["User." + instance.id]["first_name"], "Betty")
+
+    def test_changed_in_place_is_serialized(self):
+        place = Place()
+        place.amenity_ids = []
+        self.s_instance.new(place)
+        self.s_instance.save()
+        place.amenity_ids.append("wifi")
+        self.assertFalse(place.is_dirty())
+        self.s_instance.new(place)
+        self.s_instance.save()
+        self.s_instance.reload()
+        reloaded = self.s_instance.get(Place, place.id)
+        self.assertIsNot(reloaded, place)
+        self.assertEqual(reloaded.amenity_ids, ["wifi"])
+
+    def test_changed_while_serialized_stays_dirty(self):
+        instance = User()
+        self.s_instance.new(instance)
+
+        def to_dict(obj):
+            dictionary = BaseModel.to_dict(obj)
+            obj.first_name = "Betty"
+            return dictionary
+        with mock.patch.object(User, "to_dict", autospec=True,
+                               side_effect=to_dict):
+            self.s_instance.save()
+        self.assertTrue(instance.is_dirty())
+        self.s_instance.save()
+        with open(self.temp_file_path, "r") as file:
+            data = json.load(file)
+        self.assertEqual(data["User." + instance.id]["first_name"], "Betty")
+
+
+class Test_FileStorage_write(unittest.TestCase):
+    """tests for the atomic write and the background writer"""
+    def setUp(self):
+        self.temp_file_path = "airbnb_write.json"
+
+    def tearDown(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        storage._FileStorage__fragments.clear()
+        if os.path.exists(self.temp_file_path):
+            os.remove(self.temp_file_path)
+
+    def storage(self, **kwargs):
+        s_instance = FileStorage(**kwargs)
+        s_instance._FileStorage__file_path = self.temp_file_path
+        return s_instance
+
+    def test_failed_write_keeps_the_file(self):
+        s_instance = self.storage()
+        instance = User()
+        s_instance.new(instance)
+        s_instance.save()
+        with open(self.temp_file_path, "r") as file:
+            content = file.read()
+        instance.first_name = "Betty"
+        with mock.patch("os.fsync", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                s_instance.save()
+        with open(self.temp_file_path, "r") as file:
+            self.assertEqual(file.read(), content)
+        self.assertEqual([name for name in os.listdir(".")
+                          if name.startswith(self.temp_file_path)],
+                         [self.temp_file_path])
+        s_instance.save()
+        with open(self.temp_file_path, "r") as file:
+            data = json.load(file)
+        self.assertEqual(data["User." + instance.id]["first_name"], "Betty")
+
+    def test_saves_are_written_together(self):
+        s_instance = self.storage(flush_interval=60)
+        with mock.patch.object(s_instance, "compact",
+                               wraps=s_instance.compact) as compact:
+            for n in range(3):
+                s_instance.new(User())
+                s_instance.save()
+            self.assertEqual(compact.call_count, 0)
+            self.assertFalse(os.path.exists(self.temp_file_path))
+            s_instance.flush()
+            self.assertEqual(compact.call_count, 1)
+            s_instance.flush()
+            s_instance.close()
+            self.assertEqual(compact.call_count, 1)
+        with open(self.temp_file_path, "r") as file:
+            self.assertEqual(len(json.load(file)), 3)
+
+    def test_close_retries_failed_write(self):
+        s_instance = self.storage(flush_interval=60)
+        instance = User()
+        s_instance.new(instance)
+        s_instance.save()
+        with mock.patch("os.fsync", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                s_instance.flush()
+        self.assertIsNone(s_instance._FileStorage__timer)
+        self.assertFalse(os.path.exists(self.temp_file_path))
+        s_instance.close()
+        with open(self.temp_file_path, "r") as file:
+            self.assertIn("User." + instance.id, json.load(file))
+
+    def test_background_thread_writes(self):
+        s_instance = self.storage(flush_interval=0.01)
+        instance = User()
+        s_instance.new(instance)
+        s_instance.save()
+        timer = s_instance._FileStorage__timer
+        timer.join(5)
+        self.assertFalse(timer.is_alive())
+        self.assertIsNone(s_instance._FileStorage__timer)
+        with open(self.temp_file_path, "r") as file:
+            self.assertIn("User." + instance.id, json.load(file))
+
+
+class Test_FileStorage_sharded(unittest.TestCase):
+    """tests for the sharded mode of the FileStorage class"""
+    def setUp(self):
+        self.temp_file_path = "airbnb_sharded.json"
+        self.clear()
+
+    def tearDown(self):
+        self.clear()
+        for name in os.listdir("."):
+            if name.startswith("airbnb_sharded."):
+                os.remove(name)
+
+    def clear(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        storage._FileStorage__pending.clear()
+        storage._FileStorage__fragments.clear()
+        storage._FileStorage__by_class.clear()
+        storage._FileStorage__ids.clear()
+
+    def storage(self, **kwargs):
+        s_instance = FileStorage(sharded=True, **kwargs)
+        s_instance._FileStorage__file_path = self.temp_file_path
+        return s_instance
+
+    def test_one_file_per_class(self):
+        s_instance = self.storage()
+        user = User()
+        place = Place()
+        for instance in (user, place):
+            s_instance.new(instance)
+        s_instance.save()
+        self.assertFalse(os.path.exists(self.temp_file_path))
+        with open("airbnb_sharded.User.json", "r") as file:
+            self.assertEqual(list(json.load(file)), ["User." + user.id])
+        with open("airbnb_sharded.Place.json", "r") as file:
+            self.assertEqual(list(json.load(file)), ["Place." + place.id])
+
+    def test_only_changed_shards_are_written(self):
+        s_instance = self.storage()
+        user = User()
+        s_instance.new(user)
+        s_instance.new(Place())
+        s_instance.save()
+        with mock.patch.object(s_instance, "_FileStorage__write_file",
+                               wraps=s_instance._FileStorage__write_file
+                               ) as write_file:
+            user.first_name = "Betty"
+            s_instance.save()
+            paths = [call[0][0] for call in write_file.call_args_list]
+            self.assertEqual(paths, ["airbnb_sharded.User.json"])
+            write_file.reset_mock()
+            s_instance.save()
+            self.assertEqual(write_file.call_count, 0)
+            s_instance.delete(user)
+            s_instance.save()
+            self.assertEqual(write_file.call_count, 1)
+        with open("airbnb_sharded.User.json", "r") as file:
+            self.assertEqual(json.load(file), {})
+
+    def test_classes_are_read_on_demand(self):
+        s_instance = self.storage()
+        user = User()
+        place = Place(name="Home")
+        for instance in (user, place):
+            s_instance.new(instance)
+        s_instance.save()
+        self.clear()
+        s_instance = self.storage()
+        s_instance.reload()
+        self.assertEqual(len(storage._FileStorage__objects), 0)
+        self.assertEqual(s_instance.get(Place, place.id).name, "Home")
+        self.assertNotIn("User." + user.id, storage._FileStorage__objects)
+        self.assertEqual(s_instance.count(), 2)
+        self.assertIsNotNone(s_instance.get(None, user.id))
+
+    def test_new_object_of_unread_class_keeps_the_others(self):
+        s_instance = self.storage()
+        user = User()
+        s_instance.new(user)
+        s_instance.save()
+        self.clear()
+        s_instance = self.storage()
+        s_instance.reload()
+        s_instance.new(User())
+        s_instance.save()
+        with open("airbnb_sharded.User.json", "r") as file:
+            self.assertIn("User." + user.id, json.load(file))
+
+    def test_buckets(self):
+        s_instance = self.storage(buckets=4)
+        users = [User() for n in range(40)]
+        for user in users:
+            s_instance.new(user)
+        s_instance.save()
+        stored = {}
+        for bucket in range(4):
+            with open("airbnb_sharded.User.{}.json".format(bucket)) as file:
+                data = json.load(file)
+            self.assertTrue(data)
+            stored.update(data)
+        self.assertEqual(len(stored), 40)
+        self.clear()
+        s_instance = self.storage(buckets=4)
+        s_instance.reload()
+        self.assertEqual(s_instance.count(User), 40)
+        self.assertEqual(s_instance.get(User, users[7].id).id, users[7].id)
+
+    def test_transaction_rollback(self):
+        s_instance = self.storage()
+        user = User(first_name="Betty")
+        s_instance.new(user)
+        s_instance.save()
+        with self.assertRaises(ValueError):
+            with s_instance.transaction():
+                user.first_name = "Holberton"
+                s_instance.new(user)
+                s_instance.save()
+                raise ValueError
+        self.assertEqual(s_instance.get(User, user.id).first_name, "Betty")
+
+    def test_journal_is_refused(self):
+        with self.assertRaises(ValueError):
+            FileStorage(journal=True, sharded=True)
+
+
+class Test_FileStorage_shared(unittest.TestCase):
+    """tests for a file shared by several processes"""
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_file_path = os.path.join(self.temp_dir.name,
+                                           "airbnb_shared.json")
+        self.s_instance = FileStorage(shared=True)
+        self.s_instance._FileStorage__file_path = self.temp_file_path
+        self.user = User(first_name="Betty")
+        self.s_instance.new(self.user)
+        self.s_instance.save()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def other_process(self, code, storage=True):
+        script = code
+        if storage:
+            script = ("from models.engine.file_storage import FileStorage\n"
+                      "from models.user import User\n"
+                      "storage = FileStorage(shared=True)\n"
+                      "storage._FileStorage__file_path = {!r}\n"
+                      "storage.reload()\n".format(self.temp_file_path) +
+                      code)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(
+            models.__file__)))
+        return subprocess.run([sys.executable, "-c", script],
+                              cwd=self.temp_dir.name, timeout=60,
+                              env=dict(os.environ, PYTHONPATH=root)
+                              ).returncode
+
+    def test_objects_are_kept_apart(self):
+        instance = BaseModel()
+        storage.new(instance)
+        self.assertIsNone(self.s_instance.get(BaseModel, instance.id))
+        self.assertIsNone(storage.get(User, self.user.id))
+        storage.delete(instance)
+
+    def test_refresh_reads_the_other_process_changes(self):
+        self.assertFalse(self.s_instance.refresh())
+        self.other_process("user = User(id='other', created_at="
+                           "'2023-08-14T04:33:39.418067', updated_at="
+                           "'2023-08-14T04:33:39.418067')\n"
+                           "storage.new(user)\n"
+                           "storage.save()\n")
+        self.assertTrue(self.s_instance.refresh())
+        self.assertFalse(self.s_instance.refresh())
+        self.assertIsNotNone(self.s_instance.get(User, "other"))
+        self.other_process("storage.delete(storage.get(User, 'other'))\n"
+                           "storage.save()\n")
+        self.assertTrue(self.s_instance.refresh())
+        self.assertIsNone(self.s_instance.get(User, "other"))
+        self.assertIs(self.s_instance.get(User, self.user.id), self.user)
+
+    def test_unsaved_changes_are_kept(self):
+        self.user.first_name = "Holberton"
+        self.other_process("user = storage.get(User, {!r})\n"
+                           "user.first_name = 'Other'\n"
+                           "storage.new(user)\n"
+                           "storage.save()\n".format(self.user.id))
+        self.assertTrue(self.s_instance.refresh())
+        self.assertIs(self.s_instance.get(User, self.user.id), self.user)
+        self.assertEqual(self.user.first_name, "Holberton")
+
+    def test_save_merges_the_other_process_changes(self):
+        self.other_process("storage.new(User(first_name='Other'))\n"
+                           "storage.save()\n")
+        mine = User(first_name="Mine")
+        self.s_instance.new(mine)
+        self.s_instance.save()
+        with open(self.temp_file_path, "r") as file:
+            names = sorted(value.get("first_name")
+                           for value in json.load(file).values())
+        self.assertEqual(names, ["Betty", "Mine", "Other"])
+
+    @unittest.skipIf(locks.fcntl is None, "fcntl isn't available")
+    def test_the_file_is_locked_while_written(self):
+        code = ("import fcntl\n"
+                "file = open({!r}, 'a')\n"
+                "try:\n"
+                "    fcntl.flock(file, fcntl.LOCK_SH | fcntl.LOCK_NB)\n"
+                "except BlockingIOError:\n"
+                "    exit(3)\n".format(self.temp_file_path + ".lock"))
+        with self.s_instance._FileStorage__locked():
+            with self.s_instance._FileStorage__locked(False):
+                self.assertEqual(self.other_process(code, False), 3)
+        self.assertEqual(self.other_process(code, False), 0)
+
+
+class Test_FileStorage_threads(unittest.TestCase):
+    """tests for the FileStorage used by several threads"""
+    def setUp(self):
+        self.temp_file_path = "airbnb_threads.json"
+        self.s_instance = FileStorage(thread_safe=True)
+        self.s_instance._FileStorage__file_path = self.temp_file_path
+
+    def tearDown(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        storage._FileStorage__fragments.clear()
+        if os.path.exists(self.temp_file_path):
+            os.remove(self.temp_file_path)
+
+    def test_all_returns_a_copy(self):
+        user = User()
+        self.s_instance.new(user)
+        stored = self.s_instance.all()
+        self.s_instance.delete(user)
+        self.assertIn("User." + user.id, stored)
+        self.assertNotIn("User." + user.id, self.s_instance.all())
+
+    def test_lookups_while_saving(self):
+        user = User()
+        self.s_instance.new(user)
+        writing = threading.Event()
+        written = threading.Event()
+        write_file = self.s_instance._FileStorage__write_file
+
+        def slow_write(path, data):
+            writing.set()
+            written.wait(5)
+            write_file(path, data)
+
+        with mock.patch.object(self.s_instance, "_FileStorage__write_file",
+                               slow_write):
+            thread = threading.Thread(target=self.s_instance.save)
+            thread.start()
+            self.assertTrue(writing.wait(5))
+            self.assertIs(self.s_instance.get(User, user.id), user)
+            other = User()
+            self.s_instance.new(other)
+            written.set()
+            thread.join(5)
+        with open(self.temp_file_path, "r") as file:
+            data = json.load(file)
+        self.assertIn("User." + user.id, data)
+        self.assertNotIn("User." + other.id, data)
+        self.s_instance.save()
+        with open(self.temp_file_path, "r") as file:
+            self.assertIn("User." + other.id, json.load(file))
+
+    def test_concurrent_changes_and_saves(self):
+        errors = []
+
+        def work(count):
+            try:
+                for n in range(count):
+                    user = User()
+                    self.s_instance.new(user)
+                    if self.s_instance.get(User, user.id) is not user:
+                        errors.append(user.id)
+                    self.s_instance.count(User)
+                    self.s_instance.find(User, first_name="")
+                    if n % 10 == 0:
+                        self.s_instance.save()
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=work, args=(50,))
+                   for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+        self.assertEqual(errors, [])
+        self.s_instance.save()
+        with open(self.temp_file_path, "r") as file:
+            self.assertEqual(len(json.load(file)), 200)
+
+
+class Test_FileStorage_parallel(unittest.TestCase):
+    """tests for the reload of the FileStorage by several processes"""
+    def setUp(self):
+        self.temp_file_path = "airbnb_parallel.json"
+        self.clear()
+
+    def tearDown(self):
+        self.clear()
+        for name in os.listdir("."):
+            if name.startswith("airbnb_parallel."):
+                os.remove(name)
+
+    def clear(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        storage._FileStorage__pending.clear()
+        storage._FileStorage__fragments.clear()
+
+    def storage(self, **kwargs):
+        s_instance = FileStorage(**kwargs)
+        s_instance._FileStorage__file_path = self.temp_file_path
+        s_instance._FileStorage__parallel_threshold = 0
+        return s_instance
+
+    def saved(self, s_instance):
+        objects = [User(), Place(), Place(), State(), City(), Review()]
+        objects[1].name = "Lovely place"
+        objects[2].amenity_ids = ["a", "b"]
+        for obj in objects:
+            s_instance.new(obj)
+        s_instance.save()
+        self.clear()
+        return {type(obj).__name__ + "." + obj.id: obj.to_dict()
+                for obj in objects}
+
+    def reloaded(self, s_instance):
+        s_instance.reload()
+        return {key: obj.to_dict()
+                for key, obj in s_instance.all().items()}
+
+    def test_reload_by_ranges(self):
+        s_instance = self.storage(processes=2)
+        expected = self.saved(s_instance)
+        with mock.patch("models.engine.parallel.read_ranges",
+                        wraps=parallel.read_ranges) as read_ranges:
+            self.assertEqual(self.reloaded(s_instance), expected)
+        read_ranges.assert_called_once_with(self.temp_file_path, 2)
+        for obj in s_instance.all().values():
+            self.assertIsInstance(obj, BaseModel)
+
+    def test_file_not_one_object_per_line(self):
+        s_instance = self.storage(processes=2)
+        expected = self.saved(s_instance)
+        with open(self.temp_file_path, "w") as file:
+            json.dump(expected, file, indent=4)
+        self.assertEqual(self.reloaded(s_instance), expected)
+        with open(self.temp_file_path, "w") as file:
+            json.dump(expected, file)
+        self.clear()
+        self.assertEqual(self.reloaded(s_instance), expected)
+
+    def test_small_file_is_read_in_process(self):
+        s_instance = self.storage(processes=2)
+        s_instance._FileStorage__parallel_threshold = 1 << 30
+        expected = self.saved(s_instance)
+        with mock.patch("models.engine.parallel.run") as run:
+            self.assertEqual(self.reloaded(s_instance), expected)
+        run.assert_not_called()
+
+    def test_sharded_reload(self):
+        s_instance = self.storage(processes=2, sharded=True, buckets=2)
+        expected = self.saved(s_instance)
+        with mock.patch("models.engine.parallel.read_files",
+                        wraps=parallel.read_files) as read_files:
+            self.assertEqual(self.reloaded(s_instance), expected)
+        read_files.assert_called_once()
+        self.assertEqual(s_instance.count(Place), 2)
+
+
+class Test_FileStorage_range(unittest.TestCase):
+    """tests for the sorted indexes and range() of the FileStorage class"""
+    def setUp(self):
+        self.s_instance = FileStorage()
+        self.places = []
+        for n in range(20):
+            place = Place()
+            place.price_by_night = (n * 7) % 20
+            place.max_guest = n % 3
+            self.s_instance.new(place)
+            self.places.append(place)
+
+    def tearDown(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+
+    def by_price(self, places, reverse=False):
+        return sorted(places, key=lambda place: (place.price_by_night,
+                                                 place.id), reverse=reverse)
+
+    def test_range(self):
+        found = list(self.s_instance.range(Place, "price_by_night", 5, 9,
+                                           include_high=False))
+        self.assertEqual(found, self.by_price(
+            [place for place in self.places
+             if 5 <= place.price_by_night < 9]))
+        found = list(self.s_instance.range("Place", "price_by_night",
+                                           reverse=True))
+        self.assertEqual(found, self.by_price(self.places, True))
+
+    def test_range_read_by_parts(self):
+        self.s_instance._FileStorage__range_part = 3
+        found = self.s_instance.range(Place, "max_guest", low=1)
+        first = next(found)
+        place = Place()
+        place.max_guest = 2
+        self.s_instance.new(place)
+        self.s_instance.delete(self.places[2])
+        rest = list(found)
+        self.assertIn(place, rest)
+        self.assertNotIn(self.places[2], rest)
+        self.assertEqual([first] + rest, sorted(
+            [obj for obj in self.places + [place]
+             if obj.max_guest >= 1 and obj is not self.places[2]],
+            key=lambda obj: (obj.max_guest, obj.id)))
+
+    def test_index_follows_changes(self):
+        place = self.places[0]
+        place.price_by_night = 100
+        self.s_instance.new(place)
+        self.assertEqual(list(self.s_instance.range(
+            Place, "price_by_night", low=50)), [place])
+        place.price_by_night = None
+        self.s_instance.new(place)
+        self.assertEqual(list(self.s_instance.range(
+            Place, "price_by_night", low=50)), [])
+        self.assertIs(list(self.s_instance.range(
+            Place, "price_by_night"))[-1], place)
+        self.assertEqual(self.s_instance.find(Place, price_by_night=None),
+                         [place])
+        self.assertEqual(self.s_instance.find(Place, price_by_night=7),
+                         [self.places[1]])
+
+    def test_range_errors(self):
+        with self.assertRaises(ValueError):
+            self.s_instance.range(Place, "name")
+        with self.assertRaises(TypeError):
+            self.s_instance.range(Place, "price_by_night", low="1")
+        user = User()
+        user.age = 30
+        self.s_instance.new(user)
+        self.s_instance.add_index(User, "age", sorted=True)
+        self.assertEqual(list(self.s_instance.range(User, "age", 20)),
+                         [user])
+
+
+class Test_FileStorage_geo(unittest.TestCase):
+    """tests for the geospatial index and near() of the FileStorage class"""
+    def setUp(self):
+        self.s_instance = FileStorage()
+        self.paris = Place(latitude=48.8566, longitude=2.3522)
+        self.versailles = Place(latitude=48.8049, longitude=2.1204)
+        self.london = Place(latitude=51.5072, longitude=-0.1276)
+        for place in (self.paris, self.versailles, self.london):
+            self.s_instance.new(place)
+
+    def tearDown(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+
+    def test_near(self):
+        found = self.s_instance.near(48.86, 2.35, 30)
+        self.assertEqual([place for distance, place in found],
+                         [self.paris, self.versailles])
+        self.assertLess(found[0][0], 1)
+        self.assertAlmostEqual(found[1][0], 17.5, delta=0.5)
+        found = self.s_instance.near(48.86, 2.35, 400, Place)
+        self.assertEqual(len(found), 3)
+
+    def test_k_nearest(self):
+        found = self.s_instance.k_nearest(48.86, 2.35, 2)
+        self.assertEqual([place for distance, place in found],
+                         [self.paris, self.versailles])
+        found = self.s_instance.k_nearest(52, -1, 5)
+        self.assertEqual(len(found), 3)
+        self.assertIs(found[0][1], self.london)
+
+    def test_index_follows_changes(self):
+        self.paris.latitude = 40.4168
+        self.paris.longitude = -3.7038
+        self.s_instance.new(self.paris)
+        self.s_instance.delete(self.versailles)
+        self.assertEqual(self.s_instance.near(48.86, 2.35, 30), [])
+        found = self.s_instance.near(40.4, -3.7, 10)
+        self.assertEqual([place for distance, place in found], [self.paris])
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            self.s_instance.near(0, 0, 10, User)
+        with self.assertRaises(TypeError):
+            self.s_instance.near(0, 0, "10")
+
+
+class Test_FileStorage_having(unittest.TestCase):
+    """tests for the bitmap index and having() of the FileStorage class"""
+    def setUp(self):
+        self.s_instance = FileStorage()
+        self.places = [Place(amenity_ids=["wifi", "pool"]),
+                       Place(amenity_ids=["wifi"]), Place()]
+        for place in self.places:
+            self.s_instance.new(place)
+
+    def tearDown(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+
+    def test_having(self):
+        self.assertCountEqual(
+            self.s_instance.having(Place, "amenity_ids", ["wifi"]),
+            self.places[:2])
+        self.assertCountEqual(
+            self.s_instance.having("Place", "amenity_ids", ["wifi", "pool"]),
+            self.places[:1])
+        self.assertCountEqual(self.s_instance.having(
+            Place, "amenity_ids", any_of=["pool", "spa"]), self.places[:1])
+        with self.assertRaises(ValueError):
+            self.s_instance.having(Place, "city_id", ["wifi"])
+
+    def test_index_follows_changes(self):
+        place = self.places[2]
+        place.amenity_ids = ["pool"]
+        self.s_instance.new(place)
+        self.assertCountEqual(
+            self.s_instance.having(Place, "amenity_ids", ["pool"]),
+            [self.places[0], place])
+        place.amenity_ids.append("wifi")
+        self.s_instance.new(place)
+        self.s_instance.delete(self.places[0])
+        self.assertCountEqual(
+            self.s_instance.having(Place, "amenity_ids", ["wifi", "pool"]),
+            [place])
+        self.assertCountEqual(
+            self.s_instance.find(Place, amenity_ids=["wifi"]),
+            [self.places[1]])
+
+
+class Test_FileStorage_search(unittest.TestCase):
+    """tests for the text indexes and search() of the FileStorage class"""
+    def setUp(self):
+        self.temp_file_path = "airbnb_search.json"
+        self.s_instance = FileStorage()
+        self.s_instance._FileStorage__file_path = self.temp_file_path
+        self.cottage = Place(name="Cottage", description="Sea view, garden")
+        self.flat = Place(name="Flat", description="City view")
+        self.review = Review(text="Great sea view")
+        for obj in (self.cottage, self.flat, self.review):
+            self.s_instance.new(obj)
+
+    def tearDown(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        storage._FileStorage__fragments.clear()
+        for name in os.listdir("."):
+            if name.startswith(self.temp_file_path):
+                os.remove(name)
+
+    def forget_index(self, name, attributes):
+        del self.s_instance._FileStorage__attr_indexes[name][attributes]
+
+    def test_search(self):
+        self.assertCountEqual(self.s_instance.search(Place, "view"),
+                              [self.cottage, self.flat])
+        self.assertEqual(self.s_instance.search(Place, "SEA view"),
+                         [self.cottage])
+        self.assertEqual(self.s_instance.search("Review", "sea"),
+                         [self.review])
+        self.assertEqual(self.s_instance.search(Place, "gar", True),
+                         [self.cottage])
+        with self.assertRaises(ValueError):
+            self.s_instance.search(User, "view")
+
+    def test_index_follows_changes(self):
+        self.s_instance.search(Place, "view")
+        self.flat.description = "Sea front"
+        self.s_instance.new(self.flat)
+        self.s_instance.delete(self.cottage)
+        self.assertEqual(self.s_instance.search(Place, "sea"), [self.flat])
+        self.assertEqual(self.s_instance.search(Place, "view"), [])
+
+    def test_index_kept_by_close(self):
+        self.s_instance.search(Place, "view")
+        self.s_instance.save()
+        self.s_instance.close()
+        self.assertTrue(os.path.exists(self.temp_file_path + ".Place.text"))
+        self.forget_index("Place", ("name", "description"))
+        self.flat.description = "Sea front"
+        self.s_instance.new(self.flat)
+        other = Place(name="Barn")
+        self.s_instance.new(other)
+        self.s_instance.delete(self.cottage)
+        with mock.patch("models.engine.indexes._WORD") as word:
+            word.findall.side_effect = lambda text: text.split()
+            self.assertEqual(self.s_instance.search(Place, "sea"),
+                             [self.flat])
+        self.assertEqual(word.findall.call_count, 2 + 2 + 1)
+        self.assertEqual(self.s_instance.search(Place, "barn"), [other])
+        self.assertEqual(self.s_instance.search(Place, "garden"), [])
+
+    def test_invalid_index_file(self):
+        with open(self.temp_file_path + ".Place.text", "wb") as file:
+            file.write(b"not an index")
+        self.assertEqual(self.s_instance.search(Place, "city"), [self.flat])
+
+
 if __name__ == "__main__":
     unittest.main()
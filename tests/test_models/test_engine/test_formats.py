@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""This module defines unit test for the codecs of the FileStorage"""
+import io
+import json
+import os
+import unittest
+from models import storage
+from models.engine import formats
+from models.engine.file_storage import FileStorage
+from models.user import User
+
+
+class Test_codecs(unittest.TestCase):
+    """tests for the codecs of models.engine.formats"""
+    data = {"User.1": {"id": "1", "name": "Bétty \"quoted\""},
+            "City.2": {"id": "2", "ids": [1, 2.5, None, True]},
+            "State.3": {}}
+
+    def document(self, codec):
+        return codec.document((key, codec.fragment(value))
+                              for key, value in self.data.items())
+
+    def test_round_trip(self):
+        for name in formats.available():
+            codec = formats.get(name)
+            items = list(formats.read(io.BytesIO(self.document(codec))))
+            self.assertListEqual(items, list(self.data.items()), name)
+
+    def test_empty_document(self):
+        for name in formats.available():
+            codec = formats.get(name)
+            document = codec.document([])
+            self.assertListEqual(list(formats.read(io.BytesIO(document))),
+                                 [], name)
+
+    def test_json_codecs_write_json(self):
+        for name in ("json", "orjson"):
+            if name in formats.available():
+                document = self.document(formats.get(name))
+                self.assertDictEqual(json.loads(document), self.data)
+
+    def test_detect(self):
+        marshal = formats.get("marshal")
+        file = io.BytesIO(self.document(marshal))
+        self.assertEqual(formats.detect(file).name, "marshal")
+        self.assertEqual(file.read(1), b"{")
+        file = io.BytesIO(self.document(formats.get("json")))
+        self.assertEqual(formats.detect(file, marshal).name[-4:], "json")
+        self.assertEqual(file.read(1), b"{")
+        default = formats.get("json")
+        file.seek(0)
+        self.assertIs(formats.detect(file, default), default)
+
+    @unittest.skipIf("msgpack" not in formats.available(),
+                     "msgpack isn't installed")
+    def test_msgpack_large_map(self):
+        codec = formats.get("msgpack")
+        data = {str(n): {"n": n} for n in range(70000)}
+        document = codec.document((key, codec.fragment(value))
+                                  for key, value in data.items())
+        self.assertDictEqual(dict(formats.read(io.BytesIO(document))), data)
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            formats.get("yaml")
+        with self.assertRaises(ValueError):
+            FileStorage(codec="yaml")
+
+
+class Test_FileStorage_codec(unittest.TestCase):
+    """tests for the FileStorage writing with another codec"""
+    def setUp(self):
+        self.paths = ["airbnb_codec.json", "airbnb_codec.marshal"]
+
+    def tearDown(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        storage._FileStorage__fragments.clear()
+        for path in self.paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def storage(self, **kwargs):
+        s_instance = FileStorage(**kwargs)
+        s_instance._FileStorage__file_path = self.paths[0]
+        return s_instance
+
+    def test_save_and_reload(self):
+        s_instance = self.storage(codec="marshal")
+        user = User(first_name="Betty")
+        s_instance.new(user)
+        s_instance.save()
+        with open(self.paths[0], "rb") as file:
+            self.assertTrue(file.read().startswith(b"HBNB marshal\n"))
+        storage.delete(user)
+        self.storage().reload()
+        self.assertEqual(storage.get(User, user.id).first_name, "Betty")
+
+    def test_fragments_of_another_codec(self):
+        s_instance = self.storage()
+        s_instance.new(User())
+        s_instance.save()
+        self.storage(codec="marshal").save()
+        with open(self.paths[0], "rb") as file:
+            content = file.read()
+        self.assertTrue(content.startswith(b"HBNB marshal\n"))
+        with open(self.paths[0], "rb") as file:
+            self.assertEqual(len(list(formats.read(file))), 1)
+
+    def test_convert(self):
+        s_instance = self.storage()
+        for n in range(3):
+            s_instance.new(User())
+        s_instance.save()
+        self.assertEqual(formats.convert(self.paths[0], self.paths[1],
+                                         "marshal"), 3)
+        with open(self.paths[0], "rb") as file:
+            expected = list(formats.read(file))
+        with open(self.paths[1], "rb") as file:
+            self.assertListEqual(list(formats.read(file)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,289 @@
+#!/usr/bin/python3
+"""This module defines unit test for the indexes of the storages"""
+import marshal
+import random
+import unittest
+from models.engine.indexes import BitmapIndex, GeoIndex, HashIndex
+from models.engine.indexes import SortedIndex, TextIndex, haversine
+
+
+class Test_HashIndex(unittest.TestCase):
+    """tests for the HashIndex class"""
+    def setUp(self):
+        self.index = HashIndex("state_id")
+        self.index.add("c1", "s1")
+        self.index.add("c2", "s1")
+        self.index.add("c3", "s2")
+
+    def test_lookup(self):
+        self.assertListEqual(list(self.index.lookup("s1")), ["c1", "c2"])
+        self.index.add("c1", "s2")
+        self.assertListEqual(list(self.index.lookup("s1")), ["c2"])
+        self.assertListEqual(list(self.index.lookup("s2")), ["c3", "c1"])
+        self.index.add("c4", ["unhashable"])
+        with self.assertRaises(TypeError):
+            self.index.lookup([])
+
+    def test_remember(self):
+        self.index.remember("s1", ("a", "b"), self.index.changes)
+        self.index.remember("s2", ("c",), self.index.changes)
+        self.assertEqual(self.index.recall("s1"), ("a", "b"))
+        self.index.add("c2", "s1")
+        self.assertEqual(self.index.recall("s1"), ("a", "b"))
+        self.index.add("c4", "s1")
+        self.assertIsNone(self.index.recall("s1"))
+        self.assertEqual(self.index.recall("s2"), ("c",))
+        self.index.discard("c3")
+        self.assertIsNone(self.index.recall("s2"))
+
+    def test_remember_after_change(self):
+        changes = self.index.changes
+        self.index.add("c1", "s3")
+        self.index.remember("s1", ("a", "b"), changes)
+        self.assertIsNone(self.index.recall("s1"))
+        self.index.remember("s1", ("b",), self.index.changes)
+        self.index.clear()
+        self.assertIsNone(self.index.recall("s1"))
+
+
+class Test_BitmapIndex(unittest.TestCase):
+    """tests for the BitmapIndex class"""
+    def setUp(self):
+        self.index = BitmapIndex("amenity_ids")
+        self.index.add("p1", ["wifi", "pool"])
+        self.index.add("p2", ["wifi"])
+        self.index.add("p3", [])
+        self.index.add("p4", ["pool", "sauna"])
+
+    def test_having(self):
+        self.assertListEqual(self.index.having(["wifi"]), ["p1", "p2"])
+        self.assertListEqual(self.index.having(["wifi", "pool"]), ["p1"])
+        self.assertListEqual(self.index.having(["wifi", "spa"]), [])
+        self.assertListEqual(self.index.having(any_of=["sauna", "wifi"]),
+                             ["p1", "p2", "p4"])
+        self.assertListEqual(self.index.having(["pool"], ["wifi", "spa"]),
+                             ["p1"])
+        self.assertListEqual(self.index.having(any_of=[]), [])
+        self.assertListEqual(self.index.having(), ["p1", "p2", "p3", "p4"])
+        self.assertListEqual(self.index.lookup(["sauna"]), ["p4"])
+        self.assertListEqual(self.index.lookup("sauna"),
+                             ["p1", "p2", "p3", "p4"])
+        with self.assertRaises(TypeError):
+            self.index.having([["wifi"]])
+
+    def test_updates(self):
+        self.index.add("p1", ["pool", "spa"])
+        self.assertListEqual(self.index.having(["wifi"]), ["p2"])
+        self.assertListEqual(self.index.having(["spa"]), ["p1"])
+        self.index.add("p3", "wifi")
+        self.index.add("p2", ("wifi", ["unhashable"]))
+        self.assertListEqual(self.index.having(["wifi"]), ["p2"])
+        self.index.discard("p2")
+        self.index.discard("p2")
+        self.assertListEqual(self.index.having(["wifi"]), [])
+        self.index.add("p5", ["wifi"])
+        self.assertListEqual(self.index.having(), ["p1", "p5", "p3", "p4"])
+        self.index.clear()
+        self.assertListEqual(self.index.having(), [])
+
+    def test_many_objects(self):
+        generator = random.Random(2)
+        index = BitmapIndex("amenity_ids")
+        places = {}
+        for n in range(2000):
+            obj_id = "p{}".format(generator.randrange(1500))
+            if generator.random() < 0.1:
+                index.discard(obj_id)
+                places.pop(obj_id, None)
+                continue
+            places[obj_id] = set(generator.sample(range(20), 5))
+            index.add(obj_id, list(places[obj_id]))
+        for wanted in ([1], [2, 3], [4, 5, 6]):
+            self.assertCountEqual(index.having(wanted), [
+                obj_id for obj_id, items in places.items()
+                if items.issuperset(wanted)])
+            self.assertCountEqual(index.having(any_of=wanted), [
+                obj_id for obj_id, items in places.items()
+                if items.intersection(wanted)])
+
+
+class Test_SortedIndex(unittest.TestCase):
+    """tests for the SortedIndex class"""
+    def setUp(self):
+        self.index = SortedIndex("price_by_night")
+        self.values = {"a": 30, "b": 10, "c": 20, "d": 10, "e": 25.5}
+        for obj_id, value in self.values.items():
+            self.index.add(obj_id, value)
+
+    def test_range(self):
+        self.assertEqual(self.index.range(),
+                         [(10, "b"), (10, "d"), (20, "c"), (25.5, "e"),
+                          (30, "a")])
+        self.assertEqual(self.index.range(10, 25.5),
+                         [(10, "b"), (10, "d"), (20, "c"), (25.5, "e")])
+        self.assertEqual(self.index.range(10, 25.5, False, False),
+                         [(20, "c")])
+        self.assertEqual(self.index.range(high=20, reverse=True),
+                         [(20, "c"), (10, "d"), (10, "b")])
+        self.assertEqual(self.index.range(40), [])
+        with self.assertRaises(TypeError):
+            self.index.range("10")
+
+    def test_range_by_parts(self):
+        self.assertEqual(self.index.range(count=2), [(10, "b"), (10, "d")])
+        self.assertEqual(self.index.range(after=(10, "b"), count=2),
+                         [(10, "d"), (20, "c")])
+        self.assertEqual(self.index.range(reverse=True, after=(20, "c")),
+                         [(10, "d"), (10, "b")])
+
+    def test_lookup(self):
+        self.assertEqual(self.index.lookup(10), ["b", "d"])
+        self.assertEqual(self.index.lookup(10.0), ["b", "d"])
+        self.assertEqual(self.index.lookup(11), [])
+        with self.assertRaises(TypeError):
+            self.index.lookup(None)
+
+    def test_add_moves_and_discard_removes(self):
+        self.index.add("b", 40)
+        self.index.discard("c")
+        self.index.discard("z")
+        self.assertEqual(self.index.range(),
+                         [(10, "d"), (25.5, "e"), (30, "a"), (40, "b")])
+
+    def test_values_that_are_not_numbers(self):
+        self.index.add("a", None)
+        self.index.add("f", "12")
+        self.index.add("g", True)
+        self.assertEqual(self.index.lookup(30), [])
+        self.assertEqual(self.index.unsorted(), ["a", "f", "g"])
+        self.index.add("a", 5)
+        self.index.discard("f")
+        self.assertEqual(self.index.unsorted(), ["g"])
+        self.assertEqual(self.index.range(high=5), [(5, "a")])
+        self.index.clear()
+        self.assertEqual(self.index.range(), [])
+        self.assertEqual(self.index.unsorted(), [])
+
+
+class Test_GeoIndex(unittest.TestCase):
+    """tests for the GeoIndex class"""
+    def setUp(self):
+        self.index = GeoIndex(("latitude", "longitude"))
+        generator = random.Random(42)
+        self.locations = {}
+        for n in range(2000):
+            location = (generator.uniform(-90, 90),
+                        generator.uniform(-180, 180))
+            self.locations[str(n)] = location
+            self.index.add(str(n), location)
+
+    def scan(self, latitude, longitude):
+        return sorted((haversine(latitude, longitude, *location), obj_id)
+                      for obj_id, location in self.locations.items())
+
+    def test_haversine(self):
+        self.assertAlmostEqual(haversine(48.8566, 2.3522, 51.5072, -0.1276),
+                               343.5, delta=0.5)
+        self.assertEqual(haversine(10, 20, 10, 20), 0)
+
+    def test_near(self):
+        for latitude, longitude, radius in ((0, 0, 800), (89.5, 10, 500),
+                                            (-20, 179.9, 700),
+                                            (45, -179.95, 1500),
+                                            (60, 20, 3000), (0, 0, 30000)):
+            expected = [pair for pair in self.scan(latitude, longitude)
+                        if pair[0] <= radius]
+            self.assertEqual(self.index.near(latitude, longitude, radius),
+                             expected)
+
+    def test_k_nearest(self):
+        for latitude, longitude in ((0, 0), (-89, -100), (30, 180)):
+            self.assertEqual(self.index.k_nearest(latitude, longitude, 5),
+                             self.scan(latitude, longitude)[:5])
+        self.assertEqual(len(self.index.k_nearest(0, 0, 5000)), 2000)
+        self.assertEqual(self.index.k_nearest(0, 0, 0), [])
+        self.assertEqual(self.index.k_nearest(0, 0, -1), [])
+
+    def test_unbounded_radius(self):
+        self.assertEqual(len(self.index.near(0, 0, float("inf"))), 2000)
+        self.assertEqual(len(self.index.near(10, 10, 1e300)), 2000)
+        for point in ((float("nan"), 0), (0, float("inf"))):
+            with self.assertRaises(TypeError):
+                self.index.near(*point, 10)
+
+    def test_add_moves_and_discard_removes(self):
+        self.index.clear()
+        self.index.add("a", (10.0, 10.0))
+        self.index.add("b", (10.01, 10.0))
+        self.index.add("a", (-10.0, -10.0))
+        self.index.discard("b")
+        self.index.discard("z")
+        self.assertEqual(self.index.near(10, 10, 50), [])
+        self.assertEqual([obj_id for distance, obj_id in
+                          self.index.near(-10, -10, 1)], ["a"])
+
+    def test_values_that_are_not_locations(self):
+        self.index.clear()
+        self.index.add("a", (None, 10.0))
+        self.index.add("b", ("1", "2"))
+        self.index.add("c", (91.0, 0.0))
+        self.assertEqual(self.index.k_nearest(0, 0, 3), [])
+        with self.assertRaises(TypeError):
+            self.index.near("0", 0, 10)
+
+
+class Test_TextIndex(unittest.TestCase):
+    """tests for the TextIndex class"""
+    def setUp(self):
+        self.index = TextIndex(("name", "description"))
+        self.index.add("a", ("Sea view", "A flat with a view of the sea"))
+        self.index.add("b", ("City flat", "Views of the CITY, flat roof"))
+        self.index.add("c", ("Seaside house", None))
+
+    def ids(self, text, prefix=False):
+        return [obj_id for score, obj_id in self.index.search(text, prefix)]
+
+    def test_search(self):
+        self.assertEqual(self.ids("sea view"), ["a"])
+        self.assertEqual(self.ids("FLAT"), ["b", "a"])
+        self.assertEqual(self.ids("city, flat!"), ["b"])
+        self.assertEqual(self.ids("sea roof"), [])
+        self.assertEqual(self.ids("unknown"), [])
+        self.assertEqual(self.ids(" ,. "), [])
+
+    def test_prefix(self):
+        self.assertEqual(self.ids("sea", True), ["a", "c"])
+        self.assertEqual(self.ids("flat vi", True), ["a", "b"])
+        self.assertEqual(self.ids("flat vi"), [])
+
+    def test_add_moves_and_discard_removes(self):
+        self.index.add("a", ("Mountain view", ""))
+        self.index.discard("b")
+        self.index.discard("z")
+        self.assertEqual(self.ids("sea"), [])
+        self.assertEqual(self.ids("view"), ["a"])
+        self.assertEqual(self.ids("fl", True), [])
+        self.index.retain({"c"})
+        self.assertEqual(self.ids("view"), [])
+        self.assertEqual(self.ids("seaside"), ["c"])
+
+    def test_dump_and_load(self):
+        self.assertTrue(self.index.changed)
+        content = marshal.loads(marshal.dumps(self.index.dump()))
+        self.assertFalse(self.index.changed)
+        other = TextIndex(("name", "description"))
+        other.load(content)
+        self.assertFalse(other.changed)
+        self.assertEqual(other.search("flat"), self.index.search("flat"))
+        other.add("a", ("Sea view", "A flat with a view of the sea"))
+        self.assertFalse(other.changed)
+        other.add("a", ("Sea view", "A house"))
+        self.assertTrue(other.changed)
+        with self.assertRaises(ValueError):
+            TextIndex(("text",)).load(content)
+        with self.assertRaises(ValueError):
+            other.load({"attribute": ("name", "description")})
+
+
+if __name__ == "__main__":
+    unittest.main()
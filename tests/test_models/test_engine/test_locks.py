@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""This module defines unit test for the locks of the storages"""
+import threading
+import unittest
+from models.engine.locks import RWLock
+
+
+class Test_RWLock(unittest.TestCase):
+    """tests for the RWLock class"""
+    def setUp(self):
+        self.lock = RWLock()
+
+    def in_thread(self, target):
+        thread = threading.Thread(target=target)
+        thread.start()
+        return thread
+
+    def test_readers_share_the_lock(self):
+        inside = threading.Event()
+
+        def read():
+            with self.lock.read():
+                inside.set()
+
+        with self.lock.read():
+            thread = self.in_thread(read)
+            self.assertTrue(inside.wait(5))
+        thread.join(5)
+
+    def test_writer_holds_the_lock_alone(self):
+        inside = threading.Event()
+
+        def read():
+            with self.lock.read():
+                inside.set()
+
+        with self.lock.write():
+            thread = self.in_thread(read)
+            self.assertFalse(inside.wait(0.1))
+        self.assertTrue(inside.wait(5))
+        thread.join(5)
+
+    def test_waiting_writer_goes_first(self):
+        order = []
+        writing = threading.Event()
+
+        def write():
+            writing.set()
+            with self.lock.write():
+                order.append("write")
+
+        def read():
+            with self.lock.read():
+                order.append("read")
+
+        with self.lock.read():
+            writer = self.in_thread(write)
+            self.assertTrue(writing.wait(5))
+            while not self.lock._RWLock__waiting:
+                writer.join(0.01)
+            reader = self.in_thread(read)
+            reader.join(0.1)
+            self.assertEqual(order, [])
+            with self.lock.read():
+                pass
+        writer.join(5)
+        reader.join(5)
+        self.assertEqual(order, ["write", "read"])
+
+    def test_reentrant(self):
+        with self.lock.write():
+            with self.lock.write():
+                with self.lock.read():
+                    pass
+        with self.lock.read():
+            with self.lock.read():
+                with self.assertRaises(RuntimeError):
+                    with self.lock.write():
+                        pass
+        with self.lock.write():
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
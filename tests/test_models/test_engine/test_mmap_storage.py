@@ -0,0 +1,154 @@
+#!/usr/bin/python3
+"""This module defines unit test for MmapStorage class"""
+import unittest
+import os
+from unittest import mock
+from models.engine.mmap_storage import MmapStorage
+from models.user import User
+from models.city import City
+from models.place import Place
+
+
+class Test_MmapStorage(unittest.TestCase):
+    """tests for the memory-mapped MmapStorage class"""
+    def setUp(self):
+        self.temp_file_path = "airbnb_test.hbnb"
+        self.s_instance = MmapStorage(self.temp_file_path)
+        self.s_instance.reload()
+
+    def tearDown(self):
+        self.s_instance.close()
+        for path in (self.temp_file_path, self.temp_file_path + ".tmp"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def reopen(self):
+        self.s_instance.close()
+        self.s_instance = MmapStorage(self.temp_file_path)
+        self.s_instance.reload()
+
+    def test_new_save_and_get(self):
+        user = User()
+        user.email = "a@b.c"
+        user.tags = ["a", 1]
+        self.s_instance.new(user)
+        self.assertIs(self.s_instance.get(User, user.id), user)
+        self.s_instance.save()
+        self.reopen()
+        stored = self.s_instance.get("User", user.id)
+        self.assertIsNot(stored, user)
+        self.assertDictEqual(stored.to_dict(), user.to_dict())
+        self.assertIs(self.s_instance.get(None, user.id), stored)
+        self.assertIsNone(self.s_instance.get(City, user.id))
+        self.assertIsNone(self.s_instance.get(User, "missing"))
+
+    def test_get_decodes_only_the_record(self):
+        users = [User(first_name=str(n)) for n in range(50)]
+        for user in users:
+            self.s_instance.new(user)
+        self.s_instance.save()
+        self.reopen()
+        with mock.patch.object(User, "from_dict",
+                               wraps=User.from_dict) as from_dict:
+            stored = self.s_instance.get(User, users[17].id)
+        self.assertEqual(from_dict.call_count, 1)
+        self.assertEqual(stored.first_name, "17")
+
+    def test_all_and_count(self):
+        for instance in (User(), User(), Place()):
+            self.s_instance.new(instance)
+        self.assertEqual(self.s_instance.count(), 3)
+        self.s_instance.save()
+        self.s_instance.new(City())
+        self.assertEqual(self.s_instance.count(), 4)
+        self.assertEqual(self.s_instance.count(User), 2)
+        self.assertEqual(len(self.s_instance.all("User")), 2)
+        self.assertEqual(len(self.s_instance.all()), 4)
+        self.assertEqual(self.s_instance.count("Nothing"), 0)
+
+    def test_find(self):
+        cities = [City(state_id="s1"), City(state_id="s2")]
+        for city in cities:
+            self.s_instance.new(city)
+        self.s_instance.save()
+        self.reopen()
+        found = self.s_instance.find(City, state_id="s2")
+        self.assertEqual([city.id for city in found], [cities[1].id])
+
+    def test_update_and_delete(self):
+        users = [User(first_name="Betty"), User()]
+        for user in users:
+            self.s_instance.new(user)
+        self.s_instance.save()
+        self.reopen()
+        stored = self.s_instance.get(User, users[0].id)
+        stored.first_name = "Holberton"
+        self.s_instance.save()
+        self.s_instance.delete(self.s_instance.get(User, users[1].id))
+        self.assertEqual(self.s_instance.count(User), 1)
+        self.s_instance.save()
+        self.reopen()
+        self.assertEqual(self.s_instance.get(User, users[0].id).first_name,
+                         "Holberton")
+        self.assertIsNone(self.s_instance.get(User, users[1].id))
+        self.assertEqual(self.s_instance.count(), 1)
+
+    def test_compaction(self):
+        user = User()
+        self.s_instance.new(user)
+        self.s_instance.save()
+        for n in range(20):
+            user.number = n
+            self.s_instance.save()
+        self.assertLess(os.path.getsize(self.temp_file_path), 2000)
+        self.reopen()
+        self.assertEqual(self.s_instance.get(User, user.id).number, 19)
+
+    def test_interrupted_save_keeps_the_file(self):
+        user = User(first_name="Betty")
+        self.s_instance.new(user)
+        self.s_instance.save()
+
+        def crash(file, *args):
+            file.flush()
+            raise OSError
+
+        user.first_name = "Holberton"
+        self.s_instance.new(User())
+        with mock.patch.object(self.s_instance,
+                               "_MmapStorage__write_footer", crash):
+            with self.assertRaises(OSError):
+                self.s_instance.save()
+        self.reopen()
+        self.assertEqual(self.s_instance.count(), 1)
+        self.assertEqual(self.s_instance.get(User, user.id).first_name,
+                         "Betty")
+
+    def test_transaction_rollback(self):
+        user = User(first_name="Betty")
+        self.s_instance.new(user)
+        self.s_instance.save()
+        with self.assertRaises(ValueError):
+            with self.s_instance.transaction():
+                self.s_instance.new(Place())
+                self.s_instance.save()
+                raise ValueError
+        self.assertEqual(self.s_instance.count(), 1)
+        size = os.path.getsize(self.temp_file_path)
+        with self.s_instance.transaction():
+            self.s_instance.new(Place())
+            self.s_instance.save()
+            self.assertEqual(os.path.getsize(self.temp_file_path), size)
+        self.reopen()
+        self.assertEqual(self.s_instance.count(Place), 1)
+
+    def test_not_an_mmap_file(self):
+        self.s_instance.close()
+        with open(self.temp_file_path, "wb") as file:
+            file.write(b"{}" * 20)
+        with self.assertRaises(ValueError):
+            self.s_instance.reload()
+
+
+if __name__ == "__main__":
+    unittest.main()
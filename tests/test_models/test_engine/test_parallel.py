@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""This module defines unit test for the parallel decoding of the files"""
+import json
+import marshal
+import os
+import tempfile
+import unittest
+from models.engine import parallel
+
+
+class Test_parallel(unittest.TestCase):
+    """tests for the functions of the parallel module"""
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "file.json")
+        self.objects = {"User.{}".format(n): {"id": str(n), "name": "é" * n}
+                        for n in range(20)}
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, text):
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(text)
+
+    def write_lines(self):
+        self.write("{\n" + ",\n".join(
+            "{}: {}".format(json.dumps(key), json.dumps(value))
+            for key, value in self.objects.items()) + "\n}")
+
+    def test_split_in_whole_lines(self):
+        self.write_lines()
+        ranges = parallel.split(self.path, 4)
+        self.assertEqual(len(ranges), 4)
+        self.assertEqual(ranges[0][0], 2)
+        self.assertEqual(ranges[-1][1], os.path.getsize(self.path))
+        with open(self.path, "rb") as file:
+            data = file.read()
+        for (start, end), (next_start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, next_start)
+            self.assertEqual(data[end - 1:end], b"\n")
+
+    def test_decode_ranges(self):
+        self.write_lines()
+        pairs = []
+        for start, end in parallel.split(self.path, 3):
+            pairs.extend(marshal.loads(
+                parallel.decode_range(self.path, start, end)))
+        self.assertEqual(dict(pairs), self.objects)
+
+    def test_read_ranges(self):
+        self.write_lines()
+        self.assertEqual(dict(parallel.read_ranges(self.path, 2)),
+                         self.objects)
+
+    def test_not_one_object_per_line(self):
+        self.write(json.dumps(self.objects))
+        self.assertIsNone(parallel.read_ranges(self.path, 2))
+        self.write(json.dumps(self.objects, indent=4))
+        self.assertIsNone(parallel.read_ranges(self.path, 2))
+
+    def test_read_files(self):
+        other = os.path.join(self.directory.name, "missing.json")
+        self.write(json.dumps(self.objects))
+        self.assertEqual(dict(parallel.read_files([self.path, other],
+                                                  "json", 2)),
+                         self.objects)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+#!/usr/bin/python3
+"""This module defines unit test for the queries of the storages"""
+import os
+import unittest
+from unittest import mock
+from models import storage
+from models.engine.db_storage import DBStorage
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.user import User
+
+
+class Test_Query(unittest.TestCase):
+    """tests for the Query class"""
+    def setUp(self):
+        self.temp_file_path = "airbnb_query.json"
+        self.s_instance = self.storage()
+        self.places = []
+        for n in range(10):
+            place = Place()
+            place.name = "Place {}".format(n)
+            place.city_id = "city{}".format(n % 2)
+            place.price_by_night = (n * 37) % 100
+            place.max_guest = n % 4
+            self.s_instance.new(place)
+            self.places.append(place)
+        self.s_instance.new(User())
+
+    def tearDown(self):
+        for obj in list(storage.all().values()):
+            storage.delete(obj)
+        storage._FileStorage__fragments.clear()
+        if os.path.exists(self.temp_file_path):
+            os.remove(self.temp_file_path)
+
+    def storage(self):
+        s_instance = FileStorage()
+        s_instance._FileStorage__file_path = self.temp_file_path
+        return s_instance
+
+    def test_all_objects_of_the_class(self):
+        self.assertCountEqual(list(self.s_instance.query(Place)),
+                              self.places)
+        self.assertEqual(self.s_instance.query("Place").count(), 10)
+
+    def test_where(self):
+        query = self.s_instance.query(Place).where(price_by_night__lt=50,
+                                                   max_guest__gte=2)
+        expected = [place for place in self.places
+                    if place.price_by_night < 50 and place.max_guest >= 2]
+        self.assertCountEqual(list(query), expected)
+        query = query.where(city_id="city0")
+        self.assertCountEqual(list(query), [place for place in expected
+                                            if place.city_id == "city0"])
+
+    def test_operators(self):
+        query = self.s_instance.query(Place)
+        self.assertEqual(query.where(name__in=("Place 1", "Place 9"))
+                         .count(), 2)
+        self.assertEqual(query.where(name__contains="7").count(), 1)
+        self.assertEqual(query.where(max_guest__ne=0).count(), 7)
+        self.assertEqual(query.where(name__gt=3).count(), 0)
+        self.assertEqual(query.where(missing__lt=3).count(), 0)
+        with self.assertRaises(ValueError):
+            query.where(price_by_night__below=3)
+
+    def test_equalities_use_find(self):
+        with mock.patch.object(self.s_instance, "find",
+                               wraps=self.s_instance.find) as find:
+            result = list(self.s_instance.query(Place)
+                          .where(city_id="city1", max_guest__lt=2))
+        find.assert_called_once_with(Place, city_id="city1")
+        self.assertCountEqual(result, [place for place in self.places
+                                       if place.city_id == "city1" and
+                                       place.max_guest < 2])
+
+    def test_order_by(self):
+        result = list(self.s_instance.query(Place)
+                      .order_by("max_guest", "-price_by_night"))
+        self.assertEqual(result, sorted(
+            self.places,
+            key=lambda place: (place.max_guest, -place.price_by_night)))
+        self.places[0].max_guest = None
+        self.s_instance.new(self.places[0])
+        self.assertIs(list(self.s_instance.query(Place)
+                           .order_by("max_guest"))[-1], self.places[0])
+
+    def test_order_by_mixed_types(self):
+        self.places[1].max_guest = "4"
+        self.places[2].max_guest = {"adults": 2}
+        self.places[3].price_by_night = "cheap"
+        self.places[4].max_guest = 2.5
+        for place in self.places[1:5]:
+            self.s_instance.new(place)
+        result = list(self.s_instance.query(Place)
+                      .order_by("max_guest", "price_by_night"))
+        self.assertEqual(len(result), 10)
+        self.assertIs(result[-2], self.places[2])
+        self.assertIs(result[-1], self.places[1])
+        self.assertEqual([place.max_guest for place in result[:-2]],
+                         [0, 0, 1, 1, 2, 2.5, 3, 3])
+        result = list(self.s_instance.query(Place)
+                      .order_by("-max_guest", "price_by_night").limit(3))
+        self.assertEqual(result, [self.places[1], self.places[2],
+                                  self.places[7]])
+
+    def test_pagination(self):
+        ordered = sorted(self.places, key=lambda place: place.price_by_night)
+        query = self.s_instance.query(Place).order_by("price_by_night")
+        self.assertEqual(list(query.limit(3)), ordered[:3])
+        self.assertEqual(list(query.offset(4).limit(3)), ordered[4:7])
+        self.assertEqual(list(query.page(4, 3)), ordered[9:])
+        self.assertEqual(list(query.offset(8)), ordered[8:])
+        self.assertIs(query.first(), ordered[0])
+        self.assertIsNone(query.where(name="none").first())
+        self.assertEqual(query.limit(3).count(), 10)
+
+    def test_only(self):
+        query = (self.s_instance.query(Place).where(name="Place 3")
+                 .only("name", "price_by_night"))
+        self.assertEqual(list(query),
+                         [{"name": "Place 3", "price_by_night": 11}])
+
+    def test_lazy_evaluation(self):
+        query = self.s_instance.query(Place).where(name__contains="Place")
+        with mock.patch.object(self.s_instance, "all",
+                               wraps=self.s_instance.all) as all_objects:
+            iterator = iter(query)
+            all_objects.assert_not_called()
+            next(iterator)
+            all_objects.assert_called_once_with(Place)
+
+    def test_sorted_index_pages(self):
+        with mock.patch.object(self.s_instance, "all",
+                               wraps=self.s_instance.all) as all_objects:
+            query = (self.s_instance.query(Place).where(max_guest__lt=3)
+                     .order_by("-price_by_night").limit(3))
+            self.assertEqual(list(query), sorted(
+                self.places, key=lambda place: place.price_by_night,
+                reverse=True)[:3])
+            query = self.s_instance.query(Place).where(
+                price_by_night__gt=40, price_by_night__lte=80, max_guest=1)
+            self.assertCountEqual(list(query), [
+                place for place in self.places
+                if 40 < place.price_by_night <= 80 and place.max_guest == 1])
+        all_objects.assert_not_called()
+        with mock.patch.object(self.s_instance, "range",
+                               wraps=self.s_instance.range) as scan:
+            query = self.s_instance.query(Place).where(
+                price_by_night__gt=40, name__contains="Place")
+            self.assertEqual(query.count(), 5)
+        scan.assert_called_once_with(Place, "price_by_night", reverse=False,
+                                     low=40, include_low=False)
+
+    def test_amenities_use_having(self):
+        for n, place in enumerate(self.places):
+            place.amenity_ids = ["a{}".format(m) for m in range(n % 4)]
+            self.s_instance.new(place)
+        query = self.s_instance.query(Place)
+        with mock.patch.object(self.s_instance, "having",
+                               wraps=self.s_instance.having) as having:
+            self.assertEqual(query.where(amenity_ids__contains="a2")
+                             .count(), 2)
+            self.assertEqual(query.where(amenity_ids__contains_all=["a0",
+                                                                    "a1"])
+                             .count(), 4)
+            self.assertEqual(query.where(amenity_ids__contains="a0")
+                             .where(amenity_ids__contains_any=["a2", "x"])
+                             .count(), 2)
+        having.assert_called_with(Place, "amenity_ids", ("a0",),
+                                  ("a2", "x"))
+        self.assertEqual(having.call_count, 3)
+        self.assertEqual(query.where(amenity_ids__contains_all=3).count(), 0)
+
+    def test_other_storage(self):
+        db_storage = DBStorage(":memory:")
+        db_storage.reload()
+        for place in self.places:
+            db_storage.new(place)
+        db_storage.save()
+        query = (db_storage.query(Place).where(city_id="city0",
+                                               price_by_night__gt=20)
+                 .order_by("-price_by_night").only("price_by_night"))
+        self.assertEqual(list(query), [{"price_by_night": 96},
+                                       {"price_by_night": 74},
+                                       {"price_by_night": 48},
+                                       {"price_by_night": 22}])
+        db_storage.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
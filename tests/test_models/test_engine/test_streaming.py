@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+"""This module defines unit test for the streaming JSON parser"""
+import io
+import json
+import unittest
+from models.engine.streaming import iter_items
+
+
+class Test_iter_items(unittest.TestCase):
+    """tests for the iter_items function"""
+    def items(self, document, chunk_size=7):
+        return list(iter_items(io.StringIO(document), chunk_size))
+
+    def test_items_in_order(self):
+        data = {"User.1": {"id": "1", "name": "a \"quoted\" {name}"},
+                "City.2": {"id": "2", "ids": [1, 2.5, None, True]},
+                "State.3": {}}
+        document = json.dumps(data, indent=2)
+        self.assertListEqual(self.items(document), list(data.items()))
+        self.assertListEqual(self.items(document, 1), list(data.items()))
+        self.assertListEqual(self.items(document, 1 << 16),
+                             list(data.items()))
+
+    def test_empty_documents(self):
+        self.assertListEqual(self.items("{}"), [])
+        self.assertListEqual(self.items(' {\n } '), [])
+        self.assertListEqual(self.items('""'), [])
+        self.assertListEqual(self.items(""), [])
+        self.assertListEqual(self.items(" \n\t "), [])
+
+    def test_invalid_documents(self):
+        with self.assertRaises(ValueError):
+            self.items('{"User.1": {"id": "1"}')
+        with self.assertRaises(ValueError):
+            self.items('{"User.1": {"id": "1"} "User.2": {}}')
+        with self.assertRaises(ValueError):
+            self.items('{1: {}}')
+        with self.assertRaises(ValueError):
+            self.items('[1, 2]')
+
+
+if __name__ == "__main__":
+    unittest.main()
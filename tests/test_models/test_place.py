@@ -3,9 +3,11 @@
 
 import unittest
 import os
+import models
 from datetime import datetime
 from time import sleep
 from models.place import Place
+from models.review import Review
 
 
 class TestPlaceMethods(unittest.TestCase):
@@ -205,6 +207,44 @@ class TestPlaceMethods(unittest.TestCase):
         }
         self.assertDictEqual(self.test_place.to_dict(), expected_dict)
 
+    def test_amenity_ids_of_each_place(self):
+        """Test if appending to amenity_ids changes only that place."""
+        place = Place()
+        other = Place()
+        place.amenity_ids.append("wifi")
+        place.save()
+        self.assertEqual(other.amenity_ids, [])
+        self.assertEqual(Place.amenity_ids, [])
+        self.assertEqual(models.storage.having(Place, "amenity_ids",
+                                               ["wifi"]), [place])
+        models.storage.reload()
+        reloaded = models.storage.get(Place, place.id)
+        self.assertIsNot(reloaded, place)
+        self.assertEqual(reloaded.amenity_ids, ["wifi"])
+        self.assertEqual(models.storage.having(Place, "amenity_ids",
+                                               ["wifi"]), [reloaded])
+        models.storage.delete(reloaded)
+
+    def test_reviews(self):
+        """Test if reviews returns the Review instances of the place."""
+        place = Place()
+        first = Review(place_id=place.id)
+        second = Review(place_id=place.id)
+        models.storage.new(first)
+        models.storage.new(Review())
+        self.assertListEqual(place.reviews, [first])
+        models.storage.new(second)
+        self.assertListEqual(place.reviews, [first, second])
+        first.place_id = "other"
+        models.storage.new(first)
+        self.assertListEqual(place.reviews, [second])
+        models.storage.delete(second)
+        self.assertListEqual(place.reviews, [])
+        for obj in list(models.storage.all(Review).values()):
+            models.storage.delete(obj)
+        with self.assertRaises(AttributeError):
+            place.reviews = []
+
 
 if __name__ == "__main__":
     unittest.main()
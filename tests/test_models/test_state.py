@@ -3,9 +3,11 @@
 
 import unittest
 import os
+import models
 from datetime import datetime
 from time import sleep
 from models.state import State
+from models.city import City
 
 
 class TestStateMethods(unittest.TestCase):
@@ -156,6 +158,26 @@ class TestStateMethods(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.state.to_dict(None)
 
+    def test_cities(self):
+        """Test if cities returns the City instances of the state."""
+        state = State()
+        first = City(state_id=state.id)
+        second = City(state_id=state.id)
+        models.storage.new(first)
+        models.storage.new(City())
+        self.assertListEqual(state.cities, [first])
+        models.storage.new(second)
+        self.assertListEqual(state.cities, [first, second])
+        first.state_id = "other"
+        models.storage.new(first)
+        self.assertListEqual(state.cities, [second])
+        models.storage.delete(second)
+        self.assertListEqual(state.cities, [])
+        for obj in list(models.storage.all(City).values()):
+            models.storage.delete(obj)
+        with self.assertRaises(AttributeError):
+            state.cities = []
+
 
 if __name__ == "__main__":
     unittest.main()
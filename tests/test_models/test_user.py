@@ -2,6 +2,7 @@
 import unittest
 import os
 from models.user import User
+from models.place import Place
 from models import storage
 from datetime import datetime
 
@@ -17,9 +18,9 @@ class Test_User_class(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
-        all_objs = list(storage.all().keys())
-        for obj_id in all_objs:
-            del storage._FileStorage__objects[obj_id]
+        all_objs = list(storage.all().values())
+        for obj in all_objs:
+            storage.delete(obj)
             storage.save()
         if os.path.exists(cls.temp_file_path):
             os.remove(cls.temp_file_path)
@@ -106,6 +107,26 @@ class Test_User_class(unittest.TestCase):
         formatted_datetime = parsed_datetime.strftime("%Y-%m-%dT%H:%M:%S.%f")
         self.assertEqual(datetime_format, formatted_datetime)
 
+    def test_places(self):
+        """Test if places returns the Place instances of the user."""
+        user = User()
+        first = Place(user_id=user.id)
+        second = Place(user_id=user.id)
+        storage.new(first)
+        storage.new(Place())
+        self.assertListEqual(user.places, [first])
+        storage.new(second)
+        self.assertListEqual(user.places, [first, second])
+        first.user_id = "other"
+        storage.new(first)
+        self.assertListEqual(user.places, [second])
+        storage.delete(second)
+        self.assertListEqual(user.places, [])
+        for obj in list(storage.all(Place).values()):
+            storage.delete(obj)
+        with self.assertRaises(AttributeError):
+            user.places = []
+
 
 if __name__ == '__main__':
     unittest.main()